@@ -0,0 +1,75 @@
+"""
+Concurrent game server reservations against a single node.
+
+Needs PostgreSQL for row locks, run with:
+pytest -s benchmarks/bench_concurrent_reservation.py
+"""
+
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from time import perf_counter
+
+from django.db import connection
+from django.utils import timezone
+from pytest import mark, skip
+
+from server.conftest import GameSoftwareVersionFactory, IPNetFactory, NodeFactory
+from server.models import UserGameServer
+from server.reservation import reserve_gameserver
+from server.views.exceptions import GameserverError
+
+ORDERS = 400
+WORKERS = 32
+NODE_CAPACITY = 300
+SERVER_RAM = 512
+
+
+@mark.django_db(transaction=True)
+def test_concurrent_reservations(user):
+    if connection.vendor != "postgresql":
+        skip("row locks need PostgreSQL")
+    node = NodeFactory.create(
+        ram=NODE_CAPACITY * SERVER_RAM,
+        disk_space=NODE_CAPACITY * SERVER_RAM,
+        cores=NODE_CAPACITY * 2,
+    )
+    for ip_net in ("10.0.0.0/24", "10.0.1.0/24"):
+        IPNetFactory.create(ip_net=ip_net)
+    software_version = GameSoftwareVersionFactory.create(software__default_port=25565)
+    data = {
+        "user": user,
+        "server_name": "CaraCaraCraft",
+        "software_version": software_version,
+        "ram": SERVER_RAM,
+        "disk_space": SERVER_RAM,
+        "cores": 1,
+        "with_own_ip": True,
+        "available_until": timezone.now() + timedelta(days=30),
+    }
+
+    def order(_):
+        try:
+            return reserve_gameserver(data)
+        except GameserverError as error:
+            return error
+        finally:
+            connection.close()
+
+    start = perf_counter()
+    with ThreadPoolExecutor(max_workers=WORKERS) as executor:
+        results = list(executor.map(order, range(ORDERS)))
+    duration = perf_counter() - start
+
+    created = [result for result in results if isinstance(result, UserGameServer)]
+    print(
+        f"\n{len(created)} of {ORDERS} orders created with {WORKERS} workers "
+        f"in {duration:.2f} s, {len(created) / duration:.1f} creates/sec"
+    )
+    servers = UserGameServer.objects.filter(node=node)
+    ports = Counter(servers.values_list("port", flat=True))
+    own_ips = Counter(servers.values_list("own_ip", flat=True))
+    assert len(created) == NODE_CAPACITY
+    assert servers.count() == NODE_CAPACITY
+    assert max(ports.values()) == 1
+    assert max(own_ips.values()) == 1
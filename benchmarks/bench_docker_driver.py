@@ -0,0 +1,51 @@
+"""
+Create, start, stop and remove containers in bulk against a stub Docker API.
+
+Run with: pytest -s benchmarks/bench_docker_driver.py
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from time import perf_counter
+
+from pytest import mark
+
+from server.conftest import NodeFactory, UserGameserverFactory
+from server.drivers import DockerClientPool, DockerNodeDriver
+from server.tests.docker_stub import StubDockerAPI
+
+CONTAINERS = 200
+WORKERS = 8
+
+
+def lifecycle(driver: DockerNodeDriver, gameserver):
+    container_id = driver.create(gameserver)
+    driver.start(container_id)
+    driver.stop(container_id)
+    driver.remove(container_id)
+
+
+@mark.parametrize(
+    "pooled,workers", [(False, 1), (True, 1), (False, WORKERS), (True, WORKERS)]
+)
+def test_bulk_container_operations(settings, pooled, workers):
+    node = NodeFactory.build(pk=1, ip="127.0.0.1")
+    gameservers = UserGameserverFactory.build_batch(CONTAINERS, node=node)
+    # a pool which keeps no idle clients opens a new connection per operation
+    pool = DockerClientPool(max_idle_per_node=WORKERS if pooled else 0)
+    driver = DockerNodeDriver(node, pool)
+
+    with StubDockerAPI() as stub:
+        settings.DOCKER_API_PORT = stub.port
+        start = perf_counter()
+        with ThreadPoolExecutor(workers) as executor:
+            list(executor.map(lambda gs: lifecycle(driver, gs), gameservers))
+        duration = perf_counter() - start
+        pool.clear()
+
+    operations = CONTAINERS * 4
+    print(
+        f"\n{'pooled' if pooled else 'unpooled'}, {workers} workers: "
+        f"{operations} operations in {duration:.2f} s, "
+        f"{operations / duration:.0f} ops/s, {stub.connections} connections"
+    )
+    assert not stub.containers
@@ -0,0 +1,58 @@
+"""
+Load game servers with eager and lazy decryption of their passwords.
+
+Run with: pytest -s benchmarks/bench_encrypted_fields.py
+"""
+
+from time import perf_counter
+
+from django.utils import timezone
+from django_cryptography.fields import EncryptedMixin
+from pytest import mark
+
+from carautils.utils.db.fields import LazyEncryptedCharField
+from server.conftest import GameSoftwareVersionFactory, NodeFactory
+from server.models import GAMESERVER_ENABLED, UserGameServer
+
+ROWS = 10_000
+RUNS = 5
+
+
+@mark.parametrize("decryption", ["eager", "lazy"])
+@mark.django_db
+def test_load_gameservers(monkeypatch, user, decryption):
+    node = NodeFactory.create()
+    software_version = GameSoftwareVersionFactory.create()
+    UserGameServer.objects.bulk_create(
+        (
+            UserGameServer(
+                user=user,
+                server_name=f"server-{index}",
+                software_version=software_version,
+                node=node,
+                port=1024 + index,
+                ram=512,
+                disk_space=512,
+                cores=1,
+                status=GAMESERVER_ENABLED,
+                available_until=timezone.now(),
+                sql_password=f"sql-{index}",
+                ftp_password=f"ftp-{index}",
+            )
+            for index in range(ROWS)
+        ),
+        batch_size=5000,
+    )
+    if decryption == "eager":
+        # decrypt while loading, like django_cryptography's encrypt()
+        monkeypatch.setattr(
+            LazyEncryptedCharField, "from_db_value", EncryptedMixin.from_db_value
+        )
+
+    start = perf_counter()
+    for _ in range(RUNS):
+        gameservers = list(UserGameServer.objects.all())
+    duration = (perf_counter() - start) / RUNS
+
+    assert len(gameservers) == ROWS
+    print(f"\n{decryption}: {ROWS} rows loaded in {duration * 1000:.0f} ms")
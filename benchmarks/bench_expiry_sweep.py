@@ -0,0 +1,50 @@
+"""
+Sweep a large number of expired game servers in batches.
+
+Run with: pytest -s benchmarks/bench_expiry_sweep.py
+"""
+
+from datetime import timedelta
+
+from django.utils import timezone
+from pytest import mark
+
+from server.conftest import GameSoftwareVersionFactory, NodeFactory
+from server.expiry import sweep_expired_gameservers
+from server.models import GAMESERVER_ENABLED, Node, UserGameServer
+
+ROWS = 100_000
+NODES = 20
+
+
+@mark.django_db
+def test_sweep_expired_gameservers(settings, user):
+    settings.GAMESERVER_DELETE_AFTER = timedelta(0)
+    nodes = NodeFactory.create_batch(NODES, ram=10**9, disk_space=10**9, cores=10**6)
+    software_version = GameSoftwareVersionFactory.create()
+    expired_at = timezone.now() - timedelta(days=1)
+    UserGameServer.objects.bulk_create(
+        (
+            UserGameServer(
+                user=user,
+                server_name=f"server-{index}",
+                software_version=software_version,
+                node=nodes[index % NODES],
+                port=1024 + index // NODES,
+                ram=512,
+                disk_space=512,
+                cores=1,
+                status=GAMESERVER_ENABLED,
+                available_until=expired_at + timedelta(seconds=index % 3600),
+            )
+            for index in range(ROWS)
+        ),
+        batch_size=5000,
+    )
+    Node.objects.reconcile_used_capacity()
+
+    result = sweep_expired_gameservers()
+
+    print(f"\n{result}")
+    assert (result.disabled, result.deleted) == (ROWS, ROWS)
+    assert not Node.objects.filter(used_ram__gt=0).exists()
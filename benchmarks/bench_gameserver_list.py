@@ -0,0 +1,92 @@
+"""
+Latency of the first and a deep page of the game server list.
+
+Run with: pytest -s benchmarks/bench_gameserver_list.py
+BENCH_LIST_PAGES sets the depth of the deep page, 10000 by default.
+"""
+
+import os
+from datetime import timedelta
+
+from django.utils import timezone
+from pytest import mark
+from rest_framework.pagination import Cursor, PageNumberPagination
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from benchmarks.utils import measure, report
+from carautils.pagination import CreatedAtCursorPagination
+from server.conftest import GameSoftwareVersionFactory, NodeFactory
+from server.models import GAMESERVER_ENABLED, UserGameServer
+from server.views.api.gameserver import UserGameserverViewSet
+
+PAGES = int(os.environ.get("BENCH_LIST_PAGES", 10_000))
+PAGE_SIZE = 50
+RUNS = 50
+
+
+def seed_servers(user):
+    rows = PAGES * PAGE_SIZE
+    nodes = NodeFactory.create_batch(
+        rows // 60000 + 1, ram=10**9, disk_space=10**9, cores=10**6
+    )
+    software_version = GameSoftwareVersionFactory.create()
+    created_at = timezone.now() - timedelta(days=365)
+    UserGameServer.objects.bulk_create(
+        (
+            UserGameServer(
+                user=user,
+                server_name=f"server-{index}",
+                software_version=software_version,
+                node=nodes[index % len(nodes)],
+                port=index // len(nodes) + 1024,
+                ram=512,
+                disk_space=512,
+                cores=1,
+                status=GAMESERVER_ENABLED,
+                available_until=timezone.now() + timedelta(days=30),
+                created_at=created_at + timedelta(seconds=index),
+            )
+            for index in range(rows)
+        ),
+        batch_size=5000,
+    )
+
+
+def cursor_query(user, page: int) -> str:
+    if page == 1:
+        return ""
+    last = (
+        UserGameServer.objects.from_user(user)
+        .order_by("created_at", "id")
+        .only("created_at")[(page - 1) * PAGE_SIZE - 1]
+    )
+    pagination = CreatedAtCursorPagination()
+    pagination.base_url = "/"
+    link = pagination.encode_cursor(
+        Cursor(0, False, CreatedAtCursorPagination.position(last))
+    )
+    return link.partition("?")[2]
+
+
+@mark.parametrize("pagination_class", [PageNumberPagination, CreatedAtCursorPagination])
+@mark.django_db
+def test_list_page_latency(monkeypatch, user, pagination_class):
+    monkeypatch.setattr(pagination_class, "page_size", PAGE_SIZE)
+    monkeypatch.setattr(UserGameserverViewSet, "pagination_class", pagination_class)
+    seed_servers(user)
+    view = UserGameserverViewSet.as_view({"get": "list"})
+    factory = APIRequestFactory()
+
+    for page in (1, PAGES):
+        if pagination_class is PageNumberPagination:
+            query = f"page={page}"
+        else:
+            query = cursor_query(user, page)
+        request = factory.get(f"/?{query}")
+        force_authenticate(request, user)
+
+        def get_page(request=request):
+            response = view(request)
+            assert len(response.data["results"]) == PAGE_SIZE
+
+        report(f"{pagination_class.__name__} page {page}", measure(get_page, RUNS))
@@ -0,0 +1,51 @@
+"""
+Logins per second of users with an outdated hash, rehashed eagerly or in the background.
+
+Run with: pytest -s benchmarks/bench_login.py
+The hasher cost defaults to PASSWORD_HASHER_ITERATIONS and can be changed with
+the BENCH_HASHER_ITERATIONS environment variable.
+"""
+
+import os
+from time import perf_counter
+
+from django.conf import settings as django_settings
+from django.contrib.auth import authenticate
+from pytest import fixture, mark
+
+from caraauth.tests.factories import UserFactory
+from caraauth.utils import hashing
+
+LOGINS = 16
+ITERATIONS = int(
+    os.environ.get(
+        "BENCH_HASHER_ITERATIONS", django_settings.PASSWORD_HASHER_ITERATIONS
+    )
+)
+
+
+@fixture
+def reset_executor():
+    hashing.reset_rehash_executor()
+    yield
+    hashing.reset_rehash_executor()
+
+
+@mark.parametrize("eager", [True, False])
+@mark.django_db(transaction=True)
+def test_logins_with_outdated_hash(settings, reset_executor, eager):
+    settings.PASSWORD_HASHERS = ["caraauth.hashers.PBKDF2PasswordHasher"]
+    settings.PASSWORD_REHASH_EAGER = eager
+    settings.PASSWORD_HASHER_ITERATIONS = ITERATIONS // 2
+    users = UserFactory.create_batch(LOGINS, password="password123")
+    settings.PASSWORD_HASHER_ITERATIONS = ITERATIONS
+
+    start = perf_counter()
+    for user in users:
+        assert authenticate(username=user.username, password="password123")
+    duration = perf_counter() - start
+
+    print(
+        f"\n{'eager' if eager else 'background'} rehash, {ITERATIONS} iterations: "
+        f"{LOGINS} logins in {duration:.2f} s, {LOGINS / duration:.1f} logins/sec"
+    )
@@ -0,0 +1,85 @@
+"""
+Replay a synthetic order stream against every placement strategy.
+
+Run with: pytest -s benchmarks/bench_placement.py
+"""
+
+from random import Random
+from statistics import mean
+from time import perf_counter
+
+from pytest import mark
+
+from carautils.constants import DISK_SPACE_CHOICES, RAM_CHOICES
+from server.placement import PLACEMENT_STRATEGIES, NodeCapacity, rank_nodes
+
+NODES = 200
+ORDERS = 4000
+# share of orders after which a random server is removed again
+CHURN = 0.5
+
+
+def synthetic_nodes(random: Random) -> list[NodeCapacity]:
+    nodes = []
+    for node_id in range(NODES):
+        ram = random.choice([32768, 65536, 131072])
+        disk_space = random.choice([204800, 409600, 819200])
+        cores = random.choice([16, 32, 64])
+        nodes.append(
+            NodeCapacity(
+                node_id,
+                random.randint(0, 3),
+                ram,
+                disk_space,
+                cores,
+                ram,
+                disk_space,
+                cores,
+            )
+        )
+    return nodes
+
+
+@mark.parametrize("strategy", PLACEMENT_STRATEGIES)
+def test_placement_strategy(strategy):
+    random = Random(42)
+    nodes = {node.id: node for node in synthetic_nodes(random)}
+    placed = []
+    rejected = 0
+    decisions = []
+
+    for _ in range(ORDERS):
+        ram = random.choice(RAM_CHOICES)[0]
+        disk_space = random.choice(DISK_SPACE_CHOICES)[0]
+        cores = random.randint(1, 4)
+        start = perf_counter()
+        ranked_nodes = rank_nodes(
+            list(nodes.values()), ram, disk_space, cores, strategy=strategy
+        )
+        decisions.append(perf_counter() - start)
+        if not ranked_nodes:
+            rejected += 1
+            continue
+        node = ranked_nodes[0]
+        nodes[node.id] = node._replace(
+            free_ram=node.free_ram - ram,
+            free_disk_space=node.free_disk_space - disk_space,
+            free_cores=node.free_cores - cores,
+        )
+        placed.append((node.id, ram, disk_space, cores))
+        if random.random() < CHURN:
+            node_id, ram, disk_space, cores = placed.pop(random.randrange(len(placed)))
+            node = nodes[node_id]
+            nodes[node_id] = node._replace(
+                free_ram=node.free_ram + ram,
+                free_disk_space=node.free_disk_space + disk_space,
+                free_cores=node.free_cores + cores,
+            )
+
+    used_nodes = [node for node in nodes.values() if node.free_ram < node.ram]
+    density = mean(1 - node.free_ram / node.ram for node in used_nodes)
+    print(
+        f"\n{strategy}: {len(placed)} servers on {len(used_nodes)} nodes, "
+        f"{rejected} rejected, RAM density {density:.1%}, "
+        f"decision mean {mean(decisions) * 1e6:.1f} µs"
+    )
@@ -0,0 +1,58 @@
+"""
+Port allocation latency on a node with more than 10k occupied ports.
+
+Run with: pytest -s benchmarks/bench_port_allocation.py
+"""
+
+from datetime import timedelta
+from random import randint
+
+from django.utils import timezone
+from pytest import mark
+
+from benchmarks.utils import measure, report
+from carautils.utils.server import get_available_port
+from server.conftest import GameSoftwareVersionFactory, NodeFactory
+from server.models import UserGameServer
+from server.ports import PortAllocator, get_port_allocator, reset_port_allocators
+
+DEFAULT_PORT = 25565
+OCCUPIED_PORTS = 12000
+
+
+@mark.django_db
+def test_port_allocation_latency(user):
+    node = NodeFactory.create()
+    software_version = GameSoftwareVersionFactory.create()
+    available_until = timezone.now() + timedelta(days=30)
+    UserGameServer.objects.bulk_create(
+        UserGameServer(
+            user=user,
+            server_name=f"server-{port}",
+            software_version=software_version,
+            node=node,
+            port=port,
+            ram=512,
+            disk_space=512,
+            cores=1,
+            available_until=available_until,
+        )
+        for port in range(DEFAULT_PORT, DEFAULT_PORT + OCCUPIED_PORTS)
+    )
+
+    reset_port_allocators()
+    report("rebuild from database", measure(lambda: PortAllocator.from_node(node), 5))
+
+    get_port_allocator(node)
+    durations = measure(lambda: get_available_port(node, DEFAULT_PORT), 10000)
+    report(f"next free port behind {OCCUPIED_PORTS} taken ports", durations)
+    assert get_available_port(node, DEFAULT_PORT) == DEFAULT_PORT + OCCUPIED_PORTS
+
+    allocator = get_port_allocator(node)
+
+    def allocate_and_release():
+        port = allocator.next_free(randint(1024, 65000))
+        allocator.take(port)
+        allocator.release(port)
+
+    report("random allocate and release", measure(allocate_and_release, 10000))
@@ -0,0 +1,44 @@
+"""
+Overhead of the login rate limiter per request, in process and in a cache.
+
+Run with: pytest -s benchmarks/bench_rate_limit.py
+Set REDIS_CACHE_URL to measure the shared Redis cache as well.
+"""
+
+from time import perf_counter
+
+from django.conf import settings as django_settings
+from django.core.cache import caches
+from pytest import mark
+
+from caraauth.utils import rate_limit
+
+REQUESTS = 20000
+BACKENDS = [None, "default"] + (
+    ["shared"] if "shared" in django_settings.CACHES else []
+)
+
+
+@mark.parametrize("backend", BACKENDS)
+def test_rate_limit_overhead(settings, backend):
+    settings.RATE_LIMIT_CACHE = backend
+    settings.RATE_LIMITS = {"login": {"ip": (10**9, 60), "username": (10, 300)}}
+    rate_limit.reset_rate_limits()
+
+    start = perf_counter()
+    for i in range(REQUESTS):
+        assert (
+            rate_limit.hit(
+                "login",
+                {"ip": f"10.0.{i % 256}.1", "username": f"user_{i}"},
+            )
+            is None
+        )
+    duration = perf_counter() - start
+
+    if backend is not None:
+        caches[backend].clear()
+    print(
+        f"\n{backend or 'in process'}: {REQUESTS} attempts in {duration:.2f} s, "
+        f"{duration / REQUESTS * 1e6:.1f} µs per request"
+    )
@@ -0,0 +1,55 @@
+"""
+Registrations per second through the API register view.
+
+Run with: pytest -s benchmarks/bench_registration.py
+The hasher cost defaults to PASSWORD_HASHER_ITERATIONS and can be changed with
+the BENCH_HASHER_ITERATIONS environment variable.
+"""
+
+import os
+from time import perf_counter
+
+from django.conf import settings as django_settings
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from pytest import mark
+from rest_framework.test import APIRequestFactory
+
+from caraauth.views.api_views import RegisterView
+
+REGISTRATIONS = 200
+ITERATIONS = int(
+    os.environ.get(
+        "BENCH_HASHER_ITERATIONS", django_settings.PASSWORD_HASHER_ITERATIONS
+    )
+)
+
+
+@mark.django_db
+def test_registrations(settings, web_client):
+    settings.PASSWORD_HASHERS = ["caraauth.hashers.PBKDF2PasswordHasher"]
+    settings.PASSWORD_HASHER_ITERATIONS = ITERATIONS
+    settings.RATE_LIMITS = {}
+    factory = APIRequestFactory()
+    view = RegisterView.as_view()
+
+    start = perf_counter()
+    with CaptureQueriesContext(connection) as queries:
+        for i in range(REGISTRATIONS):
+            request = factory.post(
+                "/",
+                {
+                    "username": f"some_user_{i}",
+                    "email": f"some.user{i}@example.com",
+                    "password": "strong-password123",
+                },
+                HTTP_X_API_CLIENT=web_client.name,
+            )
+            assert view(request).status_code == 200
+    duration = perf_counter() - start
+
+    print(
+        f"\n{ITERATIONS} iterations: {REGISTRATIONS} registrations in "
+        f"{duration:.2f} s, {REGISTRATIONS / duration:.1f} registrations/sec, "
+        f"{len(queries) / REGISTRATIONS:.1f} queries each"
+    )
@@ -0,0 +1,44 @@
+"""
+Authenticated API requests with and without the token cache.
+
+Run with: pytest -s benchmarks/bench_token_authentication.py
+"""
+
+from time import perf_counter
+
+from durin.auth import TokenAuthentication
+from durin.models import AuthToken
+from pytest import mark
+from rest_framework.reverse import reverse
+from rest_framework.test import APIClient
+
+from caraauth.authentication import CachedTokenAuthentication
+from caraauth.utils.token_cache import clear_local_token_cache
+from user_area.views.api.settings import UserProfileView
+
+REQUESTS = 2000
+
+
+@mark.parametrize(
+    "authentication_class", [TokenAuthentication, CachedTokenAuthentication]
+)
+@mark.django_db
+def test_authenticated_requests(monkeypatch, user, web_client, authentication_class):
+    monkeypatch.setattr(
+        UserProfileView, "authentication_classes", [authentication_class]
+    )
+    auth_token = AuthToken.objects.create(user, web_client)
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f"Bearer {auth_token.token}")
+    url = reverse("api:user_area:profile")
+    clear_local_token_cache()
+
+    start = perf_counter()
+    for _ in range(REQUESTS):
+        assert client.get(url).status_code == 200
+    duration = perf_counter() - start
+
+    print(
+        f"\n{authentication_class.__name__}: {REQUESTS} requests in "
+        f"{duration:.2f} s, {REQUESTS / duration:.0f} requests/sec"
+    )
@@ -0,0 +1,26 @@
+from statistics import mean, quantiles
+from time import perf_counter
+from typing import Callable
+
+
+def measure(func: Callable, runs: int) -> list[float]:
+    """
+    Call func `runs` times and return the duration of every call in seconds.
+    """
+    durations = []
+    for _ in range(runs):
+        start = perf_counter()
+        func()
+        durations.append(perf_counter() - start)
+    return durations
+
+
+def report(title: str, durations: list[float]):
+    """
+    Print mean and p99 latency of the given durations.
+    """
+    p99 = quantiles(durations, n=100)[98] if len(durations) > 1 else durations[0]
+    print(
+        f"\n{title}: {len(durations)} runs, "
+        f"mean {mean(durations) * 1e6:.1f} µs, p99 {p99 * 1e6:.1f} µs"
+    )
@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class CaraauthConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "caraauth"
+
+    def ready(self):
+        from caraauth import signals  # noqa: F401
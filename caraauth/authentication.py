@@ -1,5 +1,12 @@
+from durin.auth import TokenAuthentication
 from rest_framework.permissions import IsAuthenticated
 
+from caraauth.utils.token_cache import (
+    cache_token,
+    get_cached_token,
+    invalidate_cached_tokens,
+)
+
 
 def user_authentication_rule(user):
     """
@@ -30,3 +37,23 @@ class Has2FAEnabled(IsAuthenticated):
             super().has_permission(request, view) and request.user.has_2fa_enabled
         )
         return twofa_enabled
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """
+    Authenticate durin tokens, keep validated tokens in a local and a shared cache.
+
+    Cached entries are dropped when the token is refreshed or deleted and
+    when its user changes, see caraauth.signals.
+    """
+
+    @classmethod
+    def authenticate_credentials(cls, token: bytes):
+        if (auth_token := get_cached_token(token)) is not None:
+            if not auth_token.has_expired:
+                return cls.validate_user(auth_token)
+            # let durin delete the expired token
+            invalidate_cached_tokens(auth_token.token)
+        user, auth_token = super().authenticate_credentials(token)
+        cache_token(auth_token)
+        return user, auth_token
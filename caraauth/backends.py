@@ -2,6 +2,9 @@ from typing import Optional
 
 from django.contrib.auth import get_user_model
 from django.contrib.auth.backends import ModelBackend
+from django.contrib.auth.hashers import make_password
+
+from caraauth.utils import hashing
 
 UserModel = get_user_model()
 
@@ -20,7 +23,8 @@ class UsernameOrEmailModelBackend(ModelBackend):
         except UserModel.DoesNotExist:
             # Run the default password hasher once to reduce the timing
             # difference between an existing and a nonexistent user (#20760).
-            UserModel().set_password(password)
+            make_password(password)
         else:
-            if user.check_password(password) and self.user_can_authenticate(user):
+            is_correct = hashing.check_password(user, password)
+            if is_correct and self.user_can_authenticate(user):
                 return user
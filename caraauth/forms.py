@@ -4,11 +4,11 @@ from django.contrib.auth.hashers import make_password
 from django.core.exceptions import ValidationError
 from django.utils.translation import gettext_lazy as _
 from rest_framework import fields
-from rest_framework.validators import UniqueValidator
 
 from caraauth.models import User
-from caraauth.utils.two_fa import confirm_any_device_token
-from caraauth.validators import PasswordValidator, UsernameValidator
+from caraauth.utils import registration
+from caraauth.utils.two_fa import confirm_login_token
+from caraauth.validators import PasswordValidator
 
 
 def token_length_validator(token: str):
@@ -116,38 +116,27 @@ class RegisterForm(forms.ModelForm):
     class Meta:
         model = get_user_model()
         fields = ["email", "username", "password"]
-        extra_kwargs = {
-            "username": {
-                "validators": [
-                    UsernameValidator(),
-                    UniqueValidator(
-                        queryset=get_user_model().objects.all(),
-                        lookup="iexact",
-                        message=_("This username is already taken."),
-                    ),
-                ]
-            },
-            "email": {
-                "validators": [
-                    UniqueValidator(
-                        queryset=get_user_model().objects.all(),
-                        lookup="iexact",
-                        message=_("This email address is already taken."),
-                    )
-                ]
-            },
-        }
+
+    def validate_unique(self):
+        """
+        Check username and email case-insensitively in one query.
+        """
+        username = self.cleaned_data.get("username")
+        email = self.cleaned_data.get("email")
+        if not username or not email:
+            return
+        for field in sorted(registration.find_taken_fields(username, email)):
+            self.add_error(field, registration.TAKEN_MESSAGES[field])
 
     def create_user(self) -> "User":
         """
         Create a new user.
         """
         cleaned_data = self.cleaned_data
-        user = get_user_model()(
-            email=cleaned_data.get("email"), username=cleaned_data.get("username")
+        user = registration.build_user(
+            username=cleaned_data.get("username"), email=cleaned_data.get("email")
         )
-        user.set_password(cleaned_data.get("password"))
-        user.save()
+        registration.register_user(user, cleaned_data.get("password"))
         return user
 
 
@@ -179,13 +168,12 @@ class LoginForm(OTPForm):
                 message=_("This account is inactive."),
                 code="authorization",
             )
-        if user.has_2fa_enabled and not confirm_any_device_token(user, token):
+        if not confirm_login_token(user, token):
             self.add_error(
                 "otp",
                 ValidationError(message=_("Token is not valid", code="authorization")),
             )
             return cleaned_data
-        user.update_last_login()
-        user.save()
+        # last_login is saved by the user_logged_in signal of login()
         cleaned_data["user"] = user
         return cleaned_data
@@ -0,0 +1,33 @@
+from time import perf_counter
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django_otp.plugins.otp_static.models import StaticDevice
+
+from caraauth.utils.two_fa import rotate_static_device_tokens
+
+
+class Command(BaseCommand):
+    help = "Replace the backup tokens of all users with 2FA enabled."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=500)
+
+    def handle(self, *args, **options):
+        start = perf_counter()
+        devices = StaticDevice.objects.filter(confirmed=True).only("id", "user_id")
+        count = 0
+        last_id = 0
+        while batch := list(
+            devices.filter(pk__gt=last_id).order_by("pk")[: options["batch_size"]]
+        ):
+            with transaction.atomic():
+                rotate_static_device_tokens(batch)
+            count += len(batch)
+            last_id = batch[-1].pk
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Rotated the backup tokens of {count} users "
+                f"in {perf_counter() - start:.2f} s."
+            )
+        )
@@ -3,6 +3,7 @@ from durin.views import LoginView as DurinLoginView
 from rest_framework.exceptions import NotAcceptable
 
 from caraauth.models import User
+from caraauth.utils.clients import get_client
 
 
 class AuthMixin(DurinLoginView):
@@ -17,10 +18,9 @@ class AuthMixin(DurinLoginView):
         client_name = request.META.get("HTTP_X_API_CLIENT", None)
         if not client_name:
             raise NotAcceptable(detail="Client not set", code="no_api_client")
-        try:
-            return Client.objects.get(name=client_name)
-        except Client.DoesNotExist:
+        if (client := get_client(client_name)) is None:
             raise NotAcceptable(
                 detail="Es wurde kein API Client mit diesem Namen gefunden",
                 code="wrong_api_client",
             )
+        return client
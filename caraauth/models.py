@@ -4,10 +4,10 @@ from django.conf import settings
 from django.contrib.auth.models import AbstractUser
 from django.core.validators import MinLengthValidator
 from django.db import models
+from django.db.models.functions import Upper
 from django.utils import timezone
 from django.utils.module_loading import import_string
 from django.utils.translation import gettext_lazy as _
-from django_otp import user_has_device
 
 from caraauth import validators
 from caraauth.utils import two_fa
@@ -47,6 +47,19 @@ class User(AbstractUser, BaseModel):
     )
     last_login = models.DateTimeField(_("Last Login"), default=timezone.now)
 
+    class Meta(AbstractUser.Meta):
+        indexes = [
+            # login and registration look users up case-insensitively
+            models.Index(Upper("username"), name="user_username_upper_idx"),
+            models.Index(Upper("email"), name="user_email_upper_idx"),
+        ]
+
+    def save(self, *args, **kwargs):
+        self.modified_at = timezone.now()
+        if (update_fields := kwargs.get("update_fields")) is not None:
+            kwargs["update_fields"] = {*update_fields, "modified_at"}
+        super().save(*args, **kwargs)
+
     def get_profile_as_dict(self):
         """
         Return user instance as serialized data.
@@ -55,7 +68,7 @@ class User(AbstractUser, BaseModel):
 
     @property
     def has_2fa_enabled(self):
-        return user_has_device(self)
+        return two_fa.has_2fa_enabled(self)
 
     def enable_2fa(self):
         return self.get_or_create_totp_device()
@@ -69,6 +82,7 @@ class User(AbstractUser, BaseModel):
         """
         if not (device := two_fa.get_user_totp_device(self)):
             device = self.totpdevice_set.create(confirmed=confirmed, name="default")
+            two_fa.invalidate_2fa_state(self)
         return device
 
     def create_static_device(self):
@@ -89,7 +103,7 @@ class User(AbstractUser, BaseModel):
         Replace current static device tokens with new ones.
         """
         if device := two_fa.get_user_static_device(self):
-            return two_fa.generate_static_device_tokens(self, device)
+            return two_fa.generate_static_device_tokens(device)
         return []
 
     def verify_totp_device(self, otp: str) -> bool:
@@ -103,9 +117,3 @@ class User(AbstractUser, BaseModel):
         Confirm that provided otp is valid a user's TOTP or static device.
         """
         return two_fa.confirm_any_device_token(self, otp)
-
-    def update_last_login(self):
-        """
-        Update last login to current timestamp.
-        """
-        self.last_login = timezone.now()
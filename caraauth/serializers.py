@@ -3,10 +3,10 @@ from django.contrib.auth.hashers import make_password
 from django.utils.translation import gettext_lazy as _
 from rest_framework import fields, serializers
 from rest_framework.exceptions import ValidationError
-from rest_framework.validators import UniqueValidator
 
 from caraauth.models import User
-from caraauth.utils.two_fa import confirm_any_device_token
+from caraauth.utils import registration
+from caraauth.utils.two_fa import confirm_login_token
 from caraauth.validators import PasswordValidator, UsernameValidator
 
 
@@ -131,41 +131,26 @@ class RegisterSerializer(serializers.ModelSerializer):
         fields = ["email", "username", "password"]
         extra_kwargs = {
             "password": {"write_only": True, "style": {"input_type": "password"}},
-            "username": {
-                "validators": [
-                    UsernameValidator(),
-                    UniqueValidator(
-                        queryset=get_user_model().objects.all(),
-                        lookup="iexact",
-                        message=_("This username is already taken."),
-                    ),
-                ]
-            },
-            "email": {
-                "validators": [
-                    UniqueValidator(
-                        queryset=get_user_model().objects.all(),
-                        lookup="iexact",
-                        message=_("This email address is already taken."),
-                    )
-                ]
-            },
+            # uniqueness is checked case-insensitively in one query by validate
+            "username": {"validators": [UsernameValidator()]},
+            "email": {"validators": []},
         }
 
     def create(self, validated_data) -> "User":
         """
         Create a new user.
         """
-        user = get_user_model()(
-            email=validated_data.get("email"), username=validated_data.get("username")
+        user = registration.build_user(
+            username=validated_data["username"], email=validated_data["email"]
         )
-        user.set_password(validated_data.get("password"))
-        user.save()
+        registration.register_user(user, validated_data["password"])
         return user
 
     def validate(self, attrs):
-        user = self.create(attrs)
-        attrs["user"] = user
+        if taken := registration.find_taken_fields(attrs["username"], attrs["email"]):
+            raise ValidationError(
+                {field: registration.TAKEN_MESSAGES[field] for field in sorted(taken)}
+            )
         return attrs
 
 
@@ -201,11 +186,10 @@ class LoginSerializer(serializers.ModelSerializer, OTPSerializer):
                 detail=_("This account is inactive."),
                 code="authorization",
             )
-        if user.has_2fa_enabled and not confirm_any_device_token(user, token):
+        if not confirm_login_token(user, token):
             raise serializers.ValidationError(
                 detail={"otp": _("Token is not valid")}, code="authorization"
             )
-        user.update_last_login()
-        user.save()
+        # last_login is saved by the user_logged_in signal of the login view
         attrs["user"] = user
         return attrs
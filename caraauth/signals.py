@@ -0,0 +1,53 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from django_otp.plugins.otp_static.models import StaticDevice
+from django_otp.plugins.otp_totp.models import TOTPDevice
+from durin.models import AuthToken, Client
+
+from caraauth.models import User
+from caraauth.utils.clients import reset_client_registry
+from caraauth.utils.token_cache import invalidate_cached_tokens
+from caraauth.utils.two_fa import invalidate_2fa_state_cache
+
+
+@receiver(post_save, sender=TOTPDevice)
+@receiver(post_save, sender=StaticDevice)
+@receiver(post_delete, sender=TOTPDevice)
+@receiver(post_delete, sender=StaticDevice)
+def invalidate_2fa_state_on_device_change(sender, instance, **kwargs):
+    """
+    Drop the shared 2FA state of a user whose devices changed, e.g. in the admin.
+    """
+    invalidate_2fa_state_cache(instance.user_id)
+
+
+@receiver(post_save, sender=AuthToken)
+@receiver(post_delete, sender=AuthToken)
+def invalidate_cached_token(sender, instance: AuthToken, **kwargs):
+    """
+    Drop refreshed and deleted tokens from the token cache, e.g. on logout.
+    """
+    invalidate_cached_tokens(instance.token)
+
+
+@receiver(post_save, sender=User)
+def invalidate_cached_tokens_of_user(
+    sender, instance: User, created, update_fields, **kwargs
+):
+    """
+    Drop the cached tokens of a changed user, so requests see the current user.
+    """
+    # a login only touches last_login, which may be stale for TOKEN_CACHE_TIMEOUT
+    if created or update_fields == {"last_login", "modified_at"}:
+        return
+    if tokens := list(instance.auth_token_set.values_list("token", flat=True)):
+        invalidate_cached_tokens(*tokens)
+
+
+@receiver(post_save, sender=Client)
+@receiver(post_delete, sender=Client)
+def reload_client_registry(sender, **kwargs):
+    """
+    Reload the API clients on next access when clients change.
+    """
+    reset_client_registry()
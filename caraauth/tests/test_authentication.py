@@ -0,0 +1,151 @@
+from datetime import timedelta
+
+from django.core.cache import cache
+from durin.models import AuthToken
+from freezegun import freeze_time
+from pytest import fixture, mark, raises
+from rest_framework.exceptions import AuthenticationFailed
+
+from caraauth.authentication import CachedTokenAuthentication
+from caraauth.utils.token_cache import clear_local_token_cache, get_token_cache_key
+
+
+@fixture
+def shared_token_cache(settings):
+    settings.TOKEN_CACHE = "default"
+    yield
+    cache.clear()
+
+
+def authenticate(auth_token: AuthToken):
+    return CachedTokenAuthentication.authenticate_credentials(auth_token.token.encode())
+
+
+@mark.django_db
+def test__cached_token_authentication(user, web_client, django_assert_num_queries):
+    """
+    Ensure that a validated token is authenticated without queries afterwards.
+    """
+    auth_token = AuthToken.objects.create(user, web_client)
+
+    with django_assert_num_queries(1):
+        first_user, _ = authenticate(auth_token)
+    with django_assert_num_queries(0):
+        cached_user, cached_token = authenticate(auth_token)
+        assert cached_token.client == web_client
+
+    assert cached_user == user
+    # every request gets its own user instance
+    assert cached_user is not first_user
+
+
+@mark.django_db
+def test__cached_token_authentication__refresh(
+    user, web_client, django_assert_num_queries
+):
+    """
+    Ensure that a refreshed token is loaded again with its new expiry.
+    """
+    auth_token = AuthToken.objects.create(user, web_client)
+    authenticate(auth_token)
+
+    new_expiry = auth_token.renew_token()
+
+    with django_assert_num_queries(1):
+        _, cached_token = authenticate(auth_token)
+    assert cached_token.expiry == new_expiry
+
+
+@mark.django_db
+def test__cached_token_authentication__logout(user, web_client):
+    """
+    Ensure that a deleted token is not accepted anymore.
+    """
+    auth_token = AuthToken.objects.create(user, web_client)
+    authenticate(auth_token)
+
+    auth_token.delete()
+
+    with raises(AuthenticationFailed):
+        authenticate(auth_token)
+
+
+@mark.django_db
+def test__cached_token_authentication__user_changed(user, web_client):
+    """
+    Ensure that changes of the user are visible to the next request.
+    """
+    auth_token = AuthToken.objects.create(user, web_client)
+    authenticate(auth_token)
+
+    user.email = "changed@example.com"
+    user.save()
+
+    assert authenticate(auth_token)[0].email == "changed@example.com"
+
+
+@mark.django_db
+def test__cached_token_authentication__user_deleted(user, web_client):
+    """
+    Ensure that tokens of a deleted user are not accepted anymore.
+    """
+    auth_token = AuthToken.objects.create(user, web_client)
+    authenticate(auth_token)
+
+    user.delete()
+
+    with raises(AuthenticationFailed):
+        authenticate(auth_token)
+
+
+@mark.django_db
+def test__cached_token_authentication__expired(user, web_client):
+    """
+    Ensure that a cached token is rejected and deleted once it expired.
+    """
+    with freeze_time() as frozen_time:
+        auth_token = AuthToken.objects.create(
+            user, web_client, delta_ttl=timedelta(seconds=30)
+        )
+        authenticate(auth_token)
+
+        frozen_time.tick(timedelta(seconds=31))
+
+        with raises(AuthenticationFailed):
+            authenticate(auth_token)
+    assert not AuthToken.objects.filter(pk=auth_token.pk).exists()
+
+
+@mark.django_db
+def test__cached_token_authentication__shared_cache(
+    shared_token_cache, user, web_client, django_assert_num_queries
+):
+    """
+    Ensure that tokens validated by another process are taken from the shared cache.
+    """
+    auth_token = AuthToken.objects.create(user, web_client)
+    authenticate(auth_token)
+    clear_local_token_cache()
+
+    with django_assert_num_queries(0):
+        assert authenticate(auth_token)[0] == user
+
+
+@mark.django_db
+def test__cached_token_authentication__no_secrets(shared_token_cache, user, web_client):
+    """
+    Ensure that neither the token nor the password hash is cached.
+    """
+    auth_token = AuthToken.objects.create(user, web_client)
+    authenticate(auth_token)
+
+    data = cache.get(get_token_cache_key(auth_token.token))
+    assert auth_token.token not in str(data)
+    assert user.password not in str(data)
+    assert "password" not in data["user"]
+
+    clear_local_token_cache()
+    cached_user, cached_token = authenticate(auth_token)
+    assert cached_token.token == auth_token.token
+    # loaded from the database if needed
+    assert cached_user.password == user.password
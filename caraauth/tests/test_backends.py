@@ -0,0 +1,64 @@
+from time import monotonic, sleep
+
+from django.contrib.auth import authenticate
+from django.contrib.auth.hashers import identify_hasher
+from pytest import fixture, mark
+
+from caraauth.models import User
+
+PASSWORD = "password123"
+
+
+@fixture
+def pbkdf2_user(settings, user):
+    settings.PASSWORD_HASHERS = ["caraauth.hashers.PBKDF2PasswordHasher"]
+    settings.PASSWORD_HASHER_ITERATIONS = 1000
+    user.set_password(PASSWORD)
+    user.save()
+    settings.PASSWORD_HASHER_ITERATIONS = 2000
+    return user
+
+
+def hash_iterations(user: User) -> int:
+    encoded = User.objects.get(pk=user.pk).password
+    return identify_hasher(encoded).decode(encoded)["iterations"]
+
+
+@mark.django_db
+def test__authenticate__username_or_email(pbkdf2_user):
+    """
+    Ensure that users are authenticated by username or email address.
+    """
+    assert authenticate(username=pbkdf2_user.username, password=PASSWORD) == pbkdf2_user
+    assert authenticate(username=pbkdf2_user.email, password=PASSWORD) == pbkdf2_user
+    assert authenticate(username=pbkdf2_user.username, password="wrong") is None
+    assert authenticate(username="nobody", password=PASSWORD) is None
+
+
+@mark.django_db
+def test__authenticate__rehash(settings, pbkdf2_user):
+    """
+    Ensure that an outdated hash is replaced after a successful login.
+    """
+    settings.PASSWORD_REHASH_EAGER = True
+
+    assert authenticate(username=pbkdf2_user.username, password="wrong") is None
+    assert hash_iterations(pbkdf2_user) == 1000
+
+    user = authenticate(username=pbkdf2_user.username, password=PASSWORD)
+    assert hash_iterations(pbkdf2_user) == 2000
+    assert user.check_password(PASSWORD)
+    assert user.password == User.objects.get(pk=user.pk).password
+
+
+@mark.django_db(transaction=True)
+def test__authenticate__rehash_in_background(pbkdf2_user):
+    """
+    Ensure that an outdated hash is replaced in the background.
+    """
+    assert authenticate(username=pbkdf2_user.username, password=PASSWORD)
+
+    deadline = monotonic() + 5
+    while hash_iterations(pbkdf2_user) != 2000 and monotonic() < deadline:
+        sleep(0.01)
+    assert hash_iterations(pbkdf2_user) == 2000
@@ -0,0 +1,58 @@
+from durin.models import Client
+from pytest import mark
+
+from caraauth.utils.clients import get_client
+
+
+@mark.django_db
+def test__get_client__loaded_once(web_client, django_assert_num_queries):
+    """
+    Ensure that clients are looked up in memory after the first access.
+    """
+    with django_assert_num_queries(1):
+        assert get_client("web") == web_client
+        assert get_client("web") == web_client
+
+
+@mark.django_db
+def test__get_client__unknown(web_client):
+    """
+    Ensure that no client is returned for an unknown name.
+    """
+    assert get_client("unknown") is None
+
+
+@mark.django_db
+def test__get_client__changed(web_client):
+    """
+    Ensure that created, renamed and deleted clients are picked up.
+    """
+    assert get_client("web") == web_client
+    app_client = Client.objects.create(name="app")
+    assert get_client("app") == app_client
+
+    web_client.name = "browser"
+    web_client.save()
+    assert get_client("web") is None
+    assert get_client("browser") == web_client
+
+    app_client.delete()
+    assert get_client("app") is None
+
+
+@mark.django_db
+def test__get_client__created_by_another_process(
+    settings, web_client, django_assert_num_queries
+):
+    """
+    Ensure that unknown names cost no query and new clients show up after the max. age.
+    """
+    assert get_client("web") == web_client
+    # no signal is sent for bulk inserts, like for a change in another process
+    Client.objects.bulk_create([Client(name="app")])
+
+    with django_assert_num_queries(0):
+        assert get_client("app") is None
+        assert get_client("unknown") is None
+    settings.CLIENT_REGISTRY_MAX_AGE = 0
+    assert get_client("app").name == "app"
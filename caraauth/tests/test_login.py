@@ -0,0 +1,93 @@
+from django.contrib.auth.signals import user_logged_in
+from django.test import RequestFactory
+from pytest import mark
+
+from caraauth.forms import LoginForm
+from caraauth.models import User
+from caraauth.serializers import LoginSerializer
+from caraauth.tests.factories import UserFactory
+from caraauth.tests.test_two_fa import current_token
+
+
+def login(serializer: LoginSerializer) -> User:
+    """
+    Validate the credentials and send the signal like the login views do.
+    """
+    serializer.is_valid(raise_exception=True)
+    user = serializer.validated_data["user"]
+    user_logged_in.send(sender=User, request=RequestFactory().post("/"), user=user)
+    return user
+
+
+@mark.django_db
+def test__login__query_budget(django_assert_num_queries):
+    """
+    Ensure that a login without 2FA costs a fixed number of queries.
+    """
+    UserFactory.create(username="g4m3r", password="strong-password123")
+    serializer = LoginSerializer(
+        data={"username": "g4m3r", "password": "strong-password123"}
+    )
+
+    # user, 2FA state, last_login
+    with django_assert_num_queries(3):
+        login(serializer)
+
+
+@mark.django_db
+def test__login_2fa__query_budget(django_assert_num_queries):
+    """
+    Ensure that a 2FA login reuses the device snapshot and saves last_login only.
+    """
+    user = UserFactory.create(username="g4m3r", password="strong-password123")
+    user.get_or_create_totp_device(confirmed=True)
+    user.create_static_device()
+    device = user.totpdevice_set.get()
+    serializer = LoginSerializer(
+        data={
+            "username": "g4m3r",
+            "password": "strong-password123",
+            "otp": current_token(device),
+        }
+    )
+
+    # user, TOTP devices, static devices and tokens, verified device, last_login
+    with django_assert_num_queries(6) as captured:
+        logged_in_user = login(serializer)
+
+    updates = [q["sql"] for q in captured if q["sql"].startswith("UPDATE")]
+    assert updates[-1].startswith('UPDATE "caraauth_user" SET')
+    assert '"last_login"' in updates[-1]
+    assert '"password"' not in updates[-1]
+    assert User.objects.get(pk=user.pk).last_login == logged_in_user.last_login
+
+
+@mark.django_db
+def test__login_2fa__invalid_token():
+    """
+    Ensure that a wrong token is rejected and last_login stays untouched.
+    """
+    user = UserFactory.create(username="g4m3r", password="strong-password123")
+    user.get_or_create_totp_device(confirmed=True)
+    serializer = LoginSerializer(
+        data={"username": "g4m3r", "password": "strong-password123", "otp": "000000"}
+    )
+
+    assert not serializer.is_valid()
+    assert "otp" in serializer.errors
+    assert User.objects.get(pk=user.pk).last_login == user.last_login
+
+
+@mark.django_db
+def test__login_form__query_budget(django_assert_num_queries):
+    """
+    Ensure that the login form doesn't save the user on its own.
+    """
+    UserFactory.create(username="g4m3r", password="strong-password123")
+    form = LoginForm(
+        data={"username_or_email": "g4m3r", "password": "strong-password123"}
+    )
+
+    # user, 2FA state
+    with django_assert_num_queries(2):
+        assert form.is_valid()
@@ -0,0 +1,45 @@
+from django.db import connection
+from pytest import fixture, mark
+
+from caraauth.models import User
+from caraauth.tests.factories import UserFactory
+
+pytestmark = [
+    mark.django_db,
+    mark.skipif(
+        connection.vendor != "postgresql", reason="query plans need PostgreSQL"
+    ),
+]
+
+
+@fixture
+def seeded_users():
+    UserFactory.create_batch(50)
+    with connection.cursor() as cursor:
+        cursor.execute(f"ANALYZE {User._meta.db_table}")
+        # the seeded table is tiny, force the planner to show usable indexes
+        cursor.execute("SET LOCAL enable_seqscan = off")
+
+
+def explain(queryset) -> str:
+    plan = queryset.explain()
+    assert "Seq Scan" not in plan
+    return plan
+
+
+def test_query_plan__username_iexact(seeded_users):
+    """
+    Ensure that users are looked up case-insensitively by username from an index.
+    """
+    plan = explain(User.objects.filter(username__iexact="SOME_USER_1"))
+
+    assert "user_username_upper_idx" in plan
+
+
+def test_query_plan__email_iexact(seeded_users):
+    """
+    Ensure that users are looked up case-insensitively by email from an index.
+    """
+    plan = explain(User.objects.filter(email__iexact="Some.User1@Example.com"))
+
+    assert "user_email_upper_idx" in plan
@@ -0,0 +1,112 @@
+from datetime import timedelta
+
+from django.core.cache import cache
+from freezegun import freeze_time
+from pytest import fixture, mark
+from rest_framework import status
+from rest_framework.test import APIRequestFactory
+
+from caraauth.utils import rate_limit
+from caraauth.views.api_views import LoginView
+
+
+@fixture
+def login_limits(settings):
+    settings.RATE_LIMITS = {"login": {"ip": (10, 60), "username": (3, 60)}}
+
+
+@fixture(params=[None, "default"])
+def rate_limit_cache(request, settings):
+    """
+    Count attempts in the process and in a shared cache.
+    """
+    settings.RATE_LIMIT_CACHE = request.param
+    yield
+    cache.clear()
+
+
+def hit(username: str, ip: str = "127.0.0.1"):
+    return rate_limit.hit("login", {"ip": ip, "username": username})
+
+
+def test__hit__limit(login_limits, rate_limit_cache):
+    """
+    Ensure that attempts over the limit of an identity are rejected.
+    """
+    with freeze_time("2026-01-01 12:00:00"):
+        for _ in range(3):
+            assert hit("g4m3r") is None
+
+        assert hit("g4m3r") == 60
+        assert hit("some_user") is None
+
+
+def test__hit__sliding_window(login_limits, rate_limit_cache):
+    """
+    Ensure that attempts of the previous window count by their overlap.
+    """
+    with freeze_time("2026-01-01 12:00:00") as frozen_time:
+        for _ in range(3):
+            assert hit("g4m3r") is None
+
+        frozen_time.tick(timedelta(seconds=60))
+        assert hit("g4m3r") is not None
+
+        # two thirds of the previous window are still within the last minute
+        frozen_time.tick(timedelta(seconds=20))
+        assert hit("g4m3r") is None
+        assert hit("g4m3r") is not None
+
+        # one third
+        frozen_time.tick(timedelta(seconds=20))
+        assert hit("g4m3r") is None
+        assert hit("g4m3r") is not None
+
+        frozen_time.tick(timedelta(seconds=120))
+        assert hit("g4m3r") is None
+
+
+def test__hit__any_identity_over_limit(login_limits):
+    """
+    Ensure that an address is limited across usernames.
+    """
+    for i in range(10):
+        assert hit(f"user_{i}") is None
+
+    assert hit("user_10") is not None
+    assert hit("user_10", ip="127.0.0.2") is None
+
+
+@mark.django_db
+def test__login_view__rate_limited(login_limits, django_assert_num_queries):
+    """
+    Ensure that a limited login attempt is rejected before the user is looked up.
+    """
+    factory = APIRequestFactory()
+    data = {"username": "g4m3r", "password": "wrong-password123"}
+    for _ in range(3):
+        response = LoginView.as_view()(factory.post("/", data))
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    with django_assert_num_queries(0):
+        response = LoginView.as_view()(factory.post("/", {**data, "username": "G4M3R"}))
+
+    assert response.status_code == status.HTTP_429_TOO_MANY_REQUESTS
+
+
+@mark.django_db
+def test__login_view__spoofed_forwarded_for(settings):
+    """
+    Ensure that a new X-Forwarded-For on every attempt doesn't reset the count per address.
+    """
+    settings.RATE_LIMITS = {"login": {"ip": (3, 60)}}
+    factory = APIRequestFactory()
+    data = {"username": "g4m3r", "password": "wrong-password123"}
+    for i in range(3):
+        request = factory.post("/", data, HTTP_X_FORWARDED_FOR=f"10.0.0.{i}")
+        assert LoginView.as_view()(request).status_code == status.HTTP_400_BAD_REQUEST
+
+    request = factory.post("/", data, HTTP_X_FORWARDED_FOR="10.0.0.99")
+    response = LoginView.as_view()(request)
+
+    assert response.status_code == status.HTTP_429_TOO_MANY_REQUESTS
@@ -0,0 +1,101 @@
+from durin.models import AuthToken
+from pytest import fixture, mark
+from rest_framework import status
+from rest_framework.test import APIRequestFactory
+
+from caraauth.forms import RegisterForm
+from caraauth.models import User
+from caraauth.serializers import RegisterSerializer
+from caraauth.tests.factories import UserFactory
+from caraauth.utils import registration
+from caraauth.views.api_views import RegisterView
+
+VALID_USER_DATA = {
+    "username": "g4m3r",
+    "email": "g4m3r@example.com",
+    "password": "strong-password123",
+}
+
+
+def register(client_name: str = "web", **data):
+    request = APIRequestFactory().post(
+        "/", {**VALID_USER_DATA, **data}, HTTP_X_API_CLIENT=client_name
+    )
+    return RegisterView.as_view()(request)
+
+
+@fixture
+def hashed(monkeypatch) -> list[str]:
+    """
+    Record the passwords hashed for new users.
+    """
+    passwords = []
+    make_password = registration.make_password
+
+    def record(password):
+        passwords.append(password)
+        return make_password(password)
+
+    monkeypatch.setattr(registration, "make_password", record)
+    return passwords
+
+
+@mark.django_db
+def test__register(web_client, hashed):
+    """
+    Ensure that the user and their token are created with the password hashed once.
+    """
+    response = register()
+
+    assert response.status_code == status.HTTP_200_OK
+    user = User.objects.get(username="g4m3r")
+    assert user.check_password("strong-password123")
+    assert (
+        AuthToken.objects.get(user=user, client=web_client).token
+        == (response.data["token"])
+    )
+    assert hashed == ["strong-password123"]
+
+
+@mark.django_db
+def test__register__unknown_client(hashed):
+    """
+    Ensure that nothing is inserted nor hashed when the API client is unknown.
+    """
+    response = register(client_name="unknown")
+
+    assert response.status_code == status.HTTP_406_NOT_ACCEPTABLE
+    assert not User.objects.exists()
+    assert hashed == []
+
+
+@mark.django_db
+def test__register__taken(django_assert_num_queries):
+    """
+    Ensure that username and email are checked case-insensitively in one query.
+    """
+    UserFactory.create(username="G4M3R", email="other@example.com")
+    UserFactory.create(username="other_user", email="G4M3R@example.com")
+    serializer = RegisterSerializer(data=VALID_USER_DATA)
+
+    with django_assert_num_queries(1):
+        assert not serializer.is_valid()
+
+    assert serializer.errors == {
+        "username": ["This username is already taken."],
+        "email": ["This email address is already taken."],
+    }
+
+
+@mark.django_db
+def test__register_form__taken(django_assert_num_queries):
+    """
+    Ensure that the register form checks uniqueness case-insensitively in one query.
+    """
+    UserFactory.create(username="G4M3R")
+    form = RegisterForm(data=VALID_USER_DATA)
+
+    with django_assert_num_queries(1):
+        assert not form.is_valid()
+
+    assert form.errors == {"username": ["This username is already taken."]}
@@ -0,0 +1,167 @@
+from django.core.cache import cache
+from django.core.management import call_command
+from django_otp.oath import TOTP
+from django_otp.plugins.otp_static.models import StaticToken
+from django_otp.plugins.otp_totp.models import TOTPDevice
+from pytest import fixture, mark
+
+from caraauth.models import User
+from caraauth.tests.factories import UserFactory
+from caraauth.utils import two_fa
+
+
+@fixture
+def shared_2fa_cache(settings):
+    settings.TWO_FA_STATE_CACHE = "default"
+    yield
+    cache.clear()
+
+
+def current_token(device: TOTPDevice) -> str:
+    totp = TOTP(device.bin_key, device.step, device.t0, device.digits, device.drift)
+    return str(totp.token()).zfill(device.digits)
+
+
+@mark.django_db
+def test__has_2fa_enabled__one_query_per_request(user_2fa, django_assert_num_queries):
+    """
+    Ensure that the 2FA state costs one query and is remembered on the user.
+    """
+    user = User.objects.get(pk=user_2fa.pk)
+
+    with django_assert_num_queries(1):
+        assert user.has_2fa_enabled
+        assert user.has_2fa_enabled
+
+
+@mark.django_db
+def test__has_2fa_enabled__unconfirmed_device(user):
+    """
+    Ensure that an unconfirmed TOTP device does not enable 2FA.
+    """
+    user.enable_2fa()
+
+    assert not user.has_2fa_enabled
+
+
+@mark.django_db
+def test__has_2fa_enabled__shared_cache(
+    user_2fa, shared_2fa_cache, django_assert_num_queries
+):
+    """
+    Ensure that the 2FA state is shared between requests via the shared cache.
+    """
+    assert User.objects.get(pk=user_2fa.pk).has_2fa_enabled
+    user = User.objects.get(pk=user_2fa.pk)
+
+    with django_assert_num_queries(0):
+        assert user.has_2fa_enabled
+
+
+@mark.django_db
+def test__has_2fa_enabled__invalidated(user, shared_2fa_cache):
+    """
+    Ensure that enabling, verifying and disabling 2FA update the cached state.
+    """
+    device = user.enable_2fa()
+    assert not user.has_2fa_enabled
+
+    assert user.verify_totp_device(current_token(device))
+    assert user.has_2fa_enabled
+    assert User.objects.get(pk=user.pk).has_2fa_enabled
+
+    user.disable_2fa()
+    assert not user.has_2fa_enabled
+    assert not User.objects.get(pk=user.pk).has_2fa_enabled
+
+
+@mark.django_db
+def test__has_2fa_enabled__device_changed_elsewhere(user_2fa, shared_2fa_cache):
+    """
+    Ensure that the shared state is dropped when devices are removed directly.
+    """
+    assert User.objects.get(pk=user_2fa.pk).has_2fa_enabled
+
+    for device in TOTPDevice.objects.filter(user=user_2fa):
+        device.delete()
+    user_2fa.staticdevice_set.all().delete()
+
+    assert not User.objects.get(pk=user_2fa.pk).has_2fa_enabled
+
+
+@mark.django_db
+def test__user_devices__loaded_once(user_2fa, django_assert_num_queries):
+    """
+    Ensure that all device lookups of a request share one snapshot.
+    """
+    user = User.objects.get(pk=user_2fa.pk)
+
+    with django_assert_num_queries(3):
+        assert two_fa.get_user_totp_device(user, confirmed=True)
+        assert two_fa.default_device(user)
+        assert two_fa.get_user_static_device(user)
+        assert len(two_fa.get_static_device_tokens(user)) == 6
+        assert user.has_2fa_enabled
+        assert not two_fa.get_user_totp_device(user, confirmed=False)
+
+
+@mark.django_db
+def test__user_devices__regenerated_tokens(user_2fa):
+    """
+    Ensure that regenerated static tokens replace the prefetched ones.
+    """
+    user = User.objects.get(pk=user_2fa.pk)
+    old_tokens = {token.token for token in two_fa.get_static_device_tokens(user)}
+
+    two_fa.create_static_device(user)
+
+    new_tokens = {token.token for token in two_fa.get_static_device_tokens(user)}
+    assert len(new_tokens) == 6
+    assert not old_tokens & new_tokens
+
+
+@mark.django_db
+def test__user_devices__used_static_token(user_2fa):
+    """
+    Ensure that a used static token is not listed anymore.
+    """
+    user = User.objects.get(pk=user_2fa.pk)
+    token = two_fa.get_static_device_tokens(user)[0].token
+
+    assert two_fa.confirm_any_device_token(user, token)
+
+    assert len(two_fa.get_static_device_tokens(user)) == 5
+    assert not two_fa.confirm_any_device_token(user, token)
+
+
+@mark.django_db
+def test__generate_static_device_tokens__bulk(user_2fa, django_assert_num_queries):
+    """
+    Ensure that tokens are replaced with one delete and one insert.
+    """
+    device = two_fa.get_user_static_device(user_2fa)
+
+    with django_assert_num_queries(2):
+        tokens = two_fa.generate_static_device_tokens(device)
+
+    assert len(tokens) == 6
+    assert set(StaticToken.objects.filter(device=device)) == set(tokens)
+
+
+@mark.django_db
+def test_rotate_backup_tokens_command(capsys):
+    """
+    Ensure that the backup tokens of every user with 2FA are replaced in batches.
+    """
+    users = UserFactory.create_batch(3)
+    old_tokens = set()
+    for user in users:
+        old_tokens |= {token.token for token in user.create_static_device()}
+
+    call_command("rotate_backup_tokens", batch_size=2)
+
+    assert "Rotated the backup tokens of 3 users" in capsys.readouterr().out
+    for user in users:
+        tokens = set(user.static_device_tokens.values_list("token", flat=True))
+        assert len(tokens) == 6
+        assert not tokens & old_tokens
@@ -0,0 +1,102 @@
+from typing import Optional
+
+from django.contrib import messages
+from django.utils.translation import gettext as _
+from rest_framework.throttling import BaseThrottle
+
+from caraauth.utils import rate_limit
+
+
+def get_client_ip(request) -> str:
+    """
+    Return the client's address, honoring NUM_PROXIES like the DRF throttles.
+
+    X-Forwarded-For is only trusted as far as NUM_PROXIES reaches, otherwise
+    anyone could pick a new address for each attempt.
+    """
+    return BaseThrottle().get_ident(request)
+
+
+class RateLimitThrottle(BaseThrottle):
+    """
+    Reject requests of identities over their RATE_LIMITS before the view runs.
+    """
+
+    scope: str = None
+
+    def __init__(self):
+        self.retry_after: Optional[float] = None
+
+    def get_identities(self, request, view) -> dict[str, Optional[str]]:
+        return {"ip": self.get_ident(request)}
+
+    def allow_request(self, request, view) -> bool:
+        self.retry_after = rate_limit.hit(
+            self.scope, self.get_identities(request, view)
+        )
+        return self.retry_after is None
+
+    def wait(self) -> Optional[float]:
+        return self.retry_after
+
+
+class LoginRateThrottle(RateLimitThrottle):
+    """
+    Limit login attempts per address and username or email address.
+
+    There is no limit per API client, one client's bucket is shared by all of
+    its users, so flooding it would lock everyone out.
+    """
+
+    scope = "login"
+
+    def get_identities(self, request, view) -> dict[str, Optional[str]]:
+        username = request.data.get("username")
+        return {
+            **super().get_identities(request, view),
+            "username": username.lower() if isinstance(username, str) else None,
+        }
+
+
+class OTPRateThrottle(RateLimitThrottle):
+    """
+    Limit OTP verifications per address and user.
+    """
+
+    scope = "otp"
+
+    def get_identities(self, request, view) -> dict[str, Optional[str]]:
+        return {
+            **super().get_identities(request, view),
+            "user": str(request.user.pk) if request.user.is_authenticated else None,
+        }
+
+
+class LoginRateLimitMixin:
+    """
+    Limit login attempts of TemplateViews like LoginRateThrottle does for the API.
+    Rejected attempts get the login page with status 429.
+    """
+
+    username_field = "username_or_email"
+
+    def post(self, request, *args, **kwargs):
+        username = request.POST.get(self.username_field)
+        retry_after = rate_limit.hit(
+            "login",
+            {
+                "ip": get_client_ip(request),
+                "username": username.lower() if username else None,
+            },
+        )
+        if retry_after is None:
+            return super().post(request, *args, **kwargs)
+        messages.error(
+            request,
+            _("Too many login attempts. Please try again in %(seconds)d seconds.")
+            % {"seconds": retry_after},
+        )
+        response = self.get(request, *args, **kwargs)
+        response.status_code = 429
+        response["Retry-After"] = str(retry_after)
+        return response
@@ -0,0 +1,39 @@
+from threading import Lock
+from time import monotonic
+from typing import Optional
+
+from django.conf import settings
+from durin.models import Client
+
+_clients: Optional[dict[str, Client]] = None
+_loaded_at = 0.0
+_clients_lock = Lock()
+
+
+def get_client(name: str) -> Optional[Client]:
+    """
+    Return the API client with the given name, None if there is none.
+
+    All clients are loaded once and kept in memory. The registry is reset on
+    Client changes in this process and reloaded after CLIENT_REGISTRY_MAX_AGE
+    seconds to pick up changes made by other processes. Unknown names are not
+    looked up in the database, so bogus requests cost no query.
+    """
+    global _clients, _loaded_at
+    with _clients_lock:
+        if (
+            _clients is None
+            or monotonic() - _loaded_at > settings.CLIENT_REGISTRY_MAX_AGE
+        ):
+            _clients = {client.name: client for client in Client.objects.all()}
+            _loaded_at = monotonic()
+        return _clients.get(name)
+
+
+def reset_client_registry():
+    """
+    Drop the loaded clients, they are reloaded on next access.
+    """
+    global _clients
+    with _clients_lock:
+        _clients = None
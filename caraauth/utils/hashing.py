@@ -0,0 +1,81 @@
+from concurrent.futures import ThreadPoolExecutor
+from threading import Lock
+from typing import TYPE_CHECKING, Optional
+
+from django.conf import settings
+from django.contrib.auth import get_user_model, hashers
+from django.db import connection
+
+if TYPE_CHECKING:
+    from caraauth.models import User
+
+_rehash_executor: Optional[ThreadPoolExecutor] = None
+_rehash_executor_lock = Lock()
+
+
+def get_rehash_executor() -> ThreadPoolExecutor:
+    """
+    Return the thread replacing outdated hashes after the login returned.
+    """
+    global _rehash_executor
+    with _rehash_executor_lock:
+        if _rehash_executor is None:
+            _rehash_executor = ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix="password-rehash"
+            )
+        return _rehash_executor
+
+
+def check_password(user: "User", password: str) -> bool:
+    """
+    Return whether the password is correct, rehash it if the hasher is outdated.
+
+    Unlike User.check_password, the outdated hash is not replaced within the
+    request but in a background thread after the check.
+    """
+    encoded = user.password
+    outdated = False
+
+    def setter(raw_password: str):
+        nonlocal outdated
+        outdated = True
+
+    is_correct = hashers.check_password(password, encoded, setter)
+    if outdated:
+        if settings.PASSWORD_REHASH_EAGER:
+            user.password = rehash_password(user.pk, encoded, password)
+        else:
+            get_rehash_executor().submit(
+                _rehash_password_in_background, user.pk, encoded, password
+            )
+    return is_correct
+
+
+def rehash_password(user_id: int, encoded: str, password: str) -> str:
+    """
+    Replace the hash with one of the preferred hasher, if it did not change meanwhile.
+    """
+    new_encoded = hashers.make_password(password)
+    get_user_model()._default_manager.filter(pk=user_id, password=encoded).update(
+        password=new_encoded
+    )
+    return new_encoded
+
+
+def _rehash_password_in_background(user_id: int, encoded: str, password: str):
+    try:
+        rehash_password(user_id, encoded, password)
+    finally:
+        # the thread outlives requests, don't leak its connection
+        connection.close()
+
+
+def reset_rehash_executor():
+    """
+    Shut the rehash thread down after the pending rehashes, it is restarted on next use.
+    """
+    global _rehash_executor
+    with _rehash_executor_lock:
+        executor, _rehash_executor = _rehash_executor, None
+    if executor is not None:
+        executor.shutdown()
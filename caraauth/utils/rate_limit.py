@@ -0,0 +1,123 @@
+from hashlib import sha256
+from math import ceil
+from threading import Lock
+from time import time
+from typing import Optional
+
+from django.conf import settings
+from django.core.cache import caches
+
+# key -> (expires at, count), used without a shared cache
+_windows: dict[str, tuple[float, int]] = {}
+_windows_lock = Lock()
+
+
+def get_rate_limit_cache():
+    """
+    Return the shared cache for the rate limits if one is configured.
+    """
+    if settings.RATE_LIMIT_CACHE is None:
+        return None
+    return caches[settings.RATE_LIMIT_CACHE]
+
+
+def get_rate_limit_key(scope: str, kind: str, value: str, window: int) -> str:
+    digest = sha256(value.encode()).hexdigest()
+    return f"caraauth:rate:{scope}:{kind}:{digest}:{window}"
+
+
+def hit(scope: str, identities: dict[str, Optional[str]]) -> Optional[float]:
+    """
+    Count an attempt of the identities, return the seconds to wait if one is over its limit.
+
+    RATE_LIMITS maps the scope to a (limit, period) for each kind of identity,
+    e.g. ip or username. The counts of the current and the previous window
+    are weighted by their overlap with the sliding window of the last period.
+    A rejected attempt is not counted.
+    """
+    now = time()
+    limits = []
+    for kind, (limit, period) in settings.RATE_LIMITS.get(scope, {}).items():
+        if not (value := identities.get(kind)):
+            continue
+        window = int(now // period)
+        current_key = get_rate_limit_key(scope, kind, value, window)
+        previous_key = get_rate_limit_key(scope, kind, value, window - 1)
+        limits.append((limit, period, current_key, previous_key))
+    if not limits:
+        return None
+
+    counts = _get_counts(
+        [
+            key
+            for *_, current_key, previous_key in limits
+            for key in (current_key, previous_key)
+        ]
+    )
+    retry_after = None
+    for limit, period, current_key, previous_key in limits:
+        current = counts.get(current_key, 0)
+        previous = counts.get(previous_key, 0)
+        elapsed = now % period / period
+        if previous * (1 - elapsed) + current < limit:
+            continue
+        if current >= limit:
+            wait = period * (1 - elapsed)
+        else:
+            # until enough of the previous window slid out
+            wait = period * (1 - (limit - current) / previous - elapsed)
+        retry_after = max(retry_after or 0, wait)
+    if retry_after is not None:
+        return max(1, ceil(retry_after))
+
+    for _, period, current_key, _ in limits:
+        # the current window is still the previous one for another period
+        _increment(current_key, 2 * period)
+    return None
+
+
+def reset_rate_limits():
+    """
+    Forget the attempts counted in this process.
+    """
+    with _windows_lock:
+        _windows.clear()
+
+
+def _get_counts(keys: list[str]) -> dict[str, int]:
+    if (cache := get_rate_limit_cache()) is not None:
+        return cache.get_many(keys)
+    now = time()
+    with _windows_lock:
+        return {
+            key: entry[1]
+            for key in keys
+            if (entry := _windows.get(key)) is not None and entry[0] > now
+        }
+
+
+def _increment(key: str, timeout: int):
+    if (cache := get_rate_limit_cache()) is not None:
+        if not cache.add(key, 1, timeout):
+            try:
+                cache.incr(key)
+            except ValueError:
+                # expired in between
+                cache.add(key, 1, timeout)
+        return
+    now = time()
+    with _windows_lock:
+        entry = _windows.get(key)
+        if entry is None or entry[0] <= now:
+            if len(_windows) >= settings.RATE_LIMIT_LOCAL_SIZE:
+                _evict(now)
+            entry = (now + timeout, 0)
+        _windows[key] = (entry[0], entry[1] + 1)
+
+
+def _evict(now: float):
+    for key in [key for key, (expires_at, _) in _windows.items() if expires_at <= now]:
+        del _windows[key]
+    # still full of live windows, e.g. while flooded from many addresses
+    while len(_windows) >= settings.RATE_LIMIT_LOCAL_SIZE:
+        del _windows[next(iter(_windows))]
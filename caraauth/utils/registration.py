@@ -0,0 +1,60 @@
+from typing import TYPE_CHECKING, Optional
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.db import transaction
+from django.db.models import Q
+from django.utils.translation import gettext_lazy as _
+from durin.models import AuthToken
+
+if TYPE_CHECKING:
+    from durin.models import Client
+
+    from caraauth.models import User
+
+TAKEN_MESSAGES = {
+    "username": _("This username is already taken."),
+    "email": _("This email address is already taken."),
+}
+
+
+def find_taken_fields(username: str, email: str) -> set[str]:
+    """
+    Return which of username and email are taken, case-insensitively, in one query.
+    """
+    taken = set()
+    rows = (
+        get_user_model()
+        ._default_manager.filter(Q(username__iexact=username) | Q(email__iexact=email))
+        .values_list("username", "email")[:2]
+    )
+    for taken_username, taken_email in rows:
+        if taken_username.upper() == username.upper():
+            taken.add("username")
+        if taken_email.upper() == email.upper():
+            taken.add("email")
+    return taken
+
+
+def build_user(username: str, email: str) -> "User":
+    """
+    Return an unsaved user, the password is set by register_user.
+    """
+    return get_user_model()(username=username, email=email)
+
+
+def register_user(
+    user: "User", password: str, client: Optional["Client"] = None
+) -> Optional[AuthToken]:
+    """
+    Hash the password, then insert the user and, for API clients, their token
+    in one transaction.
+
+    The password is hashed only now, so requests failing validation or naming
+    an unknown client don't pay for it.
+    Raise IntegrityError if the username or email address was taken meanwhile.
+    """
+    user.password = make_password(password)
+    with transaction.atomic():
+        user.save(force_insert=True)
+        return AuthToken.objects.create(user, client) if client else None
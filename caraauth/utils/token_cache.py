@@ -0,0 +1,137 @@
+from collections import OrderedDict
+from hashlib import sha256
+from threading import Lock
+from time import monotonic
+from typing import Optional, Union
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.db import models
+from django.utils import timezone
+from durin.models import AuthToken, Client
+
+# the secrets are never cached, the token is known to whoever looks it up
+EXCLUDED_FIELDS = {"token", "password"}
+
+# token key -> (expires at, field values of the token, its user and client)
+_local_cache: OrderedDict[str, tuple[float, dict]] = OrderedDict()
+_local_cache_lock = Lock()
+
+
+def get_token_cache():
+    """
+    Return the shared token cache if one is configured.
+    """
+    if settings.TOKEN_CACHE is None:
+        return None
+    return caches[settings.TOKEN_CACHE]
+
+
+def get_token_cache_key(token: Union[str, bytes]) -> str:
+    if isinstance(token, str):
+        token = token.encode()
+    return f"caraauth:token:{sha256(token).hexdigest()}"
+
+
+def get_cached_token(token: Union[str, bytes]) -> Optional[AuthToken]:
+    """
+    Return a fresh copy of the cached auth token, None on a cache miss.
+    """
+    key = get_token_cache_key(token)
+    with _local_cache_lock:
+        if (entry := _local_cache.get(key)) is not None:
+            expires_at, data = entry
+            if expires_at > monotonic():
+                _local_cache.move_to_end(key)
+                return load_token(token, data)
+            del _local_cache[key]
+    if (cache := get_token_cache()) is None:
+        return None
+    if (data := cache.get(key)) is None:
+        return None
+    _cache_locally(key, data, settings.TOKEN_CACHE_LOCAL_TIMEOUT)
+    return load_token(token, data)
+
+
+def cache_token(auth_token: AuthToken):
+    """
+    Cache a validated auth token, at most until it expires.
+    """
+    timeout = min(
+        settings.TOKEN_CACHE_TIMEOUT,
+        (auth_token.expiry - timezone.now()).total_seconds(),
+    )
+    if timeout <= 0:
+        return
+    key = get_token_cache_key(auth_token.token)
+    data = dump_token(auth_token)
+    _cache_locally(key, data, min(timeout, settings.TOKEN_CACHE_LOCAL_TIMEOUT))
+    if (cache := get_token_cache()) is not None:
+        cache.set(key, data, timeout)
+
+
+def dump_token(auth_token: AuthToken) -> dict:
+    """
+    Return what authentication needs of the token, its user and its client.
+    """
+    return {
+        "token": _dump(auth_token),
+        "user": _dump(auth_token.user),
+        "client": _dump(auth_token.client),
+    }
+
+
+def load_token(token: Union[str, bytes], data: dict) -> AuthToken:
+    """
+    Rebuild the auth token with its user and client from dump_token's data.
+
+    The user's password is deferred and only loaded if someone reads it.
+    """
+    if isinstance(token, bytes):
+        token = token.decode()
+    auth_token = _load(AuthToken, {**data["token"], "token": token})
+    auth_token.user = _load(get_user_model(), data["user"])
+    auth_token.client = _load(Client, data["client"])
+    return auth_token
+
+
+def invalidate_cached_tokens(*tokens: str):
+    keys = [get_token_cache_key(token) for token in tokens]
+    with _local_cache_lock:
+        for key in keys:
+            _local_cache.pop(key, None)
+    if (cache := get_token_cache()) is not None:
+        cache.delete_many(keys)
+
+
+def clear_local_token_cache():
+    with _local_cache_lock:
+        _local_cache.clear()
+
+
+def _dump(instance: models.Model) -> dict:
+    return {
+        field.attname: getattr(instance, field.attname)
+        for field in instance._meta.concrete_fields
+        if field.attname not in EXCLUDED_FIELDS
+    }
+
+
+def _load(model: type[models.Model], values: dict) -> models.Model:
+    # from_db marks the instance as saved, missing fields are deferred
+    field_names = [
+        field.attname
+        for field in model._meta.concrete_fields
+        if field.attname in values
+    ]
+    return model.from_db("default", field_names, [values[name] for name in field_names])
+
+
+def _cache_locally(key: str, data: dict, timeout: float):
+    # plain values only, every request builds its own instances from them
+    with _local_cache_lock:
+        _local_cache[key] = (monotonic() + timeout, data)
+        _local_cache.move_to_end(key)
+        while len(_local_cache) > settings.TOKEN_CACHE_LOCAL_SIZE:
+            _local_cache.popitem(last=False)
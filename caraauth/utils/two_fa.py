@@ -1,13 +1,131 @@
+from functools import reduce
+from operator import or_
 from typing import TYPE_CHECKING, Optional, Union
 
-from django.db.models import QuerySet
-from django_otp import devices_for_user
+from django.conf import settings
+from django.core.cache import caches
+from django.db.models import Exists, QuerySet
+from django_otp import device_classes
 from django_otp.plugins.otp_static.models import StaticDevice, StaticToken
 from django_otp.plugins.otp_totp.models import TOTPDevice
 
 if TYPE_CHECKING:
     from caraauth.models import User
 
+STATIC_TOKEN_COUNT = 6
+
+
+class UserDevices:
+    """
+    Snapshot of a user's TOTP and static devices.
+
+    Each device type is loaded with one query and the static tokens are
+    prefetched, so all lookups of a request are answered without further
+    queries.
+    """
+
+    def __init__(self, user: "User"):
+        self.totp_devices = list(TOTPDevice.objects.devices_for_user(user))
+        self.static_devices = list(
+            StaticDevice.objects.devices_for_user(user).prefetch_related("token_set")
+        )
+
+    def totp_device(self, confirmed: Optional[bool] = None) -> Optional["TOTPDevice"]:
+        return self._first(self.totp_devices, confirmed)
+
+    def static_device(
+        self, confirmed: Optional[bool] = True
+    ) -> Optional["StaticDevice"]:
+        return self._first(self.static_devices, confirmed)
+
+    def has_confirmed_device(self) -> bool:
+        return any(
+            device.confirmed for device in self.totp_devices + self.static_devices
+        )
+
+    @staticmethod
+    def _first(devices: list, confirmed: Optional[bool]):
+        for device in devices:
+            if confirmed is None or device.confirmed == bool(confirmed):
+                return device
+        return None
+
+
+def get_user_devices(user: "User") -> UserDevices:
+    """
+    Return the device snapshot of the user, load it on first access.
+    """
+    if (devices := user.__dict__.get("_devices")) is None:
+        devices = user._devices = UserDevices(user)
+    return devices
+
+
+def get_2fa_state_cache():
+    """
+    Return the shared cache for the 2FA state if one is configured.
+    """
+    if settings.TWO_FA_STATE_CACHE is None:
+        return None
+    return caches[settings.TWO_FA_STATE_CACHE]
+
+
+def get_2fa_state_cache_key(user_id: int) -> str:
+    return f"caraauth:2fa-enabled:{user_id}"
+
+
+def has_2fa_enabled(user: "User") -> bool:
+    """
+    Return whether the user has a confirmed device.
+
+    The state is remembered on the user instance, which lives as long as the
+    request, and in the shared cache if one is configured.
+    """
+    if (enabled := user.__dict__.get("_has_2fa_enabled")) is not None:
+        return enabled
+    if (devices := user.__dict__.get("_devices")) is not None:
+        return devices.has_confirmed_device()
+    cache = get_2fa_state_cache()
+    if cache is not None:
+        enabled = cache.get(get_2fa_state_cache_key(user.pk))
+    if enabled is None:
+        enabled = user_has_confirmed_device(user)
+        if cache is not None:
+            cache.set(
+                get_2fa_state_cache_key(user.pk),
+                enabled,
+                settings.TWO_FA_STATE_CACHE_TIMEOUT,
+            )
+    user._has_2fa_enabled = enabled
+    return enabled
+
+
+def user_has_confirmed_device(user: "User") -> bool:
+    """
+    Return whether the user has a confirmed device of any kind in one query.
+    """
+    has_device = reduce(
+        or_,
+        (
+            Exists(model.objects.devices_for_user(user, confirmed=True))
+            for model in device_classes()
+        ),
+    )
+    return type(user).objects.filter(pk=user.pk).filter(has_device).exists()
+
+
+def invalidate_2fa_state(user: "User"):
+    """
+    Forget the cached 2FA state after the user's devices changed.
+    """
+    user.__dict__.pop("_has_2fa_enabled", None)
+    user.__dict__.pop("_devices", None)
+    invalidate_2fa_state_cache(user.pk)
+
+
+def invalidate_2fa_state_cache(*user_ids: int):
+    if (cache := get_2fa_state_cache()) is not None:
+        cache.delete_many([get_2fa_state_cache_key(user_id) for user_id in user_ids])
+
 
 def default_device(user: "User") -> Union[Union["TOTPDevice", "StaticToken"], bool]:
     """
@@ -27,11 +145,7 @@ def get_user_totp_device(
     """
     Return user's TOTP device.
     """
-    devices = devices_for_user(user, confirmed=confirmed)
-    for device in devices:
-        if isinstance(device, TOTPDevice):
-            return device
-    return None
+    return get_user_devices(user).totp_device(confirmed)
 
 
 def confirm_totp_device_token(user: "User", token: str) -> bool:
@@ -62,6 +176,7 @@ def verify_totp_device(user: "User", token: str) -> bool:
     if device.verify_token(token) and not device.confirmed:
         device.confirmed = True
         device.save()
+        invalidate_2fa_state(user)
         return True
     return False
 
@@ -77,6 +192,7 @@ def confirm_static_device_token(user: "User", token: str) -> bool:
     if not verify_is_allowed:
         return False
     if device.verify_token(token):
+        forget_prefetched_tokens(device)
         return True
     return False
 
@@ -87,32 +203,41 @@ def get_user_static_device(
     """
     Return the first static device for a user.
     """
-    devices = devices_for_user(user, confirmed=confirmed)
-    for device in devices:
-        if isinstance(device, StaticDevice):
-            return device
-    return None
+    return get_user_devices(user).static_device(confirmed)
 
 
-def create_static_device(user: "User") -> "QuerySet":
+def create_static_device(user: "User") -> list["StaticToken"]:
     """
     Create a static device and return 6 tokens.
     """
     device = get_user_static_device(user, True)
     if not device:
         device = StaticDevice.objects.create(user=user, name="Backup")
+        invalidate_2fa_state(user)
     return generate_static_device_tokens(device)
 
 
-def generate_static_device_tokens(device: "StaticDevice") -> "QuerySet":
+def generate_static_device_tokens(device: "StaticDevice") -> list["StaticToken"]:
     """
     Generate new static device tokens for the given user.
     """
-    device.token_set.all().delete()
-    for _ in range(6):
-        token = StaticToken.random_token()
-        device.token_set.create(token=token)
-    return device.token_set.all()
+    return rotate_static_device_tokens([device])
+
+
+def rotate_static_device_tokens(devices: list["StaticDevice"]) -> list["StaticToken"]:
+    """
+    Replace the tokens of the given static devices with one delete and one insert.
+    """
+    StaticToken.objects.filter(device__in=devices).delete()
+    tokens = StaticToken.objects.bulk_create(
+        StaticToken(device=device, token=StaticToken.random_token())
+        for device in devices
+        for _ in range(STATIC_TOKEN_COUNT)
+    )
+    for device in devices:
+        forget_prefetched_tokens(device)
+    invalidate_2fa_state_cache(*(device.user_id for device in devices))
+    return tokens
 
 
 def get_static_device_tokens(user: "User") -> Union["QuerySet", list]:
@@ -125,6 +250,13 @@ def get_static_device_tokens(user: "User") -> Union["QuerySet", list]:
     return []
 
 
+def forget_prefetched_tokens(device: "StaticDevice"):
+    """
+    Drop the prefetched tokens of a device after its tokens changed.
+    """
+    getattr(device, "_prefetched_objects_cache", {}).pop("token_set", None)
+
+
 def confirm_any_device_token(user: "User", token: str) -> bool:
     """
     Return weather the token is valid for a TOTP or a static device.
@@ -134,10 +266,25 @@ def confirm_any_device_token(user: "User", token: str) -> bool:
     return confirm_static_device_token(user, token)
 
 
+def confirm_login_token(user: "User", token: str) -> bool:
+    """
+    Return whether the user has no confirmed device or the token is valid for one.
+
+    With a token, the device snapshot answers both questions, so the 2FA state
+    is not queried separately.
+    """
+    if not token:
+        return not has_2fa_enabled(user)
+    if not get_user_devices(user).has_confirmed_device():
+        return True
+    return confirm_any_device_token(user, token)
+
+
 def delete_devices_for_user(user: "User") -> bool:
     """
     Delete user's devices.
     """
     TOTPDevice.objects.filter(user=user).delete()
     StaticDevice.objects.filter(user=user).delete()
+    invalidate_2fa_state(user)
     return True
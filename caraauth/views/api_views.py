@@ -1,5 +1,6 @@
 from typing import TYPE_CHECKING
 
+from django.db import IntegrityError
 from durin.models import AuthToken
 from durin.views import RefreshView
 from rest_framework.permissions import IsAuthenticated
@@ -7,10 +8,14 @@ from rest_framework.permissions import IsAuthenticated
 from caraauth.mixins import AuthMixin
 from caraauth.permissions import IsAnonymous
 from caraauth.serializers import LoginSerializer, RegisterSerializer
+from caraauth.throttling import LoginRateThrottle
+from caraauth.utils import registration
 
 if TYPE_CHECKING:
     from durin.models import Client
 
+    from caraauth.models import User
+
 
 class RegisterView(AuthMixin):
     """
@@ -20,8 +25,23 @@ class RegisterView(AuthMixin):
     permission_classes = (IsAnonymous,)
     serializer_class = RegisterSerializer
 
+    def validate_and_return_user(self, request) -> "User":
+        serializer = self.serializer_class(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        # hashed by get_token_obj once the API client is known
+        self.password = serializer.validated_data["password"]
+        return registration.build_user(
+            username=serializer.validated_data["username"],
+            email=serializer.validated_data["email"],
+        )
+
     def get_token_obj(self, request, client: "Client") -> "AuthToken":
-        return AuthToken.objects.create(request.user, client)
+        try:
+            return registration.register_user(request.user, self.password, client)
+        except IntegrityError:
+            # registered by a concurrent request since the validation
+            self.validate_and_return_user(request)
+            raise
 
 
 class LoginView(AuthMixin):
@@ -30,6 +50,7 @@ class LoginView(AuthMixin):
     """
 
     permission_classes = (IsAnonymous,)
+    throttle_classes = (LoginRateThrottle,)
     serializer_class = LoginSerializer
 
 
@@ -9,9 +9,10 @@ from django.views.generic import TemplateView
 
 from caraauth.forms import LoginForm, RegisterForm
 from caraauth.permissions import AnonymousRequiredMixin
+from caraauth.throttling import LoginRateLimitMixin
 
 
-class LoginView(AnonymousRequiredMixin, TemplateView):
+class LoginView(AnonymousRequiredMixin, LoginRateLimitMixin, TemplateView):
     template_name = "caraauth/login.html"
 
     def get(self, request, *args, **kwargs):
@@ -0,0 +1,15 @@
+"""
+Celery app for caracara project.
+
+Start a worker with: celery -A caracara worker
+"""
+
+import os
+
+from celery import Celery
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "caracara.settings")
+
+app = Celery("caracara")
+app.config_from_object("django.conf:settings", namespace="CELERY")
+app.autodiscover_tasks()
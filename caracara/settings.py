@@ -25,6 +25,12 @@ env = environ.Env(
     OTP_TOTP_ISSUER=(str, None),
     CRYPTOGRAPHY_SALT=(str, None),
     CRYPTOGRAPHY_KEY=(str, None),
+    CELERY_BROKER_URL=(str, "redis://localhost:6379/0"),
+    CELERY_TASK_ALWAYS_EAGER=(bool, False),
+    DOCKER_API_PORT=(int, 2375),
+    GAMESERVER_DOCKER_IMAGE=(str, "itzg/minecraft-server"),
+    REDIS_CACHE_URL=(str, None),
+    NUM_PROXIES=(int, 0),
 )
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -114,6 +120,20 @@ DATABASES = {
     }
 }
 
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    }
+}
+# cache shared between all processes, only used if a Redis server is configured
+SHARED_CACHE = None
+if env("REDIS_CACHE_URL"):
+    CACHES["shared"] = {
+        "BACKEND": "django.core.cache.backends.redis.RedisCache",
+        "LOCATION": env("REDIS_CACHE_URL"),
+    }
+    SHARED_CACHE = "shared"
+
 
 # Password validation
 # https://docs.djangoproject.com/en/4.1/ref/settings/#auth-password-validators
@@ -163,18 +183,62 @@ USER_SERIALIZER = "caraauth.serializers.UserSerializer"
 
 AUTHENTICATION_BACKENDS = ["caraauth.backends.UsernameOrEmailModelBackend"]
 
+PASSWORD_HASHERS = [
+    "caraauth.hashers.PBKDF2PasswordHasher",
+    "django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher",
+    "django.contrib.auth.hashers.Argon2PasswordHasher",
+    "django.contrib.auth.hashers.BCryptSHA256PasswordHasher",
+    "django.contrib.auth.hashers.ScryptPasswordHasher",
+]
+# raising it updates the users' hashes after their next login
+PASSWORD_HASHER_ITERATIONS = 600000
+# update outdated hashes within the login request instead of in the background
+PASSWORD_REHASH_EAGER = False
+
 LOGIN_URL = "web:auth:login"
 LOGIN_REDIRECT_URL = "web:user_area:dashboard"
 
 # CaraCara Settings
 
+# one of server.placement.PLACEMENT_STRATEGIES
+GAMESERVER_PLACEMENT_STRATEGY = "first_fit"
+# seconds until the in-process port and ip allocators are reloaded from the database
+ALLOCATOR_MAX_AGE = 60
+
+# Docker API port of the nodes
+DOCKER_API_PORT = env("DOCKER_API_PORT")
+# pinned, so new clients don't have to ask the node for its version
+DOCKER_API_VERSION = "1.41"
+DOCKER_API_TIMEOUT = 60
+# storage limits need overlay2 on xfs with pquota on the nodes
+DOCKER_LIMIT_DISK_SPACE = False
+GAMESERVER_DOCKER_IMAGE = env("GAMESERVER_DOCKER_IMAGE")
+# run inside a new game server container to set up its SQL and FTP access
+GAMESERVER_CONFIGURE_COMMAND = ["caracara-configure"]
+# expired game servers are disabled first and deleted after this grace period
+GAMESERVER_DELETE_AFTER = timedelta(days=7)
+# Redis server relaying status changes, None to only notify streams of the same process
+GAMESERVER_STATUS_REDIS_URL = env("REDIS_CACHE_URL")
+# seconds between keep-alive comments of idle status streams
+GAMESERVER_STATUS_STREAM_HEARTBEAT = 15
+# seconds until a status stream ends and the client reconnects
+GAMESERVER_STATUS_STREAM_MAX_AGE = 600
+# changes a stream may fall behind before it is ended
+GAMESERVER_STATUS_STREAM_QUEUE_SIZE = 100
+
+# cache alias for the users' 2FA state, None to only remember it per request
+TWO_FA_STATE_CACHE = SHARED_CACHE
+TWO_FA_STATE_CACHE_TIMEOUT = 300
+
 # DRF Settings
 
 REST_FRAMEWORK = {
     "DEFAULT_PAGINATION_CLASS": "rest_framework.pagination.PageNumberPagination",
     "PAGE_SIZE": 50,
+    # reverse proxies in front of the app, whose X-Forwarded-For is trusted
+    "NUM_PROXIES": env("NUM_PROXIES"),
     "DEFAULT_AUTHENTICATION_CLASSES": [
-        "durin.auth.TokenAuthentication",
+        "caraauth.authentication.CachedTokenAuthentication",
         "rest_framework.authentication.SessionAuthentication",
     ],
 }
@@ -185,7 +249,26 @@ REST_DURIN = {
     "DEFAULT_TOKEN_TTL": timedelta(days=env("TOKEN_LIFETIME")),
     "AUTH_HEADER_PREFIX": "Bearer",
     "USER_SERIALIZER": USER_SERIALIZER,
+    "AUTHTOKEN_SELECT_RELATED_LIST": ["user", "client"],
+}
+# cache alias for validated tokens, None to only cache them per process
+TOKEN_CACHE = SHARED_CACHE
+TOKEN_CACHE_TIMEOUT = 60
+# tokens deleted by another process are accepted for at most this many seconds
+TOKEN_CACHE_LOCAL_TIMEOUT = 5
+TOKEN_CACHE_LOCAL_SIZE = 10000
+# (limit, period in seconds) of attempts per scope and identity
+RATE_LIMITS = {
+    "login": {"ip": (30, 60), "username": (10, 300)},
+    "otp": {"ip": (30, 60), "user": (5, 300)},
 }
+# cache alias for the attempt counts, None to count them per process
+RATE_LIMIT_CACHE = SHARED_CACHE
+RATE_LIMIT_LOCAL_SIZE = 100000
+# cache alias for the hit and miss counts of conditional GETs, None to count per process
+CONDITIONAL_GET_STATS_CACHE = SHARED_CACHE
+# API clients are kept in memory, reload them after this many seconds
+CLIENT_REGISTRY_MAX_AGE = 300
 
 # 2FA Settings
 
@@ -195,3 +278,17 @@ OTP_TOTP_ISSUER = env("OTP_TOTP_ISSUER")
 
 CRYPTOGRAPHY_SALT = env("CRYPTOGRAPHY_SALT")
 CRYPTOGRAPHY_KEY = env("CRYPTOGRAPHY_KEY")
+
+# Celery Settings
+
+CELERY_BROKER_URL = env("CELERY_BROKER_URL")
+CELERY_TASK_ALWAYS_EAGER = env("CELERY_TASK_ALWAYS_EAGER")
+CELERY_TASK_EAGER_PROPAGATES = True
+CELERY_TASK_ACKS_LATE = True
+CELERY_WORKER_PREFETCH_MULTIPLIER = 1
+CELERY_BEAT_SCHEDULE = {
+    "sweep-expired-gameservers": {
+        "task": "server.tasks.sweep_expired_gameservers",
+        "schedule": timedelta(minutes=5),
+    },
+}
@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+from django.urls import get_resolver
+
+from carautils.utils.conditional import get_conditional_get_stats
+
+
+class Command(BaseCommand):
+    help = "Show hits and misses of the conditional GET views."
+
+    def handle(self, *args, **options):
+        # importing the views registers their names
+        get_resolver().url_patterns  # noqa: B018
+        for name, stats in get_conditional_get_stats().items():
+            self.stdout.write(
+                f"{name}: {stats['hits']} hits, {stats['misses']} misses, "
+                f"{stats['hit_ratio']:.1%} hit ratio"
+            )
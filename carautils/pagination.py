@@ -0,0 +1,95 @@
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import Cursor, CursorPagination, _reverse_ordering
+
+
+class CreatedAtCursorPagination(CursorPagination):
+    """
+    Paginate on (created_at, id), the default ordering of BaseModel.
+
+    Unlike DRF's CursorPagination the cursor holds both fields, so a page is a
+    range scan of an index on (created_at, id) without any offset, however
+    deep the page is.
+    """
+
+    ordering = ("created_at", "id")
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+
+        self.base_url = request.build_absolute_uri()
+        self.cursor = self.decode_cursor(request)
+        if self.cursor is None:
+            reverse, current_position = False, None
+        else:
+            _, reverse, current_position = self.cursor
+
+        if reverse:
+            queryset = queryset.order_by(*_reverse_ordering(self.ordering))
+        else:
+            queryset = queryset.order_by(*self.ordering)
+        if current_position is not None:
+            queryset = queryset.filter(self._after(current_position, reverse))
+
+        # one extra item tells whether there is a following page
+        results = list(queryset[: self.page_size + 1])
+        self.page = results[: self.page_size]
+        has_following = len(results) > len(self.page)
+        if reverse:
+            self.page.reverse()
+        first, last = (
+            (self.position(self.page[0]), self.position(self.page[-1]))
+            if self.page
+            else (current_position, current_position)
+        )
+
+        if reverse:
+            self.has_next = current_position is not None
+            self.has_previous = has_following
+        else:
+            self.has_next = has_following
+            self.has_previous = current_position is not None
+        self.next_position = last
+        self.previous_position = first
+
+        if (self.has_previous or self.has_next) and self.template is not None:
+            self.display_page_controls = True
+        return self.page
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        return self.encode_cursor(Cursor(0, False, self.next_position))
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        return self.encode_cursor(Cursor(0, True, self.previous_position))
+
+    @staticmethod
+    def position(instance) -> str:
+        return f"{instance.created_at.isoformat()}|{instance.pk}"
+
+    def _after(self, position: str, reverse: bool) -> Q:
+        """
+        Return the filter for the rows following the position in query order.
+        """
+        created_at, _, pk = position.partition("|")
+        try:
+            created_at, pk = parse_datetime(created_at), int(pk)
+        except ValueError:
+            created_at = None
+        if created_at is None:
+            raise NotFound(self.invalid_cursor_message)
+        # the leading range condition bounds the index scan
+        if reverse:
+            return Q(created_at__lte=created_at) & (
+                Q(created_at__lt=created_at) | Q(id__lt=pk)
+            )
+        return Q(created_at__gte=created_at) & (
+            Q(created_at__gt=created_at) | Q(id__gt=pk)
+        )
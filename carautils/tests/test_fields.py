@@ -0,0 +1,61 @@
+from unittest.mock import patch
+
+from pytest import mark
+
+from carautils.utils.db.fields import Ciphertext, LazyEncryptedMixin
+from server.conftest import UserGameserverFactory
+from server.models import UserGameServer
+
+
+@mark.django_db
+def test_lazy_encrypted_field__decrypt_on_access():
+    """
+    Ensure that encrypted values are decrypted once on first access.
+    """
+    gameserver = UserGameserverFactory.create(sql_password="sql-secret")
+
+    with patch.object(
+        LazyEncryptedMixin,
+        "decrypt",
+        autospec=True,
+        side_effect=lambda field, value: field._load(value),
+    ) as decrypt:
+        loaded = UserGameServer.objects.get(pk=gameserver.pk)
+        assert decrypt.call_count == 0
+
+        assert loaded.sql_password == "sql-secret"
+        assert loaded.sql_password == "sql-secret"
+        assert decrypt.call_count == 1
+
+
+@mark.django_db
+def test_lazy_encrypted_field__save_unread():
+    """
+    Ensure that unread values are saved as they are and changed values are encrypted.
+    """
+    gameserver = UserGameserverFactory.create(
+        sql_password="sql-secret", ftp_password="ftp-secret"
+    )
+    loaded = UserGameServer.objects.get(pk=gameserver.pk)
+    stored = loaded.__dict__["ftp_password"]
+    assert isinstance(stored, Ciphertext)
+
+    loaded.sql_password = "new-secret"
+    loaded.save()
+
+    reloaded = UserGameServer.objects.get(pk=gameserver.pk)
+    assert reloaded.__dict__["ftp_password"] == stored
+    assert reloaded.sql_password == "new-secret"
+    assert reloaded.ftp_password == "ftp-secret"
+
+
+@mark.django_db
+def test_lazy_encrypted_field__deferred():
+    """
+    Ensure that deferred encrypted values are loaded and decrypted on access.
+    """
+    gameserver = UserGameserverFactory.create(sql_password="sql-secret")
+
+    loaded = UserGameServer.objects.defer("sql_password").get(pk=gameserver.pk)
+
+    assert loaded.sql_password == "sql-secret"
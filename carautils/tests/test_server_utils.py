@@ -43,3 +43,45 @@ def test_get_available_own_ip__all_ips_taken():
     assert IPNet.objects.count() == 1
     assert UserGameServer.objects.count() == 6
     assert ip is None
+
+
+@mark.django_db
+def test_get_available_own_ip__spans_all_ip_nets():
+    """
+    Ensure that the next ip net is used when the first one is exhausted.
+    """
+    IPNetFactory.create(ip_net="192.168.1.0/29")
+    IPNetFactory.create(ip_net="10.0.0.248/29")
+    for i in range(1, 7):
+        UserGameserverFactory.create(own_ip=f"10.0.0.{248 + i}")
+
+    ip = get_available_own_ip()
+
+    assert ip == "192.168.1.1"
+
+
+@mark.django_db
+def test_get_available_own_ip__inactive_ip_net():
+    """
+    Ensure that ip addresses of inactive IP nets are not returned.
+    """
+    IPNetFactory.create(ip_net="192.168.1.0/24", active=False)
+
+    ip = get_available_own_ip()
+
+    assert ip is None
+
+
+@mark.django_db
+def test_get_available_own_ip__synced_on_create_and_delete():
+    """
+    Ensure that the loaded ip pool follows created and deleted servers.
+    """
+    IPNetFactory.create(ip_net="192.168.1.0/24")
+    assert get_available_own_ip() == "192.168.1.1"
+
+    gameserver = UserGameserverFactory.create(own_ip="192.168.1.1")
+    assert get_available_own_ip() == "192.168.1.2"
+
+    gameserver.delete()
+    assert get_available_own_ip() == "192.168.1.1"
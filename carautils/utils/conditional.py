@@ -0,0 +1,124 @@
+from collections import Counter
+from datetime import datetime
+from functools import wraps
+from hashlib import sha256
+from threading import Lock
+from typing import Callable
+
+from django.conf import settings
+from django.core.cache import caches
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+
+# (name, "hits" or "misses") -> count, used without a shared cache
+_stats: Counter = Counter()
+_stats_lock = Lock()
+_names: set[str] = set()
+
+
+def conditional_get(name: str, get_version: Callable):
+    """
+    Answer GET requests of a view method with 304 if the client's copy is current.
+
+    get_version(view, request, *args, **kwargs) returns the modification time of
+    the resource and a string of anything else the response depends on, or
+    None to handle the request without conditions. The ETag is derived from
+    both, the user and the requested URL, so it is computed without
+    serializing the response. Hits and misses are counted by name.
+    """
+    _names.add(name)
+
+    def decorator(method):
+        @wraps(method)
+        def wrapper(view, request, *args, **kwargs):
+            if (version := get_version(view, request, *args, **kwargs)) is None:
+                return method(view, request, *args, **kwargs)
+            modified_at, extra = version
+            etag = make_etag(request, modified_at, extra)
+            last_modified = int(modified_at.timestamp())
+            response = get_conditional_response(
+                request, etag=etag, last_modified=last_modified
+            )
+            record(name, hit=response is not None)
+            if response is None:
+                response = method(view, request, *args, **kwargs)
+            if response.status_code in (200, 304):
+                response.headers.setdefault("ETag", etag)
+                response.headers.setdefault("Last-Modified", http_date(last_modified))
+            return response
+
+        return wrapper
+
+    return decorator
+
+
+def make_etag(request, modified_at: datetime, extra: str = "") -> str:
+    key = "|".join(
+        [
+            str(request.user.pk),
+            request.get_full_path(),
+            request.META.get("HTTP_ACCEPT", ""),
+            modified_at.isoformat(),
+            extra,
+        ]
+    )
+    return quote_etag(sha256(key.encode()).hexdigest()[:32])
+
+
+def get_stats_cache():
+    """
+    Return the shared cache for the hit and miss counts if one is configured.
+    """
+    if settings.CONDITIONAL_GET_STATS_CACHE is None:
+        return None
+    return caches[settings.CONDITIONAL_GET_STATS_CACHE]
+
+
+def get_stats_cache_key(name: str, result: str) -> str:
+    return f"carautils:conditional-get:{name}:{result}"
+
+
+def record(name: str, hit: bool):
+    result = "hits" if hit else "misses"
+    if (cache := get_stats_cache()) is not None:
+        key = get_stats_cache_key(name, result)
+        if not cache.add(key, 1, timeout=None):
+            cache.incr(key)
+        return
+    with _stats_lock:
+        _stats[name, result] += 1
+
+
+def get_conditional_get_stats() -> dict[str, dict[str, float]]:
+    """
+    Return hits, misses and the hit ratio of every conditional view.
+    """
+    if (cache := get_stats_cache()) is not None:
+        keys = {
+            (name, result): get_stats_cache_key(name, result)
+            for name in _names
+            for result in ("hits", "misses")
+        }
+        counts = cache.get_many(keys.values())
+        stats = {key: counts.get(cache_key, 0) for key, cache_key in keys.items()}
+    else:
+        with _stats_lock:
+            stats = dict(_stats)
+    result = {}
+    for name in sorted(_names):
+        hits, misses = stats.get((name, "hits"), 0), stats.get((name, "misses"), 0)
+        total = hits + misses
+        result[name] = {
+            "hits": hits,
+            "misses": misses,
+            "hit_ratio": hits / total if total else 0.0,
+        }
+    return result
+
+
+def reset_conditional_get_stats():
+    """
+    Forget the hits and misses counted in this process.
+    """
+    with _stats_lock:
+        _stats.clear()
@@ -0,0 +1,62 @@
+from django.db import models
+from django.db.models.query_utils import DeferredAttribute
+from django.utils.encoding import force_bytes
+from django_cryptography.fields import EncryptedMixin
+
+
+class Ciphertext(bytes):
+    """
+    An encrypted value as loaded from the database.
+    """
+
+
+class LazyDecryptedAttribute(DeferredAttribute):
+    """
+    Decrypt the loaded ciphertext on first access and keep the plain value.
+    """
+
+    def __get__(self, instance, cls=None):
+        value = super().__get__(instance, cls)
+        if instance is not None and isinstance(value, Ciphertext):
+            value = instance.__dict__[self.field.attname] = self.field.decrypt(value)
+        return value
+
+    def __set__(self, instance, value):
+        # a data descriptor, so __get__ runs although the value is in __dict__
+        instance.__dict__[self.field.attname] = value
+
+
+class LazyEncryptedMixin(EncryptedMixin):
+    """
+    Like django_cryptography's encrypt(), but only decrypt values which are read.
+
+    Rows are loaded with the ciphertext, which is decrypted on first attribute
+    access. Values which were never read are saved as they are, without being
+    encrypted again. values() and values_list() return the Ciphertext, use
+    decrypt() of the field to read it.
+    """
+
+    descriptor_class = LazyDecryptedAttribute
+
+    def decrypt(self, value: Ciphertext):
+        return self._load(value)
+
+    def from_db_value(self, value, *args, **kwargs):
+        if value is not None:
+            return Ciphertext(force_bytes(value))
+        return value
+
+    def pre_save(self, model_instance, add):
+        # don't decrypt the value just to encrypt it again
+        if self.attname in model_instance.__dict__:
+            return model_instance.__dict__[self.attname]
+        return super().pre_save(model_instance, add)
+
+    def get_db_prep_value(self, value, connection, prepared=False):
+        if isinstance(value, Ciphertext):
+            return connection.Database.Binary(value)
+        return super().get_db_prep_value(value, connection, prepared)
+
+
+class LazyEncryptedCharField(LazyEncryptedMixin, models.CharField):
+    pass
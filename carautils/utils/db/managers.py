@@ -32,8 +32,10 @@ class SoftDeleteManager(BaseManager):
     custom manager class ...does nothing special for now
     """
 
+    _queryset_class = SoftDeleteQuerySet
+
     def get_queryset(self):
         """
         Returns a new QuerySet object
         """
-        return SoftDeleteQuerySet(self.model, using=self._db)
+        return self._queryset_class(self.model, using=self._db)
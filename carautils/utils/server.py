@@ -1,47 +1,29 @@
 from typing import Optional
 
-from server.models import IPNet, Node, UserGameServer
+from server.ip_pool import get_ip_pool
+from server.models import Node
+from server.placement import load_node_snapshot, rank_nodes
+from server.ports import get_port_allocator
 
 
 def get_available_own_ip() -> Optional[str]:
     """
-    Return the next available own ip address.
+    Return the next available own ip address of all active IP nets.
     """
-    taken_ips = (
-        UserGameServer.objects.own_ip()
-        .values_list("own_ip", flat=True)
-        .order_by("own_ip")
-    )
+    return get_ip_pool().next_free()
 
-    for ip_net in IPNet.objects.active():
-        prefix, suffix = ip_net.split_cidr_notation()
-        last_byte = prefix.split(".")[3]
-        first_available_number = int(last_byte) + 1
-        last_available_number = 2 ** (32 - suffix) - 1
-        ips = (
-            f"{prefix.rsplit(last_byte, 1)[0]}{i}"
-            for i in range(first_available_number, last_available_number)
-        )
-        return next(filter(lambda ip: ip not in taken_ips, ips), None)
 
-    return None
-
-
-def get_available_port(node: "Node", start_at: int) -> int:
+def get_available_port(node: "Node", start_at: int) -> Optional[int]:
     """
-    Get an available port for the given node.
+    Get the first available port at or above start_at for the given node.
     """
-    taken_ports = (
-        UserGameServer.objects.hosted_on_node(node)
-        .values_list("port", flat=True)
-        .order_by("port")
-    )
-    ports = (i for i in range(start_at + 1, 65535))
-    return next(filter(lambda port: port not in taken_ports, ports), None)
+    return get_port_allocator(node).next_free(start_at)
 
 
-def get_node_for_hosting(ram: int, disk_space: int) -> "Node":
+def get_node_for_hosting(ram: int, disk_space: int, cores: int = 0) -> Optional["Node"]:
     """
-    Get a node with enough available capacity.
+    Get the node with enough available capacity preferred by the placement strategy.
     """
-    return Node.objects.enough_available_space(ram, disk_space).first()
+    if ranked_nodes := rank_nodes(load_node_snapshot(), ram, disk_space, cores):
+        return Node.objects.get(pk=ranked_nodes[0].id)
+    return None
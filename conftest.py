@@ -7,6 +7,54 @@ from rest_framework.test import APIClient
 
 from caraauth.models import User
 from caraauth.tests.factories import UserFactory
+from caraauth.utils.clients import reset_client_registry
+from caraauth.utils.rate_limit import reset_rate_limits
+from caraauth.utils.token_cache import clear_local_token_cache
+from caracara import celery_app
+from carautils.utils.conditional import reset_conditional_get_stats
+from server.ip_pool import reset_ip_pool
+from server.ports import reset_port_allocators
+from server.status_events import reset_status_hubs
+
+
+@fixture(autouse=True, scope="session")
+def celery_eager():
+    """
+    Run celery tasks in the test process.
+    """
+    celery_app.conf.update(CELERY_TASK_ALWAYS_EAGER=True)
+
+
+@fixture(autouse=True)
+def clear_allocators():
+    """
+    Drop in-process allocation state, the database is rolled back after each test.
+    """
+    yield
+    reset_port_allocators()
+    reset_ip_pool()
+
+
+@fixture(autouse=True)
+def clear_status_hubs():
+    """
+    Drop the listeners of status streams, their event loops are gone after each test.
+    """
+    yield
+    reset_status_hubs()
+
+
+@fixture(autouse=True)
+def clear_auth_caches():
+    """
+    Drop in-process client and token caches, they refer to rolled back rows,
+    and the counted attempts and conditional GETs.
+    """
+    yield
+    reset_client_registry()
+    clear_local_token_cache()
+    reset_rate_limits()
+    reset_conditional_get_stats()
 
 
 @fixture
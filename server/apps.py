@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class ServerConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "server"
+
+    def ready(self):
+        from server import signals  # noqa: F401
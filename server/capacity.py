@@ -0,0 +1,77 @@
+from collections import defaultdict
+from typing import TYPE_CHECKING, Iterable, NamedTuple, Optional
+
+from django.db.models import F
+
+from carautils.utils.constants import POSIX_ZERO
+from server.models import GAMESERVER_RELEASED_STATES, Node
+
+if TYPE_CHECKING:
+    from server.models import UserGameServer
+
+
+class ResourceUsage(NamedTuple):
+    node_id: int
+    ram: int
+    disk_space: int
+    cores: int
+
+
+def get_resource_usage(gameserver: "UserGameServer") -> Optional[ResourceUsage]:
+    """
+    Return the node resources used by a game server, None if it uses none.
+    """
+    if (
+        gameserver.deleted_at != POSIX_ZERO
+        or gameserver.status in GAMESERVER_RELEASED_STATES
+    ):
+        return None
+    return ResourceUsage(
+        gameserver.node_id, gameserver.ram, gameserver.disk_space, gameserver.cores
+    )
+
+
+def apply_resource_usage_change(
+    previous: Optional[ResourceUsage], current: Optional[ResourceUsage]
+):
+    """
+    Update the used capacity counters of the affected nodes with F expressions.
+    """
+    if previous == current:
+        return
+    if previous and current and previous.node_id == current.node_id:
+        _add_usage(
+            current.node_id,
+            current.ram - previous.ram,
+            current.disk_space - previous.disk_space,
+            current.cores - previous.cores,
+        )
+        return
+    if previous:
+        _add_usage(
+            previous.node_id, -previous.ram, -previous.disk_space, -previous.cores
+        )
+    if current:
+        _add_usage(current.node_id, current.ram, current.disk_space, current.cores)
+
+
+def release_resource_usage(usages: Iterable[ResourceUsage]):
+    """
+    Subtract the usage of servers released with a bulk update, one query per node.
+    """
+    totals = defaultdict(lambda: [0, 0, 0])
+    for usage in usages:
+        total = totals[usage.node_id]
+        total[0] += usage.ram
+        total[1] += usage.disk_space
+        total[2] += usage.cores
+    for node_id, (ram, disk_space, cores) in totals.items():
+        _add_usage(node_id, -ram, -disk_space, -cores)
+
+
+def _add_usage(node_id: int, ram: int, disk_space: int, cores: int):
+    Node.objects.filter(pk=node_id).update(
+        used_ram=F("used_ram") + ram,
+        used_disk_space=F("used_disk_space") + disk_space,
+        used_cores=F("used_cores") + cores,
+    )
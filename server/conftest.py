@@ -2,12 +2,15 @@ from datetime import timedelta
 from random import randint
 
 from django.utils import timezone
+from docker.errors import NotFound
+from docker.models.containers import ExecResult
 from factory import LazyFunction, Sequence, SubFactory, fuzzy
 from factory.django import DjangoModelFactory
 from pytest import fixture
 from pytest_factoryboy import register
 
 from conftest import UserFactory
+from server.drivers import docker_pool
 from server.models import (
     GAMESERVER_ENABLED,
     Game,
@@ -17,6 +20,7 @@ from server.models import (
     Node,
     UserGameServer,
 )
+from server.tests.docker_stub import StubDockerAPI
 
 
 def generate_ip():
@@ -129,3 +133,80 @@ def basic_server_setup():
     NodeFactory.create()
     IPNetFactory.create()
     GameSoftwareVersionFactory.create()
+
+
+class FakeContainer:
+    def __init__(self, id: str, **config):
+        self.id = id
+        self.config = config
+        self.status = "created"
+        self.commands = []
+
+    def start(self):
+        self.status = "running"
+
+    def stop(self):
+        self.status = "exited"
+
+    def remove(self, force=False):
+        self.status = "removed"
+
+    def exec_run(self, cmd, environment=None):
+        self.commands.append((cmd, environment))
+        return ExecResult(0, b"")
+
+
+class FakeContainers:
+    def __init__(self):
+        self.containers = {}
+
+    def create(self, image: str, name: str, **config) -> FakeContainer:
+        container = FakeContainer(f"container-{len(self.containers) + 1}", **config)
+        container.image = image
+        container.name = name
+        self.containers[container.id] = container
+        return container
+
+    def get(self, container_id: str) -> FakeContainer:
+        # looked up by id or name like by Docker
+        for container in self.containers.values():
+            if container_id in (container.id, container.name):
+                return container
+        raise NotFound(f"No such container: {container_id}")
+
+
+class FakeDockerClient:
+    """
+    In-memory stand-in for docker.DockerClient.
+    """
+
+    def __init__(self):
+        self.containers = FakeContainers()
+
+    def ping(self) -> bool:
+        return True
+
+    def close(self):
+        pass
+
+
+@fixture
+def fake_docker(monkeypatch):
+    """
+    Replace the Docker API client of all nodes with an in-memory fake.
+    """
+    client = FakeDockerClient()
+    monkeypatch.setattr("server.drivers.create_docker_client", lambda node: client)
+    yield client
+    docker_pool.clear()
+
+
+@fixture
+def docker_stub(settings):
+    """
+    Serve a stub Docker API, nodes at 127.0.0.1 are managed through it.
+    """
+    with StubDockerAPI() as stub:
+        settings.DOCKER_API_PORT = stub.port
+        yield stub
+        docker_pool.clear()
@@ -0,0 +1,207 @@
+from collections import defaultdict
+from contextlib import contextmanager
+from threading import Lock
+from time import monotonic
+from typing import TYPE_CHECKING, Iterator, Optional
+
+import docker
+from django.conf import settings
+from docker.errors import DockerException, NotFound
+
+if TYPE_CHECKING:
+    from docker import DockerClient
+    from docker.models.containers import Container, ExecResult
+
+    from server.models import Node, UserGameServer
+
+
+def create_docker_client(node: "Node") -> "DockerClient":
+    """
+    Return a new client for the Docker API of the given node.
+    """
+    return docker.DockerClient(
+        base_url=f"tcp://{node.ip}:{settings.DOCKER_API_PORT}",
+        version=settings.DOCKER_API_VERSION,
+        timeout=settings.DOCKER_API_TIMEOUT,
+    )
+
+
+class DockerClientPool:
+    """
+    Reusable Docker API clients per node.
+
+    Clients keep their HTTP connections open, so consecutive operations on a
+    node don't pay for a new connection. Clients idle for longer than
+    idle_timeout are closed, clients idle for longer than health_check_after
+    are pinged before they are handed out again.
+    """
+
+    def __init__(
+        self,
+        max_idle_per_node: int = 8,
+        idle_timeout: float = 300,
+        health_check_after: float = 30,
+    ):
+        self.max_idle_per_node = max_idle_per_node
+        self.idle_timeout = idle_timeout
+        self.health_check_after = health_check_after
+        self._idle: dict[tuple, list[tuple["DockerClient", float]]] = defaultdict(list)
+        self._lock = Lock()
+
+    @contextmanager
+    def client(self, node: "Node") -> Iterator["DockerClient"]:
+        """
+        Lend a client for the given node, return it to the pool afterwards.
+        """
+        key = (node.pk, node.ip)
+        client = self._acquire(key, node)
+        try:
+            yield client
+        except BaseException:
+            # the connection might be broken, don't hand it out again
+            client.close()
+            raise
+        else:
+            self._release(key, client)
+
+    def _acquire(self, key: tuple, node: "Node") -> "DockerClient":
+        self.evict_idle()
+        while True:
+            with self._lock:
+                if not self._idle[key]:
+                    break
+                client, released_at = self._idle[key].pop()
+            if monotonic() - released_at < self.health_check_after or self._ping(
+                client
+            ):
+                return client
+            client.close()
+        return create_docker_client(node)
+
+    def _release(self, key: tuple, client: "DockerClient"):
+        with self._lock:
+            if len(self._idle[key]) < self.max_idle_per_node:
+                self._idle[key].append((client, monotonic()))
+                return
+        client.close()
+
+    def _ping(self, client: "DockerClient") -> bool:
+        try:
+            return client.ping()
+        except DockerException:
+            return False
+        except OSError:
+            return False
+
+    def evict_idle(self):
+        """
+        Close clients which have been idle for too long.
+        """
+        now = monotonic()
+        expired = []
+        with self._lock:
+            for key, clients in self._idle.items():
+                expired += [
+                    client
+                    for client, released_at in clients
+                    if now - released_at >= self.idle_timeout
+                ]
+                self._idle[key] = [
+                    (client, released_at)
+                    for client, released_at in clients
+                    if now - released_at < self.idle_timeout
+                ]
+        for client in expired:
+            client.close()
+
+    def clear(self):
+        """
+        Close all idle clients.
+        """
+        with self._lock:
+            clients = [client for idle in self._idle.values() for client, _ in idle]
+            self._idle.clear()
+        for client in clients:
+            client.close()
+
+
+docker_pool = DockerClientPool()
+
+
+class DockerNodeDriver:
+    """
+    Manage the containers of game servers on a node.
+    """
+
+    def __init__(self, node: "Node", pool: Optional[DockerClientPool] = None):
+        self.node = node
+        self.pool = pool or docker_pool
+
+    @staticmethod
+    def container_name(gameserver: "UserGameServer") -> str:
+        return f"caracara-gameserver-{gameserver.pk}"
+
+    @staticmethod
+    def container_config(gameserver: "UserGameServer") -> dict:
+        """
+        Translate the resources of a game server into container limits.
+        """
+        default_port = gameserver.software_version.software.default_port
+        memory = f"{gameserver.ram}m"
+        config = {
+            "image": settings.GAMESERVER_DOCKER_IMAGE,
+            "name": DockerNodeDriver.container_name(gameserver),
+            "detach": True,
+            "mem_limit": memory,
+            "memswap_limit": memory,
+            "nano_cpus": gameserver.cores * 10**9,
+            "ports": {f"{default_port}/tcp": (gameserver.ip, gameserver.port)},
+            "labels": {"caracara.gameserver": str(gameserver.pk)},
+        }
+        if settings.DOCKER_LIMIT_DISK_SPACE:
+            config["storage_opt"] = {"size": f"{gameserver.disk_space}M"}
+        return config
+
+    def create(self, gameserver: "UserGameServer") -> str:
+        """
+        Create the container of a game server and return its id.
+        """
+        with self.pool.client(self.node) as client:
+            container = client.containers.create(**self.container_config(gameserver))
+        return container.id
+
+    def find(self, gameserver: "UserGameServer") -> Optional[str]:
+        """
+        Return the id of the game server's container, None if there is none yet.
+        """
+        with self.pool.client(self.node) as client:
+            try:
+                return client.containers.get(self.container_name(gameserver)).id
+            except NotFound:
+                return None
+
+    def start(self, container_id: str):
+        with self.pool.client(self.node) as client:
+            client.containers.get(container_id).start()
+
+    def stop(self, container_id: str):
+        with self.pool.client(self.node) as client:
+            client.containers.get(container_id).stop()
+
+    def remove(self, container_id: str):
+        """
+        Remove the container, a container which is already gone is ignored.
+        """
+        with self.pool.client(self.node) as client:
+            try:
+                container = client.containers.get(container_id)
+            except NotFound:
+                return
+            container.remove(force=True)
+
+    def exec_run(
+        self, container_id: str, command: list[str], environment: dict
+    ) -> "ExecResult":
+        with self.pool.client(self.node) as client:
+            container: "Container" = client.containers.get(container_id)
+            return container.exec_run(command, environment=environment)
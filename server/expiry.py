@@ -0,0 +1,169 @@
+from collections import defaultdict
+from datetime import datetime
+from time import perf_counter
+from typing import TYPE_CHECKING, Callable, NamedTuple, Optional
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from server.capacity import ResourceUsage, release_resource_usage
+from server.ip_pool import release_ip
+from server.models import (
+    GAMESERVER_DELETE,
+    GAMESERVER_DISABLED,
+    GAMESERVER_RELEASED_STATES,
+    UserGameServer,
+)
+from server.ports import release_port
+from server.status_events import StatusChange, publish_status_changes
+
+if TYPE_CHECKING:
+    from django.db.models import QuerySet
+
+BATCH_SIZE = 1000
+BATCH_FIELDS = (
+    "id",
+    "user_id",
+    "available_until",
+    "node_id",
+    "port",
+    "own_ip",
+    "ram",
+    "disk_space",
+    "cores",
+    "extras",
+)
+
+
+class SweepResult(NamedTuple):
+    disabled: int
+    deleted: int
+    duration: float
+
+    @property
+    def rows_per_second(self) -> float:
+        if not self.duration:
+            return 0.0
+        return (self.disabled + self.deleted) / self.duration
+
+    def __str__(self):
+        return (
+            f"Disabled {self.disabled} and deleted {self.deleted} expired game "
+            f"servers in {self.duration:.2f} s ({self.rows_per_second:.0f} rows/s)."
+        )
+
+
+def sweep_expired_gameservers(
+    moment: Optional[datetime] = None, batch_size: int = BATCH_SIZE
+) -> SweepResult:
+    """
+    Disable expired game servers and delete the ones disabled for long enough.
+
+    Expired servers are read in keyset-paginated batches along the expiry
+    index and every batch is moved to its next state with a single update.
+    """
+    moment = moment or timezone.now()
+    start = perf_counter()
+    disabled = _sweep(
+        UserGameServer.objects.expired(moment).exclude(
+            status__in=(GAMESERVER_DISABLED, *GAMESERVER_RELEASED_STATES)
+        ),
+        _disable_batch,
+        batch_size,
+    )
+    deleted = _sweep(
+        UserGameServer.objects.expired(
+            moment - settings.GAMESERVER_DELETE_AFTER
+        ).filter(status=GAMESERVER_DISABLED),
+        delete_batch,
+        batch_size,
+    )
+    return SweepResult(disabled, deleted, perf_counter() - start)
+
+
+def _sweep(
+    queryset: "QuerySet[UserGameServer]",
+    transition: Callable[[list[dict]], int],
+    batch_size: int,
+) -> int:
+    count = 0
+    last_key = None
+    while True:
+        with transaction.atomic():
+            batch = queryset
+            if last_key:
+                expires_at, pk = last_key
+                batch = batch.filter(
+                    Q(available_until__gt=expires_at)
+                    | Q(available_until=expires_at, pk__gt=pk)
+                )
+            # rows locked by a concurrent change are picked up by the next sweep
+            rows = list(
+                batch.order_by("available_until", "pk")
+                .select_for_update(skip_locked=True)
+                .values(*BATCH_FIELDS)[:batch_size]
+            )
+            if not rows:
+                return count
+            count += transition(rows)
+        last_key = rows[-1]["available_until"], rows[-1]["id"]
+
+
+def _disable_batch(rows: list[dict]) -> int:
+    count = UserGameServer.objects.filter(pk__in=[row["id"] for row in rows]).update(
+        status=GAMESERVER_DISABLED, modified_at=timezone.now()
+    )
+    transaction.on_commit(lambda: _enqueue_container_tasks("stop_containers", rows))
+    _publish_batch(rows, GAMESERVER_DISABLED)
+    return count
+
+
+def delete_batch(rows: list[dict]) -> int:
+    """
+    Mark the servers as deleted and give back their port, ip and capacity.
+
+    The bulk update bypasses the post_save signals, so the node counters and
+    allocators are updated here.
+    """
+    now = timezone.now()
+    count = UserGameServer.objects.filter(pk__in=[row["id"] for row in rows]).update(
+        status=GAMESERVER_DELETE, deleted_at=now, modified_at=now
+    )
+    release_resource_usage(
+        ResourceUsage(row["node_id"], row["ram"], row["disk_space"], row["cores"])
+        for row in rows
+    )
+    transaction.on_commit(lambda: _release_allocations(rows))
+    transaction.on_commit(lambda: _enqueue_container_tasks("remove_containers", rows))
+    _publish_batch(rows, GAMESERVER_DELETE)
+    return count
+
+
+def _publish_batch(rows: list[dict], status: str):
+    publish_status_changes(
+        StatusChange(row["user_id"], row["id"], status) for row in rows
+    )
+
+
+def _release_allocations(rows: list[dict]):
+    for row in rows:
+        release_port(row["node_id"], row["port"])
+        if row["own_ip"]:
+            release_ip(row["own_ip"])
+
+
+def _enqueue_container_tasks(task_name: str, rows: list[dict]):
+    """
+    Queue one task per node for the containers of the given servers.
+    """
+    from server import tasks
+
+    containers = defaultdict(list)
+    for row in rows:
+        containers[row["node_id"]].append(
+            [row["id"], row["extras"].get("container_id")]
+        )
+    for node_id, node_containers in containers.items():
+        getattr(tasks, task_name).delay(node_id, node_containers)
@@ -0,0 +1,151 @@
+from bisect import bisect_left, bisect_right, insort
+from ipaddress import IPv4Address, IPv4Network
+from threading import Lock
+from time import monotonic
+from typing import TYPE_CHECKING, Iterable, Optional
+
+from django.conf import settings
+
+from server.models import IPNet, UserGameServer
+
+if TYPE_CHECKING:
+    from django.db.models import QuerySet
+
+
+class IPPool:
+    """
+    Index of the free own ip addresses across all given IP nets.
+
+    Free addresses are kept as a sorted list of negated integers, so the
+    lowest free address is the last item and claimed in O(1), and an address
+    is looked up, taken or released with a binary search.
+    """
+
+    def __init__(self, networks: Iterable["IPv4Network"], taken_ips: Iterable[str]):
+        self._networks = sorted(
+            (int(network.network_address) + 1, int(network.broadcast_address) - 1)
+            for network in networks
+        )
+        self._network_starts = [first for first, _ in self._networks]
+        taken = {int(IPv4Address(ip)) for ip in taken_ips}
+        self._free = sorted(
+            -address
+            for first, last in self._networks
+            for address in range(first, last + 1)
+            if address not in taken
+        )
+        self._lock = Lock()
+
+    @classmethod
+    def from_ip_nets(cls, ip_nets: "QuerySet[IPNet]") -> "IPPool":
+        """
+        Build the index from the given IP nets and the taken own ip addresses.
+        """
+        networks = (
+            IPv4Network(ip_net.split_cidr_notation(), strict=False)
+            for ip_net in ip_nets
+        )
+        taken_ips = UserGameServer.objects.own_ip().values_list("own_ip", flat=True)
+        return cls(networks, taken_ips)
+
+    def __len__(self):
+        return len(self._free)
+
+    def contains(self, address: int) -> bool:
+        """
+        Return whether the address is part of one of the IP nets.
+        """
+        index = bisect_right(self._network_starts, address) - 1
+        return index >= 0 and address <= self._networks[index][1]
+
+    def next_free(self, start_at: Optional[str] = None) -> Optional[str]:
+        """
+        Return the lowest free ip address, optionally at or above start_at.
+        """
+        index = len(self._free) - 1
+        if start_at is not None:
+            index = bisect_right(self._free, -int(IPv4Address(start_at))) - 1
+        if index >= 0:
+            return str(IPv4Address(-self._free[index]))
+        return None
+
+    def claim(self) -> Optional[str]:
+        """
+        Return the lowest free ip address and mark it as taken.
+        """
+        with self._lock:
+            if self._free:
+                return str(IPv4Address(-self._free.pop()))
+            return None
+
+    def take(self, ip: str):
+        key = -int(IPv4Address(ip))
+        with self._lock:
+            index = bisect_left(self._free, key)
+            if index < len(self._free) and self._free[index] == key:
+                del self._free[index]
+
+    def release(self, ip: str):
+        address = int(IPv4Address(ip))
+        if not self.contains(address):
+            return
+        with self._lock:
+            index = bisect_left(self._free, -address)
+            if index == len(self._free) or self._free[index] != -address:
+                insort(self._free, -address)
+
+
+_pool: Optional[IPPool] = None
+_loaded_at = 0.0
+_pool_lock = Lock()
+
+
+def get_ip_pool() -> IPPool:
+    """
+    Return the pool of all active IP nets, build it on first access.
+
+    The pool is rebuilt after ALLOCATOR_MAX_AGE seconds to pick up addresses
+    taken and freed by other processes.
+    """
+    global _pool, _loaded_at
+    with _pool_lock:
+        if _pool is None or monotonic() - _loaded_at > settings.ALLOCATOR_MAX_AGE:
+            _pool = IPPool.from_ip_nets(IPNet.objects.active())
+            _loaded_at = monotonic()
+        return _pool
+
+
+def reload_ip_pool() -> IPPool:
+    """
+    Rebuild the pool from the database.
+    """
+    global _pool, _loaded_at
+    pool = IPPool.from_ip_nets(IPNet.objects.active())
+    with _pool_lock:
+        _pool, _loaded_at = pool, monotonic()
+    return pool
+
+
+def take_ip(ip: str):
+    """
+    Mark an ip address as taken if the pool is already loaded.
+    """
+    if _pool is not None:
+        _pool.take(ip)
+
+
+def release_ip(ip: str):
+    """
+    Mark an ip address as free if the pool is already loaded.
+    """
+    if _pool is not None:
+        _pool.release(ip)
+
+
+def reset_ip_pool():
+    """
+    Drop the loaded pool, it is rebuilt on next access.
+    """
+    global _pool
+    with _pool_lock:
+        _pool = None
@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from server.models import Node
+
+
+class Command(BaseCommand):
+    help = "Recompute the used capacity counters of all nodes from their game servers."
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            # block reservations while the counters are rebuilt
+            list(Node.objects.select_for_update().values_list("pk", flat=True))
+            count = Node.objects.reconcile_used_capacity()
+        self.stdout.write(self.style.SUCCESS(f"Reconciled {count} nodes."))
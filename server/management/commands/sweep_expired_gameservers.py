@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from server.expiry import BATCH_SIZE, sweep_expired_gameservers
+
+
+class Command(BaseCommand):
+    help = "Disable expired game servers and delete the ones disabled for long enough."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+
+    def handle(self, *args, **options):
+        result = sweep_expired_gameservers(batch_size=options["batch_size"])
+        self.stdout.write(self.style.SUCCESS(str(result)))
@@ -1,10 +1,20 @@
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Optional
 
-from django.db.models import F, Sum
+from django.db import transaction
+from django.db.models import F, OuterRef, Subquery, Sum
+from django.db.models.functions import Coalesce
+from django.utils import timezone
 
-from carautils.utils.db.managers import BaseManager, BaseQuerySet
+from carautils.utils.db.managers import (
+    BaseManager,
+    BaseQuerySet,
+    SoftDeleteManager,
+    SoftDeleteQuerySet,
+)
 
 if TYPE_CHECKING:
+    from datetime import datetime
+
     from caraauth.models import User
     from server.models import Node
 
@@ -22,19 +32,47 @@ class IPNetManager(BaseManager.from_queryset(IPNetQuerySet)):
 
 
 class NodeQuerySet(BaseQuerySet):
-    def enough_available_space(self, ram: int, disk_space: int):
+    def active(self):
+        """
+        Return active Node objects.
+        """
+        return self.filter(active=True)
+
+    def enough_available_space(self, ram: int, disk_space: int, cores: int = 0):
         """
-        Filter nodes with enough free space for given RAM and disk space.
+        Filter nodes with enough free space for given RAM, disk space and cores.
         """
-        return (
-            self.prefetch_related("game_servers")
-            .annotate(
-                used_ram=Sum("game_servers__ram", default=0),
-                used_disk_space=Sum("game_servers__disk_space", default=0),
-                remaining_ram=F("ram") - F("used_ram"),
-                remaining_disk_space=F("disk_space") - F("used_disk_space"),
+        nodes = self.alias(
+            remaining_ram=F("ram") - F("used_ram"),
+            remaining_disk_space=F("disk_space") - F("used_disk_space"),
+        ).filter(remaining_ram__gte=ram, remaining_disk_space__gte=disk_space)
+        if cores:
+            nodes = nodes.alias(remaining_cores=F("cores") - F("used_cores")).filter(
+                remaining_cores__gte=cores
             )
-            .filter(remaining_ram__gte=ram, remaining_disk_space__gte=disk_space)
+        return nodes
+
+    def reconcile_used_capacity(self) -> int:
+        """
+        Recompute the used capacity counters from the hosted game servers.
+        """
+        from server.models import UserGameServer
+
+        live_servers = (
+            UserGameServer.objects.live()
+            .filter(node=OuterRef("pk"))
+            .order_by()
+            .values("node")
+        )
+
+        def used(field: str):
+            total = live_servers.annotate(total=Sum(field)).values("total")
+            return Coalesce(Subquery(total), 0)
+
+        return self.update(
+            used_ram=used("ram"),
+            used_disk_space=used("disk_space"),
+            used_cores=used("cores"),
         )
 
 
@@ -42,7 +80,29 @@ class NodeManager(BaseManager.from_queryset(NodeQuerySet)):
     pass
 
 
-class UserGameserverQuerySet(BaseQuerySet):
+class UserGameserverQuerySet(SoftDeleteQuerySet):
+    def delete(self) -> int:
+        """
+        Soft-delete the game servers and give back their resources.
+
+        Bulk deletes, e.g. by the admin, bypass the post_save signals, so they
+        go the way of the expiry sweep: the servers are marked as being deleted,
+        port, ip and capacity are released and the containers removed.
+        """
+        from server.expiry import BATCH_FIELDS, delete_batch
+
+        with transaction.atomic():
+            rows = list(self.order_by().select_for_update().values(*BATCH_FIELDS))
+            return delete_batch(rows) if rows else 0
+
+    def live(self):
+        """
+        Return game servers which use node capacity.
+        """
+        from server.models import GAMESERVER_RELEASED_STATES
+
+        return self.exclude(status__in=GAMESERVER_RELEASED_STATES)
+
     def own_ip(self):
         """
         Return game servers with an own ip address.
@@ -56,8 +116,46 @@ class UserGameserverQuerySet(BaseQuerySet):
         return self.filter(user=user)
 
     def hosted_on_node(self, node: "Node"):
+        """
+        Return game servers hosted on given node.
+        """
         return self.filter(node=node)
 
+    def expired(self, moment: Optional["datetime"] = None):
+        """
+        Return game servers which are not available anymore at the given moment.
+        """
+        return self.filter(available_until__lte=moment or timezone.now())
+
+    def for_display(self, with_credentials: bool = False):
+        """
+        Load the columns shown to users together with node and software.
+
+        The encrypted passwords are only loaded, and decrypted, if asked for.
+        """
+        fields = [
+            "status",
+            "server_name",
+            "own_ip",
+            "port",
+            "ram",
+            "disk_space",
+            "cores",
+            "available_until",
+            "created_at",
+            "node__ip",
+            "software_version__version",
+            "software_version__version_suffix",
+            "software_version__software__name",
+            "software_version__software__name_suffix",
+            "software_version__software__game__title",
+        ]
+        if with_credentials:
+            fields += ["sql_password", "ftp_password"]
+        return self.select_related("node", "software_version__software__game").only(
+            *fields
+        )
+
 
-class UserGameserverManager(BaseManager.from_queryset(UserGameserverQuerySet)):
+class UserGameserverManager(SoftDeleteManager.from_queryset(UserGameserverQuerySet)):
     pass
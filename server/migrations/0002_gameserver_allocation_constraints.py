@@ -0,0 +1,48 @@
+# Generated by Django 4.2.30 on 2026-10-18 18:59
+
+import datetime
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("server", "0001_create_server_models"),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name="node",
+            options={"ordering": ["-priority"]},
+        ),
+        migrations.AddConstraint(
+            model_name="usergameserver",
+            constraint=models.UniqueConstraint(
+                condition=models.Q(
+                    (
+                        "deleted_at",
+                        datetime.datetime(
+                            1970, 1, 1, 0, 0, tzinfo=datetime.timezone.utc
+                        ),
+                    )
+                ),
+                fields=("node", "port"),
+                name="unique_gameserver_node_port",
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="usergameserver",
+            constraint=models.UniqueConstraint(
+                condition=models.Q(
+                    (
+                        "deleted_at",
+                        datetime.datetime(
+                            1970, 1, 1, 0, 0, tzinfo=datetime.timezone.utc
+                        ),
+                    )
+                ),
+                fields=("own_ip",),
+                name="unique_gameserver_own_ip",
+            ),
+        ),
+    ]
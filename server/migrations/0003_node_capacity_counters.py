@@ -0,0 +1,69 @@
+# Generated by Django 4.2.30 on 2026-10-18 19:01
+
+from datetime import datetime, timezone
+
+import django.db.models.expressions
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery, Sum
+from django.db.models.functions import Coalesce
+
+
+def reconcile_used_capacity(apps, schema_editor):
+    Node = apps.get_model("server", "Node")
+    UserGameServer = apps.get_model("server", "UserGameServer")
+    live_servers = (
+        UserGameServer.objects.filter(
+            node=OuterRef("pk"), deleted_at=datetime(1970, 1, 1, tzinfo=timezone.utc)
+        )
+        .order_by()
+        .values("node")
+    )
+
+    def used(field):
+        total = live_servers.annotate(total=Sum(field)).values("total")
+        return Coalesce(Subquery(total), 0)
+
+    Node.objects.update(
+        used_ram=used("ram"),
+        used_disk_space=used("disk_space"),
+        used_cores=used("cores"),
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("server", "0002_gameserver_allocation_constraints"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="node",
+            name="used_cores",
+            field=models.PositiveIntegerField(default=0, verbose_name="Used Cores"),
+        ),
+        migrations.AddField(
+            model_name="node",
+            name="used_disk_space",
+            field=models.PositiveIntegerField(
+                default=0, verbose_name="Used Disk Space (GB)"
+            ),
+        ),
+        migrations.AddField(
+            model_name="node",
+            name="used_ram",
+            field=models.PositiveIntegerField(default=0, verbose_name="Used RAM (MB)"),
+        ),
+        migrations.AddIndex(
+            model_name="node",
+            index=models.Index(
+                django.db.models.expressions.CombinedExpression(
+                    models.F("ram"), "-", models.F("used_ram")
+                ),
+                django.db.models.expressions.CombinedExpression(
+                    models.F("disk_space"), "-", models.F("used_disk_space")
+                ),
+                name="node_remaining_capacity_idx",
+            ),
+        ),
+        migrations.RunPython(reconcile_used_capacity, migrations.RunPython.noop),
+    ]
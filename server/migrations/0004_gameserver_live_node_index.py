@@ -0,0 +1,59 @@
+# Generated by Django 4.2.30 on 2026-10-18 19:03
+
+import datetime
+
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery, Sum
+from django.db.models.functions import Coalesce
+
+
+def exclude_released_servers_from_capacity(apps, schema_editor):
+    Node = apps.get_model("server", "Node")
+    UserGameServer = apps.get_model("server", "UserGameServer")
+    live_servers = (
+        UserGameServer.objects.filter(
+            node=OuterRef("pk"),
+            deleted_at=datetime.datetime(1970, 1, 1, tzinfo=datetime.timezone.utc),
+        )
+        .exclude(status__in=["delete", "deleted"])
+        .order_by()
+        .values("node")
+    )
+
+    def used(field):
+        total = live_servers.annotate(total=Sum(field)).values("total")
+        return Coalesce(Subquery(total), 0)
+
+    Node.objects.update(
+        used_ram=used("ram"),
+        used_disk_space=used("disk_space"),
+        used_cores=used("cores"),
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("server", "0003_node_capacity_counters"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="usergameserver",
+            index=models.Index(
+                condition=models.Q(
+                    (
+                        "deleted_at",
+                        datetime.datetime(
+                            1970, 1, 1, 0, 0, tzinfo=datetime.timezone.utc
+                        ),
+                    )
+                ),
+                fields=["node"],
+                include=("status", "ram", "disk_space", "cores"),
+                name="gameserver_live_node_idx",
+            ),
+        ),
+        migrations.RunPython(
+            exclude_released_servers_from_capacity, migrations.RunPython.noop
+        ),
+    ]
@@ -0,0 +1,45 @@
+# Generated by Django 4.2.30 on 2026-10-18 19:04
+
+import datetime
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("server", "0004_gameserver_live_node_index"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="usergameserver",
+            index=models.Index(
+                condition=models.Q(
+                    (
+                        "deleted_at",
+                        datetime.datetime(
+                            1970, 1, 1, 0, 0, tzinfo=datetime.timezone.utc
+                        ),
+                    )
+                ),
+                fields=["user", "created_at", "id"],
+                name="gameserver_live_user_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="usergameserver",
+            index=models.Index(
+                condition=models.Q(
+                    (
+                        "deleted_at",
+                        datetime.datetime(
+                            1970, 1, 1, 0, 0, tzinfo=datetime.timezone.utc
+                        ),
+                    )
+                ),
+                fields=["available_until", "id"],
+                include=("status",),
+                name="gameserver_live_expiry_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 4.2.30 on 2026-10-18 19:43
+
+from django.db import migrations
+
+import carautils.utils.db.fields
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("server", "0005_gameserver_query_indexes"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="usergameserver",
+            name="ftp_password",
+            field=carautils.utils.db.fields.LazyEncryptedCharField(
+                max_length=64, verbose_name="FTP Password"
+            ),
+        ),
+        migrations.AlterField(
+            model_name="usergameserver",
+            name="sql_password",
+            field=carautils.utils.db.fields.LazyEncryptedCharField(
+                max_length=64, verbose_name="SQL Password"
+            ),
+        ),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 4.2.30 on 2026-10-18 20:04
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("server", "0006_lazy_encrypted_passwords"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="usergameserver",
+            name="status",
+            field=models.CharField(
+                choices=[
+                    ("setup", "is set up"),
+                    ("enabled", "enabled"),
+                    ("delete", "is being deleted"),
+                    ("deleted", "deleted"),
+                    ("disabled", "disabled"),
+                    ("locked", "locked"),
+                    ("failed", "setup failed"),
+                ],
+                default="setup",
+                max_length=64,
+                verbose_name="Gameserver Status",
+            ),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.30 on 2026-10-18 20:07
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("server", "0007_gameserver_failed_status"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="usergameserver",
+            index=models.Index(
+                fields=["user", "modified_at"], name="gameserver_user_modified_idx"
+            ),
+        ),
+    ]
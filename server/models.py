@@ -3,8 +3,9 @@ from django.core.validators import MaxValueValidator
 from django.db import models
 from django.utils.text import slugify
 from django.utils.translation import gettext_lazy as _
-from django_cryptography.fields import encrypt
 
+from carautils.utils.constants import POSIX_ZERO
+from carautils.utils.db.fields import LazyEncryptedCharField
 from carautils.utils.db.models import BaseModel, SoftDeleteModel
 from server.manager import IPNetManager, NodeManager, UserGameserverManager
 from server.validators import validate_cidr_notation
@@ -17,6 +18,7 @@ GAMESERVER_DELETE = "delete"
 GAMESERVER_DELETED = "deleted"
 GAMESERVER_DISABLED = "disabled"
 GAMESERVER_LOCKED = "locked"
+GAMESERVER_FAILED = "failed"
 GAMESERVER_STATES = (
     (GAMESERVER_SETUP, _("is set up")),
     (GAMESERVER_ENABLED, _("enabled")),
@@ -24,7 +26,10 @@ GAMESERVER_STATES = (
     (GAMESERVER_DELETED, _("deleted")),
     (GAMESERVER_DISABLED, _("disabled")),
     (GAMESERVER_LOCKED, _("locked")),
+    (GAMESERVER_FAILED, _("setup failed")),
 )
+# servers in these states don't use node capacity anymore
+GAMESERVER_RELEASED_STATES = (GAMESERVER_DELETE, GAMESERVER_DELETED)
 
 
 class Node(BaseModel):
@@ -38,6 +43,9 @@ class Node(BaseModel):
     disk_space = models.PositiveIntegerField(_("Disk Space (GB)"))
     priority = models.PositiveSmallIntegerField(_("Priority"), default=0)
     active = models.BooleanField(_("Active"), default=True)
+    used_cores = models.PositiveIntegerField(_("Used Cores"), default=0)
+    used_ram = models.PositiveIntegerField(_("Used RAM (MB)"), default=0)
+    used_disk_space = models.PositiveIntegerField(_("Used Disk Space (GB)"), default=0)
 
     objects = NodeManager()
 
@@ -48,6 +56,13 @@ class Node(BaseModel):
         ordering = [
             "-priority",
         ]
+        indexes = [
+            models.Index(
+                models.F("ram") - models.F("used_ram"),
+                models.F("disk_space") - models.F("used_disk_space"),
+                name="node_remaining_capacity_idx",
+            ),
+        ]
 
 
 class IPNet(BaseModel):
@@ -191,19 +206,77 @@ class UserGameServer(SoftDeleteModel):
         default=GAMESERVER_SETUP,
         max_length=64,
     )
-    sql_password = encrypt(models.CharField(_("SQL Password"), max_length=64))
-    ftp_password = encrypt(models.CharField(_("FTP Password"), max_length=64))
+    sql_password = LazyEncryptedCharField(_("SQL Password"), max_length=64)
+    ftp_password = LazyEncryptedCharField(_("FTP Password"), max_length=64)
     extras = models.JSONField(_("Additional Data"), default=dict)
 
     objects = UserGameserverManager()
 
+    # resources used on the node as stored in the database, see server.capacity
+    stored_resource_usage = None
+    # (node id, port, own ip) as stored in the database, see server.signals
+    stored_allocations = None
+
     class Meta:
         verbose_name = _("Gameserver")
         verbose_name_plural = _("Gameservers")
+        constraints = [
+            models.UniqueConstraint(
+                fields=["node", "port"],
+                condition=models.Q(deleted_at=POSIX_ZERO),
+                name="unique_gameserver_node_port",
+            ),
+            models.UniqueConstraint(
+                fields=["own_ip"],
+                condition=models.Q(deleted_at=POSIX_ZERO),
+                name="unique_gameserver_own_ip",
+            ),
+        ]
+        indexes = [
+            models.Index(
+                fields=["node"],
+                include=["status", "ram", "disk_space", "cores"],
+                condition=models.Q(deleted_at=POSIX_ZERO),
+                name="gameserver_live_node_idx",
+            ),
+            models.Index(
+                fields=["user", "created_at", "id"],
+                condition=models.Q(deleted_at=POSIX_ZERO),
+                name="gameserver_live_user_idx",
+            ),
+            # deleted servers included, for the version of a user's server list
+            models.Index(
+                fields=["user", "modified_at"],
+                name="gameserver_user_modified_idx",
+            ),
+            models.Index(
+                fields=["available_until", "id"],
+                include=["status"],
+                condition=models.Q(deleted_at=POSIX_ZERO),
+                name="gameserver_live_expiry_idx",
+            ),
+        ]
 
     def __str__(self):
         return f"{self.server_name} #{self.id}"
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        from server.capacity import get_resource_usage
+
+        instance = super().from_db(db, field_names, values)
+        if instance.get_deferred_fields().isdisjoint(
+            {"node_id", "ram", "disk_space", "cores", "status", "deleted_at"}
+        ):
+            instance.stored_resource_usage = get_resource_usage(instance)
+        if instance.get_deferred_fields().isdisjoint({"node_id", "port", "own_ip"}):
+            instance.stored_allocations = (
+                instance.node_id,
+                instance.port,
+                instance.own_ip,
+            )
+        return instance
+
     @property
     def has_own_ip(self):
         return bool(self.own_ip)
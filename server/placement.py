@@ -0,0 +1,137 @@
+from typing import Callable, NamedTuple, Optional
+
+from django.conf import settings
+
+from server.models import Node
+
+
+class NodeCapacity(NamedTuple):
+    """
+    In-memory snapshot of a node's capacity.
+    """
+
+    id: int
+    priority: int
+    ram: int
+    disk_space: int
+    cores: int
+    free_ram: int
+    free_disk_space: int
+    free_cores: int
+
+    def fits(self, ram: int, disk_space: int, cores: int) -> bool:
+        return (
+            self.free_ram >= ram
+            and self.free_disk_space >= disk_space
+            and (not cores or self.free_cores >= cores)
+        )
+
+    def free_share_after(self, ram: int, disk_space: int) -> float:
+        """
+        Return the share of RAM and disk space left after placing a server.
+
+        A resource the node has none of counts as used up.
+        """
+        return (
+            _share(self.free_ram - ram, self.ram)
+            + _share(self.free_disk_space - disk_space, self.disk_space)
+        ) / 2
+
+
+def _share(part: int, total: int) -> float:
+    return part / total if total else 0.0
+
+
+def load_node_snapshot() -> list[NodeCapacity]:
+    """
+    Return the capacity of all active nodes which have RAM and disk space.
+
+    Nodes without, e.g. ones just registered or being drained, can't host a server.
+    """
+    return [
+        NodeCapacity(
+            id=node["id"],
+            priority=node["priority"],
+            ram=node["ram"],
+            disk_space=node["disk_space"],
+            cores=node["cores"],
+            free_ram=node["ram"] - node["used_ram"],
+            free_disk_space=node["disk_space"] - node["used_disk_space"],
+            free_cores=node["cores"] - node["used_cores"],
+        )
+        for node in Node.objects.active()
+        .filter(ram__gt=0, disk_space__gt=0)
+        .values(
+            "id",
+            "priority",
+            "ram",
+            "disk_space",
+            "cores",
+            "used_ram",
+            "used_disk_space",
+            "used_cores",
+        )
+    ]
+
+
+def first_fit(
+    nodes: list[NodeCapacity], ram: int, disk_space: int
+) -> list[NodeCapacity]:
+    """
+    Prefer nodes by priority, then by age.
+    """
+    return sorted(nodes, key=lambda node: (-node.priority, node.id))
+
+
+def best_fit(
+    nodes: list[NodeCapacity], ram: int, disk_space: int
+) -> list[NodeCapacity]:
+    """
+    Prefer the node with the least capacity left, to pack nodes densely.
+    """
+    return sorted(nodes, key=lambda node: node.free_share_after(ram, disk_space))
+
+
+def worst_fit(
+    nodes: list[NodeCapacity], ram: int, disk_space: int
+) -> list[NodeCapacity]:
+    """
+    Prefer the node with the most capacity left, to spread the load.
+    """
+    return sorted(nodes, key=lambda node: -node.free_share_after(ram, disk_space))
+
+
+def priority_weighted(
+    nodes: list[NodeCapacity], ram: int, disk_space: int
+) -> list[NodeCapacity]:
+    """
+    Prefer nodes with a high priority and much capacity left.
+    """
+    return sorted(
+        nodes,
+        key=lambda node: -(node.priority + 1) * node.free_share_after(ram, disk_space),
+    )
+
+
+PLACEMENT_STRATEGIES: dict[str, Callable] = {
+    "first_fit": first_fit,
+    "best_fit": best_fit,
+    "worst_fit": worst_fit,
+    "priority_weighted": priority_weighted,
+}
+
+
+def rank_nodes(
+    nodes: list[NodeCapacity],
+    ram: int,
+    disk_space: int,
+    cores: int,
+    strategy: Optional[str] = None,
+) -> list[NodeCapacity]:
+    """
+    Return the nodes which fit the server, best candidate first.
+    """
+    strategy = PLACEMENT_STRATEGIES[strategy or settings.GAMESERVER_PLACEMENT_STRATEGY]
+    return strategy(
+        [node for node in nodes if node.fits(ram, disk_space, cores)], ram, disk_space
+    )
@@ -0,0 +1,121 @@
+from threading import Lock
+from time import monotonic
+from typing import TYPE_CHECKING, Iterable, Optional
+
+from django.conf import settings
+
+from server.models import UserGameServer
+
+if TYPE_CHECKING:
+    from server.models import Node
+
+MAX_PORT = 65535
+ALL_PORTS_MASK = (1 << (MAX_PORT + 1)) - 1
+
+
+class PortAllocator:
+    """
+    Bitmap of the ports taken on a single node.
+
+    Every port is represented by one bit, so a node needs at most 8 KB and
+    the next free port is found with a few big integer operations instead of
+    scanning the port range.
+    """
+
+    def __init__(self, taken_ports: Iterable[int] = ()):
+        bitmap = bytearray((MAX_PORT + 1) // 8)
+        for port in taken_ports:
+            bitmap[port >> 3] |= 1 << (port & 7)
+        self._bitmap = int.from_bytes(bitmap, "little")
+        self._lock = Lock()
+
+    @classmethod
+    def from_node(cls, node: "Node") -> "PortAllocator":
+        """
+        Build the bitmap from the game servers hosted on the given node.
+        """
+        return cls(
+            UserGameServer.objects.hosted_on_node(node).values_list("port", flat=True)
+        )
+
+    def is_taken(self, port: int) -> bool:
+        return bool(self._bitmap >> port & 1)
+
+    def next_free(self, start_at: int) -> Optional[int]:
+        """
+        Return the first free port at or above start_at.
+        """
+        free_ports = (~self._bitmap & ALL_PORTS_MASK) >> start_at
+        if not free_ports:
+            return None
+        return start_at + (free_ports & -free_ports).bit_length() - 1
+
+    def claim(self, start_at: int) -> Optional[int]:
+        """
+        Return the first free port at or above start_at and mark it as taken.
+        """
+        with self._lock:
+            if (port := self.next_free(start_at)) is not None:
+                self._bitmap |= 1 << port
+            return port
+
+    def take(self, port: int):
+        with self._lock:
+            self._bitmap |= 1 << port
+
+    def release(self, port: int):
+        with self._lock:
+            self._bitmap &= ~(1 << port)
+
+
+# node id -> (allocator, loaded at)
+_allocators: dict[int, tuple[PortAllocator, float]] = {}
+_allocators_lock = Lock()
+
+
+def get_port_allocator(node: "Node") -> PortAllocator:
+    """
+    Return the port allocator of the given node, build it on first access.
+
+    Allocators are rebuilt after ALLOCATOR_MAX_AGE seconds to pick up ports
+    taken and freed by other processes.
+    """
+    with _allocators_lock:
+        entry = _allocators.get(node.pk)
+        if entry is None or monotonic() - entry[1] > settings.ALLOCATOR_MAX_AGE:
+            entry = _allocators[node.pk] = (PortAllocator.from_node(node), monotonic())
+        return entry[0]
+
+
+def reload_port_allocator(node: "Node") -> PortAllocator:
+    """
+    Rebuild the port allocator of the given node from the database.
+    """
+    allocator = PortAllocator.from_node(node)
+    with _allocators_lock:
+        _allocators[node.pk] = (allocator, monotonic())
+    return allocator
+
+
+def take_port(node_id: int, port: int):
+    """
+    Mark a port as taken if the allocator of the node is already loaded.
+    """
+    if entry := _allocators.get(node_id):
+        entry[0].take(port)
+
+
+def release_port(node_id: int, port: int):
+    """
+    Mark a port as free if the allocator of the node is already loaded.
+    """
+    if entry := _allocators.get(node_id):
+        entry[0].release(port)
+
+
+def reset_port_allocators():
+    """
+    Drop all loaded allocators, they are rebuilt on next access.
+    """
+    with _allocators_lock:
+        _allocators.clear()
@@ -0,0 +1,53 @@
+from secrets import token_urlsafe
+from typing import TYPE_CHECKING
+
+from django.conf import settings
+
+from server.drivers import DockerNodeDriver
+
+if TYPE_CHECKING:
+    from server.models import UserGameServer
+
+
+def create_container(gameserver: "UserGameServer") -> str:
+    """
+    Create the container of a game server and return its id.
+    """
+    if container_id := gameserver.extras.get("container_id"):
+        # already created by a previous attempt
+        return container_id
+    driver = DockerNodeDriver(gameserver.node)
+    # created by an attempt which failed before saving the id
+    container_id = driver.find(gameserver) or driver.create(gameserver)
+    gameserver.extras["container_id"] = container_id
+    gameserver.save(update_fields=["extras", "modified_at"])
+    return container_id
+
+
+def configure_services(gameserver: "UserGameServer"):
+    """
+    Start the container and set up SQL and FTP access with new credentials.
+    """
+    if not gameserver.sql_password or not gameserver.ftp_password:
+        gameserver.sql_password = token_urlsafe(24)
+        gameserver.ftp_password = token_urlsafe(24)
+        gameserver.save(update_fields=["sql_password", "ftp_password", "modified_at"])
+    driver = DockerNodeDriver(gameserver.node)
+    container_id = gameserver.extras["container_id"]
+    driver.start(container_id)
+    exit_code, output = driver.exec_run(
+        container_id,
+        settings.GAMESERVER_CONFIGURE_COMMAND,
+        environment={
+            "SQL_PASSWORD": gameserver.sql_password,
+            "FTP_PASSWORD": gameserver.ftp_password,
+        },
+    )
+    if exit_code:
+        raise ProvisioningError(
+            f"Configuring {DockerNodeDriver.container_name(gameserver)} failed: {output!r}"
+        )
+
+
+class ProvisioningError(Exception):
+    pass
@@ -0,0 +1,108 @@
+from typing import TYPE_CHECKING, Optional
+
+from django.db import IntegrityError, transaction
+from django.db.models import Case, When
+from django.utils.translation import gettext_lazy as _
+
+from server.ip_pool import get_ip_pool, reload_ip_pool
+from server.models import Node, UserGameServer
+from server.placement import load_node_snapshot, rank_nodes
+from server.ports import get_port_allocator, reload_port_allocator
+from server.views.exceptions import GameserverError
+
+if TYPE_CHECKING:
+    from server.ip_pool import IPPool
+    from server.ports import PortAllocator
+
+MAX_ATTEMPTS = 10
+
+
+def lock_node_for_hosting(
+    ram: int, disk_space: int, cores: int, strategy: Optional[str] = None
+) -> Optional["Node"]:
+    """
+    Lock and return the best node with enough available capacity.
+
+    Nodes are ranked by the placement strategy on a snapshot of their
+    capacity. Nodes locked by concurrent reservations are skipped first, so
+    parallel orders spread over the nodes. Only if every candidate is locked,
+    wait for the lock of the best one. Must be called inside a transaction.
+    """
+    ranked_nodes = rank_nodes(load_node_snapshot(), ram, disk_space, cores, strategy)
+    if not ranked_nodes:
+        return None
+    nodes = (
+        Node.objects.active()
+        .enough_available_space(ram, disk_space, cores)
+        .filter(pk__in=[node.id for node in ranked_nodes])
+        .order_by(
+            Case(
+                *[When(pk=node.id, then=rank) for rank, node in enumerate(ranked_nodes)]
+            )
+        )
+    )
+    return (
+        nodes.select_for_update(skip_locked=True).first()
+        or nodes.select_for_update().first()
+    )
+
+
+def reserve_gameserver(validated_data: dict) -> "UserGameServer":
+    """
+    Allocate node, port and own ip and create the game server.
+
+    Capacity is guarded by a row lock on the node. Ports and ip addresses are
+    claimed from the in-process allocators and guarded by unique constraints.
+    A conflict means another process allocated values this one doesn't know
+    about, so the allocators are rebuilt from the database before retrying.
+    """
+    data = validated_data.copy()
+    with_own_ip = data.pop("with_own_ip", False)
+    default_port = data["software_version"].software.default_port
+
+    for _attempt in range(MAX_ATTEMPTS):
+        with transaction.atomic():
+            node = lock_node_for_hosting(data["ram"], data["disk_space"], data["cores"])
+            if node is None:
+                raise GameserverError(
+                    detail=_("There is not enough free space for this configuration.")
+                )
+            port_allocator = get_port_allocator(node)
+            ip_pool = get_ip_pool() if with_own_ip else None
+            own_ip = _claim_own_ip(ip_pool) if with_own_ip else None
+            port = _claim_port(port_allocator, default_port, own_ip, ip_pool)
+            try:
+                with transaction.atomic():
+                    return UserGameServer.objects.create(
+                        node=node, port=port, own_ip=own_ip, **data
+                    )
+            except IntegrityError:
+                # the claims of this attempt are rolled back, so they are free again
+                reload_port_allocator(node)
+                if with_own_ip:
+                    reload_ip_pool()
+            except Exception:
+                port_allocator.release(port)
+                if own_ip:
+                    ip_pool.release(own_ip)
+                raise
+    raise GameserverError(detail=_("The gameserver could not be reserved, try again."))
+
+
+def _claim_own_ip(ip_pool: "IPPool") -> str:
+    if own_ip := ip_pool.claim():
+        return own_ip
+    raise GameserverError(detail=_("There is no available IP addresses left."))
+
+
+def _claim_port(
+    port_allocator: "PortAllocator",
+    default_port: int,
+    own_ip: Optional[str],
+    ip_pool: Optional["IPPool"],
+) -> int:
+    if (port := port_allocator.claim(default_port)) is not None:
+        return port
+    if own_ip:
+        ip_pool.release(own_ip)
+    raise GameserverError(detail=_("There is no available port left on this node."))
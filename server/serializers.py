@@ -1,20 +1,10 @@
-from typing import TYPE_CHECKING
-
 from django.utils.translation import gettext_lazy as _
 from rest_framework import serializers
 
 from carautils import constants
 from carautils.utils.date import add_days_to_now
-from carautils.utils.server import (
-    get_available_own_ip,
-    get_available_port,
-    get_node_for_hosting,
-)
 from server.models import UserGameServer
-from server.views.exceptions import GameserverError
-
-if TYPE_CHECKING:
-    from server.models import GameSoftwareVersion, Node
+from server.reservation import reserve_gameserver
 
 
 class GameserverSerializer(serializers.ModelSerializer):
@@ -35,6 +25,8 @@ class GameserverSerializer(serializers.ModelSerializer):
     class Meta:
         model = UserGameServer
         fields = [
+            "id",
+            "status",
             "server_name",
             "software_version",
             "ram",
@@ -43,40 +35,55 @@ class GameserverSerializer(serializers.ModelSerializer):
             "period",
             "with_own_ip",
         ]
-
-    def save(self, **kwargs):
-        """Remove none-model fields before saving data"""
-        self._validated_data.pop("period")
-        self._validated_data.pop("with_own_ip")
-        return super().save(**kwargs)
+        read_only_fields = ["id", "status"]
 
     def validate(self, attrs):
-        node = self._validate_available_space(attrs.get("ram"), attrs.get("disk_space"))
-        own_ip = self._get_own_ip() if attrs.get("with_own_ip") else None
-        port = self._get_port(node, attrs.get("software_version"))
-        attrs.update(
-            {
-                "node": node,
-                "own_ip": own_ip,
-                "port": port,
-                "available_until": add_days_to_now(attrs.get("period")),
-            }
-        )
+        attrs["available_until"] = add_days_to_now(attrs.pop("period"))
         return attrs
 
-    def _validate_available_space(self, ram: int, disk_space: int) -> "Node":
-        if node := get_node_for_hosting(ram, disk_space):
-            return node
-        raise GameserverError(
-            detail=_("There is not enough free space for this configuration.")
-        )
+    def create(self, validated_data) -> "UserGameServer":
+        """
+        Reserve node, port and ip address while creating the game server.
+        """
+        return reserve_gameserver(validated_data)
+
 
-    def _get_own_ip(self) -> str:
-        if own_ip := get_available_own_ip():
-            return own_ip
-        raise GameserverError(detail=_("There is no available IP addresses left."))
+class GameserverReadSerializer(serializers.ModelSerializer):
+    """
+    Serialize game servers loaded by UserGameserverQuerySet.for_display.
+
+    The passwords are only included if the context asks for credentials.
+    """
+
+    game = serializers.CharField(source="software_version.software.game.title")
+    software = serializers.CharField(source="software_version.software")
+    version = serializers.CharField(source="software_version.version")
+    ip = serializers.IPAddressField()
+
+    class Meta:
+        model = UserGameServer
+        fields = [
+            "id",
+            "status",
+            "server_name",
+            "game",
+            "software",
+            "software_version",
+            "version",
+            "ip",
+            "port",
+            "ram",
+            "disk_space",
+            "cores",
+            "available_until",
+            "created_at",
+            "sql_password",
+            "ftp_password",
+        ]
+        read_only_fields = fields
 
-    def _get_port(self, node: "Node", software_version: "GameSoftwareVersion") -> int:
-        if port := get_available_port(node, software_version.software.default_port):
-            return port
-        raise GameserverError(detail=_("There is no available IP addresses left."))
+    def get_fields(self):
+        fields = super().get_fields()
+        if not self.context.get("with_credentials"):
+            del fields["sql_password"], fields["ftp_password"]
+        return fields
@@ -0,0 +1,68 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from carautils.utils.constants import POSIX_ZERO
+from server.capacity import apply_resource_usage_change, get_resource_usage
+from server.ip_pool import release_ip, reset_ip_pool, take_ip
+from server.models import IPNet, UserGameServer
+from server.ports import release_port, take_port
+
+
+@receiver(post_save, sender=UserGameServer)
+def sync_allocations_on_save(sender, instance: UserGameServer, **kwargs):
+    """
+    Keep port allocators and the ip pool in sync with created, moved and soft-deleted servers.
+    """
+    if (previous := instance.__dict__.get("stored_allocations")) is not None:
+        node_id, port, own_ip = previous
+        if (node_id, port) != (instance.node_id, instance.port):
+            release_port(node_id, port)
+        if own_ip and own_ip != instance.own_ip:
+            release_ip(own_ip)
+    instance.stored_allocations = (instance.node_id, instance.port, instance.own_ip)
+    if instance.deleted_at == POSIX_ZERO:
+        take_port(instance.node_id, instance.port)
+        if instance.own_ip:
+            take_ip(instance.own_ip)
+    else:
+        release_port(instance.node_id, instance.port)
+        if instance.own_ip:
+            release_ip(instance.own_ip)
+
+
+@receiver(post_save, sender=UserGameServer)
+def sync_node_capacity_on_save(sender, instance: UserGameServer, created, **kwargs):
+    """
+    Update the used capacity of the node for created, resized and soft-deleted servers.
+    """
+    if created:
+        previous = None
+    elif "stored_resource_usage" in instance.__dict__:
+        previous = instance.stored_resource_usage
+    else:
+        # loaded with deferred fields, fixed by the reconcile_node_capacity command
+        return
+    current = get_resource_usage(instance)
+    apply_resource_usage_change(previous, current)
+    instance.stored_resource_usage = current
+
+
+@receiver(post_delete, sender=UserGameServer)
+def sync_allocations_on_delete(sender, instance: UserGameServer, **kwargs):
+    """
+    Free the port, ip address and node capacity of a removed server.
+    """
+    release_port(instance.node_id, instance.port)
+    if instance.own_ip:
+        release_ip(instance.own_ip)
+    if "stored_resource_usage" in instance.__dict__:
+        apply_resource_usage_change(instance.stored_resource_usage, None)
+
+
+@receiver(post_save, sender=IPNet)
+@receiver(post_delete, sender=IPNet)
+def rebuild_ip_pool(sender, **kwargs):
+    """
+    Rebuild the ip pool on next access when IP nets change.
+    """
+    reset_ip_pool()
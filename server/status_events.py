@@ -0,0 +1,176 @@
+import asyncio
+import json
+from collections import defaultdict
+from threading import Lock
+from typing import Iterable, NamedTuple, Optional
+
+import redis
+import redis.asyncio
+from django.conf import settings
+from django.db import transaction
+
+CHANNEL = "caracara:gameserver-status"
+
+# event loop -> its listeners while it has any, there is one loop per ASGI worker
+_hubs: dict[asyncio.AbstractEventLoop, "StatusHub"] = {}
+_hubs_lock = Lock()
+_client: Optional[redis.Redis] = None
+
+
+class StatusChange(NamedTuple):
+    user_id: int
+    gameserver_id: int
+    status: str
+
+
+def publish_status_changes(changes: Iterable[StatusChange]):
+    """
+    Publish status changes of game servers once the current transaction commits.
+
+    All changes are sent as one message, so a sweep over a batch of servers
+    costs a single publish.
+    """
+    if changes := [StatusChange(*change) for change in changes]:
+        transaction.on_commit(lambda: _publish(json.dumps(changes)))
+
+
+def _publish(message: str):
+    if (client := get_redis_client()) is not None:
+        client.publish(CHANNEL, message)
+        return
+    # without Redis only the streams of this process are notified
+    with _hubs_lock:
+        hubs = list(_hubs.values())
+    for hub in hubs:
+        if not hub.loop.is_closed():
+            hub.loop.call_soon_threadsafe(hub.dispatch, message)
+
+
+def get_redis_client() -> Optional[redis.Redis]:
+    """
+    Return the client publishing the status changes if a Redis server is configured.
+    """
+    global _client
+    if settings.GAMESERVER_STATUS_REDIS_URL is None:
+        return None
+    if _client is None:
+        _client = redis.Redis.from_url(settings.GAMESERVER_STATUS_REDIS_URL)
+    return _client
+
+
+def get_async_redis_client() -> Optional[redis.asyncio.Redis]:
+    """
+    Return a client for the subscription of an event loop if Redis is configured.
+    """
+    if settings.GAMESERVER_STATUS_REDIS_URL is None:
+        return None
+    return redis.asyncio.Redis.from_url(settings.GAMESERVER_STATUS_REDIS_URL)
+
+
+def get_status_hub() -> "StatusHub":
+    """
+    Return the listeners of the running event loop.
+    """
+    loop = asyncio.get_running_loop()
+    with _hubs_lock:
+        if (hub := _hubs.get(loop)) is None:
+            hub = _hubs[loop] = StatusHub(loop)
+        return hub
+
+
+def reset_status_hubs():
+    """
+    Forget the listeners and the Redis client of this process.
+    """
+    global _client
+    with _hubs_lock:
+        _hubs.clear()
+    _client = None
+
+
+class StatusHub:
+    """
+    Fan the status changes out to the streams of the users on one event loop.
+
+    However many streams are open, the loop holds a single subscription,
+    which is opened with the first stream and closed with the last one,
+    together with the hub.
+    A queue running full ends its stream, the client reconnects and
+    starts over with the current state.
+    """
+
+    def __init__(self, loop: asyncio.AbstractEventLoop):
+        self.loop = loop
+        self.queues: dict[int, set[asyncio.Queue]] = defaultdict(set)
+        self.reader: Optional[asyncio.Task] = None
+        # set once changes are received, right away without Redis
+        self.subscribed = asyncio.Event()
+
+    async def subscribe(self, user_id: int) -> asyncio.Queue:
+        """
+        Return a queue of the user's changes once changes are received.
+        """
+        queue = asyncio.Queue(settings.GAMESERVER_STATUS_STREAM_QUEUE_SIZE)
+        self.queues[user_id].add(queue)
+        if self.reader is None:
+            if (client := get_async_redis_client()) is None:
+                self.subscribed.set()
+            else:
+                self.subscribed.clear()
+                self.reader = self.loop.create_task(self.read(client))
+        try:
+            await self.subscribed.wait()
+        except BaseException:
+            # e.g. cancelled as the client went away meanwhile
+            self.unsubscribe(user_id, queue)
+            raise
+        return queue
+
+    def unsubscribe(self, user_id: int, queue: asyncio.Queue):
+        self.queues[user_id].discard(queue)
+        if not self.queues[user_id]:
+            del self.queues[user_id]
+        if self.queues:
+            return
+        if self.reader is not None:
+            self.reader.cancel()
+            self.reader = None
+        with _hubs_lock:
+            if _hubs.get(self.loop) is self:
+                del _hubs[self.loop]
+
+    def dispatch(self, message: str):
+        for change in json.loads(message):
+            change = StatusChange(*change)
+            for queue in self.queues.get(change.user_id, ()):
+                try:
+                    queue.put_nowait(change)
+                except asyncio.QueueFull:
+                    self.close(queue)
+
+    def close(self, queue: asyncio.Queue):
+        """
+        Drop the pending changes of the stream and end it.
+        """
+        while not queue.empty():
+            queue.get_nowait()
+        queue.put_nowait(None)
+
+    async def read(self, client: redis.asyncio.Redis):
+        pubsub = client.pubsub(ignore_subscribe_messages=True)
+        try:
+            await pubsub.subscribe(CHANNEL)
+            self.subscribed.set()
+            async for message in pubsub.listen():
+                self.dispatch(message["data"])
+        except redis.RedisError:
+            # changes published meanwhile are lost, so let all clients start over
+            for queues in self.queues.values():
+                for queue in queues:
+                    self.close(queue)
+            self.reader = None
+            # let the streams waiting for the subscription end as well
+            self.subscribed.set()
+        finally:
+            await pubsub.close()
+            await client.close()
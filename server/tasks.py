@@ -0,0 +1,131 @@
+from celery import chain, shared_task
+from docker.errors import DockerException, NotFound
+from kombu.exceptions import OperationalError
+from requests.exceptions import RequestException
+
+from server import expiry, provisioning
+from server.drivers import DockerNodeDriver
+from server.models import (
+    GAMESERVER_DELETE,
+    GAMESERVER_DELETED,
+    GAMESERVER_ENABLED,
+    GAMESERVER_FAILED,
+    GAMESERVER_SETUP,
+    Node,
+    UserGameServer,
+)
+from server.status_events import StatusChange, publish_status_changes
+
+retry_options = {
+    "autoretry_for": (
+        DockerException,
+        RequestException,
+        provisioning.ProvisioningError,
+    ),
+    "retry_backoff": True,
+    "max_retries": 5,
+}
+
+
+@shared_task(**retry_options)
+def create_container(gameserver_id: int):
+    gameserver = UserGameServer.objects.select_related(
+        "node", "software_version__software"
+    ).get(pk=gameserver_id)
+    provisioning.create_container(gameserver)
+
+
+@shared_task(**retry_options)
+def configure_services(gameserver_id: int):
+    gameserver = UserGameServer.objects.select_related("node").get(pk=gameserver_id)
+    provisioning.configure_services(gameserver)
+
+
+@shared_task
+def enable_gameserver(gameserver_id: int):
+    gameserver = UserGameServer.objects.get(pk=gameserver_id)
+    if gameserver.status == GAMESERVER_SETUP:
+        gameserver.status = GAMESERVER_ENABLED
+        gameserver.save(update_fields=["status", "modified_at"])
+        publish_status_changes(
+            [StatusChange(gameserver.user_id, gameserver.pk, GAMESERVER_ENABLED)]
+        )
+
+
+@shared_task
+def fail_gameserver(gameserver_id: int):
+    """
+    Mark a game server as failed once its provisioning ran out of retries.
+    """
+    gameserver = UserGameServer.objects.get(pk=gameserver_id)
+    if gameserver.status == GAMESERVER_SETUP:
+        gameserver.status = GAMESERVER_FAILED
+        gameserver.save(update_fields=["status", "modified_at"])
+        publish_status_changes(
+            [StatusChange(gameserver.user_id, gameserver.pk, GAMESERVER_FAILED)]
+        )
+
+
+def provision_gameserver(gameserver: "UserGameServer"):
+    """
+    Create, configure and enable the container of a reserved game server.
+
+    The order is committed already, so a broker which can't be reached marks
+    the server as failed instead of leaving it in setup.
+    """
+    try:
+        return (
+            chain(
+                create_container.si(gameserver.pk),
+                configure_services.si(gameserver.pk),
+                enable_gameserver.si(gameserver.pk),
+            )
+            .on_error(fail_gameserver.si(gameserver.pk))
+            .delay()
+        )
+    except OperationalError:
+        fail_gameserver(gameserver.pk)
+
+
+@shared_task
+def sweep_expired_gameservers():
+    return str(expiry.sweep_expired_gameservers())
+
+
+@shared_task(**retry_options)
+def stop_containers(node_id: int, containers: list[list]):
+    """
+    Stop the containers of disabled game servers, given as [id, container_id] pairs.
+    """
+    driver = DockerNodeDriver(Node.objects.get(pk=node_id))
+    for _gameserver_id, container_id in containers:
+        if not container_id:
+            continue
+        try:
+            driver.stop(container_id)
+        except NotFound:
+            pass
+
+
+@shared_task(**retry_options)
+def remove_containers(node_id: int, containers: list[list]):
+    """
+    Remove the containers of deleted game servers, given as [id, container_id] pairs.
+    """
+    driver = DockerNodeDriver(Node.objects.get(pk=node_id))
+    for _gameserver_id, container_id in containers:
+        if container_id:
+            driver.remove(container_id)
+    # the servers are soft-deleted already, so bypass the default manager
+    gameservers = UserGameServer._base_manager.filter(
+        pk__in=[gameserver_id for gameserver_id, _ in containers],
+        status=GAMESERVER_DELETE,
+    )
+    removed = list(gameservers.values_list("user_id", "id"))
+    gameservers.filter(pk__in=[gameserver_id for _, gameserver_id in removed]).update(
+        status=GAMESERVER_DELETED
+    )
+    publish_status_changes(
+        StatusChange(user_id, gameserver_id, GAMESERVER_DELETED)
+        for user_id, gameserver_id in removed
+    )
@@ -7,7 +7,13 @@ from rest_framework import status
 from rest_framework.exceptions import ErrorDetail
 from rest_framework.reverse import reverse
 
-from server.models import GameSoftwareVersion, IPNet, Node, UserGameServer
+from server.models import (
+    GAMESERVER_ENABLED,
+    GameSoftwareVersion,
+    IPNet,
+    Node,
+    UserGameServer,
+)
 
 URL = reverse("api:server:gameserver-list")
 
@@ -24,9 +30,11 @@ def test__create_gameserver__unauthenticated(apitest):
 
 @mark.django_db
 @freezegun.freeze_time("01-01-2023")
-def test__create_gameserver__valid(apitest, user, basic_server_setup):
+def test__create_gameserver__valid(
+    apitest, user, basic_server_setup, fake_docker, django_capture_on_commit_callbacks
+):
     """
-    Ensure that a gameserver can be created.
+    Ensure that a gameserver can be created and is provisioned in the background.
     """
     server_name = "CaraCaraCraft"
     ram = 1024
@@ -36,21 +44,24 @@ def test__create_gameserver__valid(apitest, user, basic_server_setup):
     with_own_ip = True
     software_version = GameSoftwareVersion.objects.get()
 
-    response = apitest(user).post(
-        URL,
-        {
-            "server_name": server_name,
-            "ram": ram,
-            "disk_space": disk_space,
-            "cores": cores,
-            "period": period,
-            "with_own_ip": with_own_ip,
-            "software_version": software_version.id,
-        },
-    )
+    with django_capture_on_commit_callbacks(execute=True):
+        response = apitest(user).post(
+            URL,
+            {
+                "server_name": server_name,
+                "ram": ram,
+                "disk_space": disk_space,
+                "cores": cores,
+                "period": period,
+                "with_own_ip": with_own_ip,
+                "software_version": software_version.id,
+            },
+        )
     gameserver = UserGameServer.objects.get()
 
-    assert response.status_code == status.HTTP_201_CREATED
+    assert response.status_code == status.HTTP_202_ACCEPTED
+    assert response.data["id"] == gameserver.id
+    assert gameserver.status == GAMESERVER_ENABLED
     assert gameserver.server_name == server_name
     assert gameserver.ram == ram
     assert gameserver.disk_space == disk_space
@@ -0,0 +1,161 @@
+import asyncio
+import json
+from datetime import timedelta
+
+from asgiref.sync import async_to_sync, sync_to_async
+from django.test import AsyncClient
+from django.utils import timezone
+from pytest import fixture, mark
+from rest_framework import status
+from rest_framework.reverse import reverse
+
+from server import status_events
+from server.conftest import UserGameserverFactory
+from server.expiry import sweep_expired_gameservers
+from server.models import GAMESERVER_DISABLED, GAMESERVER_ENABLED, GAMESERVER_SETUP
+from server.status_events import StatusChange, StatusHub, get_status_hub
+from server.tasks import enable_gameserver
+
+URL = reverse("api:server:gameserver-events")
+
+
+@fixture
+def events_client(user) -> AsyncClient:
+    client = AsyncClient()
+    client.force_login(user)
+    return client
+
+
+def parse_events(chunk: bytes) -> list[dict]:
+    return [
+        json.loads(line.removeprefix("data: "))
+        for line in chunk.decode().splitlines()
+        if line.startswith("data: ")
+    ]
+
+
+def stream(client: AsyncClient, *changes) -> tuple:
+    """
+    Open the stream, run each change in the test's thread and read the next chunk.
+    """
+
+    async def read():
+        response = await client.get(URL)
+        content = aiter(response.streaming_content)
+        chunks = [await anext(content)]
+        for change in changes:
+            await sync_to_async(change)()
+            chunks.append(await asyncio.wait_for(anext(content), 5))
+        return response, chunks
+
+    return async_to_sync(read)()
+
+
+@mark.django_db
+def test__status_stream__unauthenticated():
+    """
+    Ensure that the stream is only open to authenticated users.
+    """
+
+    async def get():
+        return await AsyncClient().get(URL)
+
+    response = async_to_sync(get)()
+
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+
+@mark.django_db
+def test__status_stream(events_client, user, django_capture_on_commit_callbacks):
+    """
+    Ensure that the user gets the current status, then the changes of own servers only.
+    """
+    gameserver = UserGameserverFactory.create(user=user, status=GAMESERVER_SETUP)
+    other = UserGameserverFactory.create(status=GAMESERVER_SETUP)
+
+    def enable():
+        with django_capture_on_commit_callbacks(execute=True):
+            enable_gameserver(other.pk)
+            enable_gameserver(gameserver.pk)
+
+    response, (current, changed) = stream(events_client, enable)
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response["Content-Type"] == "text/event-stream"
+    assert parse_events(current) == [{"id": gameserver.pk, "status": GAMESERVER_SETUP}]
+    assert parse_events(changed) == [
+        {"id": gameserver.pk, "status": GAMESERVER_ENABLED}
+    ]
+
+
+@mark.django_db
+def test__status_stream__expiry(
+    events_client, user, fake_docker, django_capture_on_commit_callbacks
+):
+    """
+    Ensure that game servers disabled by the expiry sweep are streamed.
+    """
+    gameserver = UserGameserverFactory.create(
+        user=user, available_until=timezone.now() - timedelta(minutes=1)
+    )
+
+    def sweep():
+        with django_capture_on_commit_callbacks(execute=True):
+            sweep_expired_gameservers()
+
+    _, (_, changed) = stream(events_client, sweep)
+
+    assert parse_events(changed) == [
+        {"id": gameserver.pk, "status": GAMESERVER_DISABLED}
+    ]
+
+
+@mark.django_db
+def test__status_stream__keep_alive(settings, events_client):
+    """
+    Ensure that idle streams send keep-alive comments and end after their max. age.
+    """
+    settings.GAMESERVER_STATUS_STREAM_HEARTBEAT = 0.01
+    settings.GAMESERVER_STATUS_STREAM_MAX_AGE = 0.05
+
+    async def read():
+        response = await events_client.get(URL)
+        return [chunk async for chunk in response.streaming_content]
+
+    chunks = async_to_sync(read)()
+
+    assert chunks[0].startswith(b"retry: ")
+    assert b": keep-alive\n\n" in chunks[1:]
+
+
+def test__status_hub__full_queue(settings):
+    """
+    Ensure that a stream falling behind is ended instead of growing its queue.
+    """
+    settings.GAMESERVER_STATUS_STREAM_QUEUE_SIZE = 2
+
+    async def dispatch():
+        hub = StatusHub(asyncio.get_running_loop())
+        queue = await hub.subscribe(1)
+        hub.dispatch(
+            json.dumps([StatusChange(1, pk, GAMESERVER_ENABLED) for pk in range(3)])
+        )
+        return [queue.get_nowait() for _ in range(queue.qsize())]
+
+    assert async_to_sync(dispatch)() == [None]
+
+
+def test__status_hub__removed_with_last_stream():
+    """
+    Ensure that the listeners of a loop are dropped with its last stream.
+    """
+
+    async def subscribe():
+        hub = get_status_hub()
+        queue = await hub.subscribe(1)
+        assert status_events._hubs == {hub.loop: hub}
+        hub.unsubscribe(1, queue)
+
+    async_to_sync(subscribe)()
+
+    assert status_events._hubs == {}
@@ -0,0 +1,158 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from pytest import fixture, mark
+from rest_framework import status
+from rest_framework.reverse import reverse
+
+from carautils.pagination import CreatedAtCursorPagination
+from server.conftest import NodeFactory, UserGameserverFactory
+
+URL = reverse("api:server:gameserver-list")
+
+
+@fixture
+def user_servers(monkeypatch, user):
+    monkeypatch.setattr(CreatedAtCursorPagination, "page_size", 4)
+    node = NodeFactory.create()
+    created_at = timezone.now()
+    servers = [
+        # several servers share a creation time, the id breaks the tie
+        UserGameserverFactory.create(
+            node=node, user=user, created_at=created_at.replace(second=i // 3)
+        )
+        for i in range(10)
+    ]
+    UserGameserverFactory.create(node=node)
+    return servers
+
+
+def server_ids(response) -> list[int]:
+    return [server["id"] for server in response.data["results"]]
+
+
+@mark.django_db
+def test__list_gameservers__pages(apitest, user, user_servers):
+    """
+    Ensure that all servers of the user are listed page by page without a count.
+    """
+    client = apitest(user)
+    ids = []
+    url = URL
+    pages = 0
+    with CaptureQueriesContext(connection) as queries:
+        while url:
+            pages += 1
+            response = client.get(url)
+            assert response.status_code == status.HTTP_200_OK
+            ids += server_ids(response)
+            url = response.data["next"]
+
+    assert pages == 3
+    assert ids == [server.id for server in user_servers]
+    assert not any("COUNT(" in query["sql"] for query in queries)
+    assert not any("OFFSET" in query["sql"] for query in queries)
+
+
+@mark.django_db
+def test__list_gameservers__previous_page(apitest, user, user_servers):
+    """
+    Ensure that the previous link returns the page before.
+    """
+    client = apitest(user)
+    first_page = client.get(URL)
+    second_page = client.get(first_page.data["next"])
+
+    response = client.get(second_page.data["previous"])
+
+    assert server_ids(response) == server_ids(first_page)
+    assert response.data["previous"] is None
+    assert client.get(response.data["next"]).data == second_page.data
+
+
+@mark.django_db
+def test__list_gameservers__invalid_cursor(apitest, user, user_servers):
+    """
+    Ensure that a forged cursor is rejected.
+    """
+    response = apitest(user).get(URL, {"cursor": "cD1ub3QtYS1kYXRl"})
+
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+@mark.django_db
+def test__list_gameservers__query_count(apitest, user, django_assert_num_queries):
+    """
+    Ensure that a page is loaded in one query with node and software.
+    """
+    node = NodeFactory.create()
+    UserGameserverFactory.create_batch(10, node=node, user=user)
+    client = apitest(user)
+    client.get(URL)
+
+    # the token is cached after the first request, the version query comes first
+    with django_assert_num_queries(2) as captured:
+        response = client.get(URL)
+
+    assert len(response.data["results"]) == 10
+    assert response.data["results"][0]["ip"] == node.ip
+    assert "sql_password" not in captured[1]["sql"]
+    assert "sql_password" not in response.data["results"][0]
+
+
+@mark.django_db
+def test__retrieve_gameserver__credentials(apitest, user):
+    """
+    Ensure that the passwords are only loaded and returned when requested.
+    """
+    gameserver = UserGameserverFactory.create(
+        user=user, sql_password="sql-secret", ftp_password="ftp-secret"
+    )
+    url = reverse("api:server:gameserver-detail", args=[gameserver.pk])
+    client = apitest(user)
+
+    response = client.get(url)
+    assert "sql_password" not in response.data
+
+    response = client.get(url, {"include": "credentials"})
+    assert response.data["sql_password"] == "sql-secret"
+    assert response.data["ftp_password"] == "ftp-secret"
+    assert response.data["game"] == gameserver.software_version.software.game.title
+
+
+@mark.django_db
+def test__retrieve_gameserver__not_modified(apitest, user):
+    """
+    Ensure that an unchanged game server is answered with 304 until it changes.
+    """
+    gameserver = UserGameserverFactory.create(user=user)
+    url = reverse("api:server:gameserver-detail", args=[gameserver.pk])
+    client = apitest(user)
+    etag = client.get(url)["ETag"]
+
+    response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+    gameserver.server_name = "renamed"
+    gameserver.save()
+    response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == status.HTTP_200_OK
+    assert response.data["server_name"] == "renamed"
+
+
+@mark.django_db
+def test__list_gameservers__not_modified(apitest, user):
+    """
+    Ensure that the list is sent again once one of the servers is deleted.
+    """
+    gameservers = UserGameserverFactory.create_batch(2, user=user)
+    client = apitest(user)
+    etag = client.get(URL)["ETag"]
+
+    response = client.get(URL, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+    gameservers[0].delete()
+    response = client.get(URL, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == status.HTTP_200_OK
+    assert server_ids(response) == [gameservers[1].id]
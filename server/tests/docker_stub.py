@@ -0,0 +1,162 @@
+import json
+import re
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from itertools import count
+from threading import Lock, Thread
+from urllib.parse import urlsplit
+
+
+class StubDockerAPI(ThreadingHTTPServer):
+    """
+    Minimal in-memory Docker Engine API for the container calls of the driver.
+    """
+
+    daemon_threads = True
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), StubDockerAPIHandler)
+        self.containers: dict[str, dict] = {}
+        self.execs: dict[str, str] = {}
+        self.exit_code = 0
+        self.connections = 0
+        self._ids = count(1)
+        self._lock = Lock()
+
+    @property
+    def port(self) -> int:
+        return self.server_address[1]
+
+    def next_id(self) -> str:
+        with self._lock:
+            return f"{next(self._ids):064x}"
+
+    def __enter__(self):
+        Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *args):
+        self.shutdown()
+        self.server_close()
+
+
+class StubDockerAPIHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # headers and body are written separately, don't let them wait for an ACK
+    disable_nagle_algorithm = True
+    server: StubDockerAPI
+
+    routes = [
+        ("GET", r"/_ping", "ping"),
+        ("POST", r"/containers/create", "create"),
+        ("GET", r"/containers/(?P<id>[\w-]+)/json", "inspect"),
+        ("POST", r"/containers/(?P<id>[\w-]+)/start", "start"),
+        ("POST", r"/containers/(?P<id>[\w-]+)/stop", "stop"),
+        ("DELETE", r"/containers/(?P<id>[\w-]+)", "remove"),
+        ("POST", r"/containers/(?P<id>[\w-]+)/exec", "exec_create"),
+        ("POST", r"/exec/(?P<id>[\w-]+)/start", "exec_start"),
+        ("GET", r"/exec/(?P<id>[\w-]+)/json", "exec_inspect"),
+    ]
+
+    def setup(self):
+        super().setup()
+        with self.server._lock:
+            self.server.connections += 1
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        self.dispatch("GET")
+
+    def do_POST(self):
+        self.dispatch("POST")
+
+    def do_DELETE(self):
+        self.dispatch("DELETE")
+
+    def dispatch(self, method: str):
+        length = int(self.headers.get("Content-Length") or 0)
+        self.body = json.loads(self.rfile.read(length) or "null")
+        path = re.sub(r"^/v[\d.]+", "", urlsplit(self.path).path)
+        for route_method, pattern, handler in self.routes:
+            if route_method == method and (match := re.fullmatch(pattern, path)):
+                return getattr(self, handler)(**match.groupdict())
+        self.respond(404, {"message": f"page not found: {path}"})
+
+    def respond(self, status: int, data=None):
+        body = b"" if data is None else json.dumps(data).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def get_container(self, id: str):
+        container = self.server.containers.get(id) or next(
+            (c for c in self.server.containers.values() if c["Name"] == f"/{id}"),
+            None,
+        )
+        if container is None:
+            self.respond(404, {"message": f"No such container: {id}"})
+        return container
+
+    def ping(self):
+        body = b"OK"
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def create(self):
+        name = urlsplit(self.path).query.removeprefix("name=")
+        if any(c["Name"] == f"/{name}" for c in self.server.containers.values()):
+            return self.respond(409, {"message": f"Conflict. {name} is in use"})
+        id = self.server.next_id()
+        self.server.containers[id] = {
+            "Id": id,
+            "Name": f"/{name}",
+            "Config": self.body,
+            "HostConfig": self.body.get("HostConfig", {}),
+            "State": {"Status": "created"},
+        }
+        self.respond(201, {"Id": id, "Warnings": []})
+
+    def inspect(self, id: str):
+        if container := self.get_container(id):
+            self.respond(200, container)
+
+    def start(self, id: str):
+        if container := self.get_container(id):
+            container["State"]["Status"] = "running"
+            self.respond(204)
+
+    def stop(self, id: str):
+        if container := self.get_container(id):
+            container["State"]["Status"] = "exited"
+            self.respond(204)
+
+    def remove(self, id: str):
+        if container := self.get_container(id):
+            del self.server.containers[container["Id"]]
+            self.respond(204)
+
+    def exec_create(self, id: str):
+        if self.get_container(id):
+            exec_id = self.server.next_id()
+            self.server.execs[exec_id] = id
+            self.respond(201, {"Id": exec_id})
+
+    def exec_start(self, id: str):
+        # the connection is hijacked for the output stream, close it without output
+        self.send_response(101)
+        self.send_header("Content-Type", "application/vnd.docker.raw-stream")
+        self.send_header("Connection", "Upgrade")
+        self.send_header("Upgrade", "tcp")
+        self.end_headers()
+        self.close_connection = True
+
+    def exec_inspect(self, id: str):
+        self.respond(
+            200, {"ID": id, "Running": False, "ExitCode": self.server.exit_code}
+        )
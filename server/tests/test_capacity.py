@@ -0,0 +1,101 @@
+from django.core.management import call_command
+from pytest import mark
+
+from server.conftest import NodeFactory, UserGameserverFactory
+from server.models import (
+    GAMESERVER_DELETE,
+    GAMESERVER_DELETED,
+    Node,
+    UserGameServer,
+)
+
+
+@mark.django_db
+def test_used_capacity__created_resized_and_deleted():
+    """
+    Ensure that the node counters follow created, resized and soft-deleted servers.
+    """
+    node = NodeFactory.create()
+    gameserver = UserGameserverFactory.create(
+        node=node, ram=1024, disk_space=2048, cores=2
+    )
+    node.refresh_from_db()
+    assert (node.used_ram, node.used_disk_space, node.used_cores) == (1024, 2048, 2)
+
+    gameserver.ram = 4096
+    gameserver.save()
+    node.refresh_from_db()
+    assert node.used_ram == 4096
+
+    gameserver.delete()
+    node.refresh_from_db()
+    assert (node.used_ram, node.used_disk_space, node.used_cores) == (0, 0, 0)
+
+
+@mark.django_db
+def test_used_capacity__moved_to_another_node():
+    """
+    Ensure that capacity is moved along with a server loaded from the database.
+    """
+    node_1, node_2 = NodeFactory.create_batch(2)
+    UserGameserverFactory.create(node=node_1, ram=1024)
+    gameserver = UserGameServer.objects.get()
+
+    gameserver.node = node_2
+    gameserver.save()
+
+    assert Node.objects.get(pk=node_1.pk).used_ram == 0
+    assert Node.objects.get(pk=node_2.pk).used_ram == 1024
+
+
+@mark.django_db
+def test_reconcile_node_capacity_command():
+    """
+    Ensure that drifted counters are recomputed from the live servers.
+    """
+    node = NodeFactory.create()
+    UserGameserverFactory.create(node=node, ram=1024, disk_space=512, cores=1)
+    UserGameserverFactory.create(node=node, ram=512, disk_space=512, cores=1)
+    UserGameserverFactory.create(node=node, ram=512).delete()
+    empty_node = NodeFactory.create()
+    Node.objects.update(used_ram=99999, used_disk_space=99999, used_cores=99)
+
+    call_command("reconcile_node_capacity")
+
+    node.refresh_from_db()
+    empty_node.refresh_from_db()
+    assert (node.used_ram, node.used_disk_space, node.used_cores) == (1536, 1024, 2)
+    assert (empty_node.used_ram, empty_node.used_cores) == (0, 0)
+
+
+@mark.django_db
+def test_used_capacity__released_states():
+    """
+    Ensure that servers being deleted don't use node capacity anymore.
+    """
+    node = NodeFactory.create()
+    gameserver = UserGameserverFactory.create(node=node, ram=1024)
+    UserGameserverFactory.create(node=node, ram=512, status=GAMESERVER_DELETED)
+
+    gameserver.status = GAMESERVER_DELETE
+    gameserver.save()
+
+    node.refresh_from_db()
+    assert node.used_ram == 0
+    call_command("reconcile_node_capacity")
+    node.refresh_from_db()
+    assert node.used_ram == 0
+
+
+@mark.django_db
+def test_soft_deleted_servers_are_hidden():
+    """
+    Ensure that soft-deleted servers are not returned by the manager methods.
+    """
+    node = NodeFactory.create()
+    UserGameserverFactory.create(node=node, own_ip="192.168.1.1").delete()
+    gameserver = UserGameserverFactory.create(node=node, own_ip="192.168.1.2")
+
+    assert list(UserGameServer.objects.hosted_on_node(node)) == [gameserver]
+    assert list(UserGameServer.objects.own_ip()) == [gameserver]
+    assert list(node.game_servers.all()) == [gameserver]
@@ -0,0 +1,150 @@
+from pytest import mark, raises
+
+from server.conftest import FakeDockerClient, NodeFactory, UserGameserverFactory
+from server.drivers import DockerClientPool, DockerNodeDriver
+
+
+@mark.django_db
+def test_driver__container_lifecycle(docker_stub):
+    """
+    Ensure that containers are created with the server's limits, started, stopped and removed.
+    """
+    gameserver = UserGameserverFactory.create(node=NodeFactory.create(ip="127.0.0.1"))
+    driver = DockerNodeDriver(gameserver.node, DockerClientPool())
+
+    container_id = driver.create(gameserver)
+    container = docker_stub.containers[container_id]
+    default_port = gameserver.software_version.software.default_port
+    assert container["Name"] == f"/caracara-gameserver-{gameserver.pk}"
+    assert container["HostConfig"]["Memory"] == gameserver.ram * 1024**2
+    assert container["HostConfig"]["MemorySwap"] == gameserver.ram * 1024**2
+    assert container["HostConfig"]["NanoCpus"] == gameserver.cores * 10**9
+    assert container["HostConfig"]["PortBindings"] == {
+        f"{default_port}/tcp": [
+            {"HostIp": gameserver.ip, "HostPort": str(gameserver.port)}
+        ]
+    }
+
+    driver.start(container_id)
+    assert container["State"]["Status"] == "running"
+    driver.stop(container_id)
+    assert container["State"]["Status"] == "exited"
+    driver.remove(container_id)
+    assert container_id not in docker_stub.containers
+    # removing a container twice is fine
+    driver.remove(container_id)
+
+
+@mark.django_db
+def test_driver__exec_run(docker_stub):
+    """
+    Ensure that the exit code of a command run in the container is returned.
+    """
+    gameserver = UserGameserverFactory.create(node=NodeFactory.create(ip="127.0.0.1"))
+    driver = DockerNodeDriver(gameserver.node, DockerClientPool())
+    container_id = driver.create(gameserver)
+    docker_stub.exit_code = 3
+
+    exit_code, _output = driver.exec_run(container_id, ["true"], environment={})
+
+    assert exit_code == 3
+
+
+@mark.django_db
+def test_driver__storage_limit(settings):
+    """
+    Ensure that the disk space is only limited if the nodes support it.
+    """
+    gameserver = UserGameserverFactory.create()
+    assert "storage_opt" not in DockerNodeDriver.container_config(gameserver)
+
+    settings.DOCKER_LIMIT_DISK_SPACE = True
+    assert DockerNodeDriver.container_config(gameserver)["storage_opt"] == {
+        "size": f"{gameserver.disk_space}M"
+    }
+
+
+@mark.django_db
+def test_pool__reuses_connection(docker_stub):
+    """
+    Ensure that consecutive operations on a node share one connection.
+    """
+    gameserver = UserGameserverFactory.create(node=NodeFactory.create(ip="127.0.0.1"))
+    driver = DockerNodeDriver(gameserver.node, DockerClientPool())
+
+    container_id = driver.create(gameserver)
+    for _ in range(5):
+        driver.start(container_id)
+        assert driver.find(gameserver) == container_id
+
+    assert docker_stub.connections == 1
+
+
+@mark.django_db
+def test_pool__evicts_idle_clients(monkeypatch):
+    """
+    Ensure that clients idle for longer than the timeout are closed and replaced.
+    """
+    clients = []
+    monkeypatch.setattr(
+        "server.drivers.create_docker_client",
+        lambda node: clients.append(FakeDockerClient()) or clients[-1],
+    )
+    node = NodeFactory.create()
+    pool = DockerClientPool(idle_timeout=60)
+
+    with pool.client(node) as client:
+        pass
+    with pool.client(node) as reused_client:
+        assert reused_client is client
+
+    pool.idle_timeout = 0
+    with pool.client(node) as new_client:
+        assert new_client is not client
+    assert len(clients) == 2
+
+
+@mark.django_db
+def test_pool__health_check(monkeypatch):
+    """
+    Ensure that an idle client which fails its health check is replaced.
+    """
+    clients = []
+    monkeypatch.setattr(
+        "server.drivers.create_docker_client",
+        lambda node: clients.append(FakeDockerClient()) or clients[-1],
+    )
+    node = NodeFactory.create()
+    pool = DockerClientPool(health_check_after=0)
+
+    with pool.client(node) as client:
+        pass
+    monkeypatch.setattr(client, "ping", lambda: False)
+    with pool.client(node) as new_client:
+        assert new_client is not client
+    with pool.client(node) as healthy_client:
+        assert healthy_client is new_client
+
+
+@mark.django_db
+def test_pool__closes_client_on_error(monkeypatch):
+    """
+    Ensure that a client is closed instead of reused after any error.
+    """
+    clients = []
+    monkeypatch.setattr(
+        "server.drivers.create_docker_client",
+        lambda node: clients.append(FakeDockerClient()) or clients[-1],
+    )
+    closed = []
+    node = NodeFactory.create()
+    pool = DockerClientPool()
+
+    with raises(ConnectionError):
+        with pool.client(node) as client:
+            monkeypatch.setattr(client, "close", lambda: closed.append(client))
+            raise ConnectionError
+
+    assert closed == [client]
+    with pool.client(node) as new_client:
+        assert new_client is not client
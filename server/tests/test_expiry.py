@@ -0,0 +1,142 @@
+from datetime import timedelta
+
+from django.core.management import call_command
+from django.utils import timezone
+from pytest import mark
+
+from server.conftest import NodeFactory, UserGameserverFactory
+from server.expiry import sweep_expired_gameservers
+from server.models import (
+    GAMESERVER_DELETE,
+    GAMESERVER_DELETED,
+    GAMESERVER_DISABLED,
+    GAMESERVER_ENABLED,
+    Node,
+    UserGameServer,
+)
+from server.ports import get_port_allocator
+
+
+@mark.django_db
+def test_sweep__disables_expired_servers(
+    fake_docker, django_capture_on_commit_callbacks
+):
+    """
+    Ensure that expired servers are disabled and their containers are stopped.
+    """
+    container = fake_docker.containers.create(image="image", name="expired")
+    container.start()
+    expired = UserGameserverFactory.create(
+        available_until=timezone.now() - timedelta(minutes=1),
+        extras={"container_id": container.id},
+    )
+    available = UserGameserverFactory.create()
+
+    with django_capture_on_commit_callbacks(execute=True):
+        result = sweep_expired_gameservers()
+
+    assert (result.disabled, result.deleted) == (1, 0)
+    assert UserGameServer.objects.get(pk=expired.pk).status == GAMESERVER_DISABLED
+    assert UserGameServer.objects.get(pk=available.pk).status == GAMESERVER_ENABLED
+    assert container.status == "exited"
+    # the capacity stays reserved until the server is deleted
+    assert Node.objects.get(pk=expired.node_id).used_ram == expired.ram
+
+
+@mark.django_db
+def test_sweep__deletes_servers_after_grace_period(
+    settings, fake_docker, django_capture_on_commit_callbacks
+):
+    """
+    Ensure that servers disabled longer than the grace period release their resources.
+    """
+    settings.GAMESERVER_DELETE_AFTER = timedelta(days=7)
+    node = NodeFactory.create()
+    container = fake_docker.containers.create(image="image", name="expired")
+    expired = UserGameserverFactory.create(
+        node=node,
+        status=GAMESERVER_DISABLED,
+        available_until=timezone.now() - timedelta(days=8),
+        extras={"container_id": container.id},
+    )
+    grace = UserGameserverFactory.create(
+        node=node,
+        status=GAMESERVER_DISABLED,
+        available_until=timezone.now() - timedelta(days=1),
+    )
+    port_allocator = get_port_allocator(node)
+
+    with django_capture_on_commit_callbacks(execute=True):
+        result = sweep_expired_gameservers()
+
+    assert (result.disabled, result.deleted) == (0, 1)
+    assert not UserGameServer.objects.filter(pk=expired.pk).exists()
+    assert UserGameServer._base_manager.get(pk=expired.pk).status == GAMESERVER_DELETED
+    assert UserGameServer.objects.get(pk=grace.pk).status == GAMESERVER_DISABLED
+    assert container.status == "removed"
+    assert not port_allocator.is_taken(expired.port)
+    node.refresh_from_db()
+    assert (node.used_ram, node.used_disk_space, node.used_cores) == (
+        grace.ram,
+        grace.disk_space,
+        grace.cores,
+    )
+
+
+@mark.django_db
+def test_sweep__batches(settings, fake_docker):
+    """
+    Ensure that every expired server is swept when batches share an expiry date.
+    """
+    settings.GAMESERVER_DELETE_AFTER = timedelta(0)
+    expired_at = timezone.now() - timedelta(minutes=1)
+    UserGameserverFactory.create_batch(5, available_until=expired_at)
+
+    result = sweep_expired_gameservers(batch_size=2)
+
+    assert (result.disabled, result.deleted) == (5, 5)
+    assert not UserGameServer.objects.exists()
+    assert not Node.objects.filter(used_ram__gt=0).exists()
+
+
+@mark.django_db
+def test_gameserver_queryset__delete(fake_docker, django_capture_on_commit_callbacks):
+    """
+    Ensure that bulk deleted servers release their resources like swept ones.
+    """
+    node = NodeFactory.create()
+    container = fake_docker.containers.create(image="image", name="deleted")
+    deleted = UserGameserverFactory.create(
+        node=node, extras={"container_id": container.id}
+    )
+    kept = UserGameserverFactory.create(node=node)
+    port_allocator = get_port_allocator(node)
+
+    with django_capture_on_commit_callbacks(execute=True):
+        assert UserGameServer.objects.filter(pk=deleted.pk).delete() == 1
+    # deleted servers are left out, so nothing is released twice
+    assert UserGameServer.objects.filter(pk=deleted.pk).delete() == 0
+
+    deleted = UserGameServer._base_manager.get(pk=deleted.pk)
+    assert deleted.status in (GAMESERVER_DELETE, GAMESERVER_DELETED)
+    assert container.status == "removed"
+    assert not port_allocator.is_taken(deleted.port)
+    assert port_allocator.is_taken(kept.port)
+    node.refresh_from_db()
+    assert (node.used_ram, node.used_disk_space, node.used_cores) == (
+        kept.ram,
+        kept.disk_space,
+        kept.cores,
+    )
+
+
+@mark.django_db
+def test_sweep_expired_gameservers_command(capsys):
+    """
+    Ensure that the command reports the swept servers.
+    """
+    UserGameserverFactory.create(available_until=timezone.now() - timedelta(minutes=1))
+
+    call_command("sweep_expired_gameservers")
+
+    assert "Disabled 1 and deleted 0 expired game servers" in capsys.readouterr().out
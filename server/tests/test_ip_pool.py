@@ -0,0 +1,56 @@
+from ipaddress import IPv4Network
+
+from server.ip_pool import IPPool
+
+
+def test_ip_pool__next_free():
+    """
+    Ensure that the lowest free host address of all networks is returned.
+    """
+    pool = IPPool(
+        [IPv4Network("10.0.0.248/29"), IPv4Network("192.168.1.0/29")],
+        taken_ips=["10.0.0.249", "10.0.0.250"],
+    )
+
+    assert len(pool) == 10
+    assert pool.next_free() == "10.0.0.251"
+    assert pool.next_free(start_at="10.0.0.255") == "192.168.1.1"
+
+
+def test_ip_pool__take_and_release():
+    """
+    Ensure that taken addresses are skipped and released addresses are free again.
+    """
+    pool = IPPool([IPv4Network("192.168.1.0/29")], taken_ips=[])
+
+    pool.take("192.168.1.1")
+    assert pool.next_free() == "192.168.1.2"
+
+    pool.release("192.168.1.1")
+    assert pool.next_free() == "192.168.1.1"
+
+
+def test_ip_pool__release_foreign_address():
+    """
+    Ensure that addresses outside of the networks are never added to the pool.
+    """
+    pool = IPPool([IPv4Network("192.168.1.0/29")], taken_ips=[])
+
+    pool.release("192.168.1.7")
+    pool.release("10.0.0.1")
+
+    assert len(pool) == 6
+
+
+def test_ip_pool__claim():
+    """
+    Ensure that addresses are claimed from the lowest up until none is left.
+    """
+    pool = IPPool([IPv4Network("192.168.1.0/30")], taken_ips=[])
+
+    assert pool.next_free(start_at="192.168.1.2") == "192.168.1.2"
+    assert [pool.claim(), pool.claim(), pool.claim()] == [
+        "192.168.1.1",
+        "192.168.1.2",
+        None,
+    ]
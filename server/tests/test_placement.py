@@ -0,0 +1,91 @@
+from pytest import mark
+
+from server.conftest import NodeFactory
+from server.placement import NodeCapacity, load_node_snapshot, rank_nodes
+
+
+def node_capacity(id, free_ram, priority=0, free_cores=8):
+    return NodeCapacity(
+        id=id,
+        priority=priority,
+        ram=8192,
+        disk_space=8192,
+        cores=8,
+        free_ram=free_ram,
+        free_disk_space=8192,
+        free_cores=free_cores,
+    )
+
+
+NODES = [
+    node_capacity(1, free_ram=4096),
+    node_capacity(2, free_ram=1024),
+    node_capacity(3, free_ram=8192, priority=1),
+    node_capacity(4, free_ram=512),
+]
+
+
+@mark.parametrize(
+    "strategy, expected_ids",
+    [
+        ("first_fit", [3, 1, 2]),
+        ("best_fit", [2, 1, 3]),
+        ("worst_fit", [3, 1, 2]),
+        ("priority_weighted", [3, 1, 2]),
+    ],
+)
+def test_rank_nodes__strategies(strategy, expected_ids):
+    """
+    Ensure that every strategy ranks only the fitting nodes in its order.
+    """
+    ranked_nodes = rank_nodes(NODES, 1024, 1024, 1, strategy=strategy)
+
+    assert [node.id for node in ranked_nodes] == expected_ids
+
+
+def test_rank_nodes__not_enough_cores():
+    """
+    Ensure that nodes without enough free cores are skipped.
+    """
+    nodes = [node_capacity(1, free_ram=4096, free_cores=1)]
+
+    assert rank_nodes(nodes, 1024, 1024, 2, strategy="first_fit") == []
+
+
+@mark.django_db
+def test_load_node_snapshot__active_nodes_only():
+    """
+    Ensure that inactive nodes are never part of the snapshot.
+    """
+    node = NodeFactory.create(ram=4096, used_ram=1024)
+    NodeFactory.create(active=False)
+
+    snapshot = load_node_snapshot()
+
+    assert [(capacity.id, capacity.free_ram) for capacity in snapshot] == [
+        (node.id, 3072)
+    ]
+
+
+@mark.parametrize("strategy", ["best_fit", "worst_fit", "priority_weighted"])
+def test_rank_nodes__zero_capacity(strategy):
+    """
+    Ensure that nodes without RAM or disk space don't break the ranking.
+    """
+    empty_node = node_capacity(5, free_ram=0)._replace(ram=0, disk_space=0)
+
+    ranked_nodes = rank_nodes([empty_node, *NODES], 0, 0, 1, strategy=strategy)
+
+    assert empty_node in ranked_nodes
+
+
+@mark.django_db
+def test_load_node_snapshot__zero_capacity():
+    """
+    Ensure that nodes without RAM or disk space are no candidates.
+    """
+    node = NodeFactory.create()
+    NodeFactory.create(ram=0)
+    NodeFactory.create(disk_space=0)
+
+    assert [capacity.id for capacity in load_node_snapshot()] == [node.id]
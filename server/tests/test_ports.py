@@ -0,0 +1,104 @@
+from django.utils import timezone
+from pytest import mark
+
+from carautils.utils.server import get_available_port
+from server.conftest import NodeFactory, UserGameserverFactory
+from server.models import UserGameServer
+from server.ports import MAX_PORT, PortAllocator
+
+
+def test_port_allocator__next_free():
+    """
+    Ensure that the first free port at or above the start port is returned.
+    """
+    allocator = PortAllocator([25565, 25566, 25568])
+
+    assert allocator.next_free(25565) == 25567
+    assert allocator.next_free(25568) == 25569
+    assert allocator.next_free(80) == 80
+
+
+def test_port_allocator__take_and_release():
+    """
+    Ensure that taken ports are skipped and released ports are available again.
+    """
+    allocator = PortAllocator()
+
+    allocator.take(25565)
+    assert allocator.is_taken(25565)
+    assert allocator.next_free(25565) == 25566
+
+    allocator.release(25565)
+    assert not allocator.is_taken(25565)
+    assert allocator.next_free(25565) == 25565
+
+
+def test_port_allocator__all_ports_taken():
+    """
+    Ensure that no port is returned if every port above the start port is taken.
+    """
+    allocator = PortAllocator(range(65000, MAX_PORT + 1))
+
+    assert allocator.next_free(65000) is None
+    assert allocator.next_free(64999) == 64999
+
+
+@mark.django_db
+def test_get_available_port__skips_taken_ports():
+    """
+    Ensure that ports of servers hosted on the node are skipped.
+    """
+    node = NodeFactory.create()
+    UserGameserverFactory.create(node=node, port=25565)
+    UserGameserverFactory.create(node=node, port=25566)
+    UserGameserverFactory.create(port=25567)
+
+    assert get_available_port(node, 25565) == 25567
+
+
+@mark.django_db
+def test_get_available_port__synced_on_create_and_delete():
+    """
+    Ensure that the loaded allocator follows created and deleted servers.
+    """
+    node = NodeFactory.create()
+    assert get_available_port(node, 25565) == 25565
+
+    gameserver = UserGameserverFactory.create(node=node, port=25565)
+    assert get_available_port(node, 25565) == 25566
+
+    gameserver.delete()
+    assert get_available_port(node, 25565) == 25565
+
+
+@mark.django_db
+def test_get_available_port__port_changed():
+    """
+    Ensure that the previous port of a server is released when it is changed.
+    """
+    node = NodeFactory.create()
+    gameserver = UserGameserverFactory.create(node=node, port=25565)
+    gameserver = UserGameServer.objects.get(pk=gameserver.pk)
+    assert get_available_port(node, 25565) == 25566
+
+    gameserver.port = 25570
+    gameserver.save()
+
+    assert get_available_port(node, 25565) == 25565
+    assert get_available_port(node, 25570) == 25571
+
+
+@mark.django_db
+def test_get_port_allocator__max_age(settings):
+    """
+    Ensure that ports freed by other processes are picked up once the allocator is old.
+    """
+    node = NodeFactory.create()
+    gameserver = UserGameserverFactory.create(node=node, port=25565)
+    assert get_available_port(node, 25565) == 25566
+    # deleted by another process, this one isn't told
+    UserGameServer.objects.filter(pk=gameserver.pk).update(deleted_at=timezone.now())
+
+    assert get_available_port(node, 25565) == 25566
+    settings.ALLOCATOR_MAX_AGE = 0
+    assert get_available_port(node, 25565) == 25565
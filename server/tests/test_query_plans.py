@@ -0,0 +1,121 @@
+from django.db import connection
+from django.db.models import Sum
+from pytest import fixture, mark
+
+from carautils.pagination import CreatedAtCursorPagination
+from server.conftest import NodeFactory, UserGameserverFactory
+from server.models import UserGameServer
+
+pytestmark = [
+    mark.django_db,
+    mark.skipif(
+        connection.vendor != "postgresql", reason="query plans need PostgreSQL"
+    ),
+]
+
+
+@fixture
+def seeded_servers(user):
+    node = NodeFactory.create()
+    UserGameserverFactory.create_batch(20, node=node, user=user)
+    UserGameserverFactory.create_batch(5, node=node, own_ip=None)
+    for i in range(1, 6):
+        UserGameserverFactory.create(node=node, own_ip=f"192.168.1.{i}")
+    UserGameserverFactory.create(node=node).delete()
+    with connection.cursor() as cursor:
+        cursor.execute(f"ANALYZE {UserGameServer._meta.db_table}")
+        # the seeded table is tiny, force the planner to show usable indexes
+        cursor.execute("SET LOCAL enable_seqscan = off")
+    return node
+
+
+def explain(queryset) -> str:
+    plan = queryset.explain()
+    assert "Seq Scan" not in plan
+    return plan
+
+
+def test_query_plan__from_user(seeded_servers, user):
+    """
+    Ensure that a user's servers are read in list order from the partial user index.
+    """
+    plan = explain(UserGameServer.objects.from_user(user))
+
+    assert "gameserver_live_user_idx" in plan
+    assert "Sort" not in plan
+
+
+def test_query_plan__hosted_on_node(seeded_servers):
+    """
+    Ensure that the ports of a node are read from a partial node index.
+    """
+    plan = explain(
+        UserGameServer.objects.hosted_on_node(seeded_servers).values_list(
+            "port", flat=True
+        )
+    )
+
+    assert "unique_gameserver_node_port" in plan or "gameserver_live_node_idx" in plan
+
+
+def test_query_plan__own_ip(seeded_servers):
+    """
+    Ensure that taken ip addresses are read from the partial own ip index.
+    """
+    plan = explain(UserGameServer.objects.own_ip().values_list("own_ip", flat=True))
+
+    assert "unique_gameserver_own_ip" in plan
+
+
+def test_query_plan__expired(seeded_servers):
+    """
+    Ensure that expiry scans use the partial expiry index.
+    """
+    plan = explain(UserGameServer.objects.expired().values_list("id", "status"))
+
+    assert "gameserver_live_expiry_idx" in plan
+
+
+def test_query_plan__reconcile_used_capacity(seeded_servers):
+    """
+    Ensure that the capacity of a node is summed up from the partial node index.
+    """
+    plan = explain(
+        UserGameServer.objects.live()
+        .filter(node=seeded_servers)
+        .values("node")
+        .order_by()
+        .annotate(used_ram=Sum("ram"))
+    )
+
+    assert "gameserver_live_node_idx" in plan
+
+
+def test_query_plan__cursor_page(seeded_servers, user):
+    """
+    Ensure that a following page is a range scan of the partial user index.
+    """
+    last = UserGameServer.objects.from_user(user).order_by("created_at", "id")[9]
+    position = CreatedAtCursorPagination.position(last)
+    plan = explain(
+        UserGameServer.objects.from_user(user)
+        .order_by("created_at", "id")
+        .filter(CreatedAtCursorPagination()._after(position, reverse=False))[:51]
+    )
+
+    assert "gameserver_live_user_idx" in plan
+    assert "Sort" not in plan
+
+
+def test_query_plan__list_version(seeded_servers, user):
+    """
+    Ensure that the latest modification of a user's servers is read from one index entry.
+    """
+    plan = explain(
+        UserGameServer._base_manager.filter(user=user)
+        .order_by("-modified_at")
+        .values_list("modified_at", flat=True)[:1]
+    )
+
+    assert "gameserver_user_modified_idx" in plan
+    assert "Sort" not in plan
@@ -0,0 +1,110 @@
+from pytest import mark, raises
+
+from server.conftest import (
+    GameSoftwareVersionFactory,
+    IPNetFactory,
+    NodeFactory,
+    UserGameserverFactory,
+)
+from server.ip_pool import get_ip_pool
+from server.models import UserGameServer
+from server.ports import get_port_allocator
+from server.reservation import MAX_ATTEMPTS, reserve_gameserver
+from server.views.exceptions import GameserverError
+
+
+def gameserver_data(user, software_version, with_own_ip=False):
+    return {
+        "user": user,
+        "server_name": "CaraCaraCraft",
+        "software_version": software_version,
+        "ram": 1024,
+        "disk_space": 1024,
+        "cores": 2,
+        "with_own_ip": with_own_ip,
+        "available_until": "2030-01-01T00:00:00Z",
+    }
+
+
+@mark.django_db
+def test_reserve_gameserver__allocates_port_and_ip(user):
+    """
+    Ensure that consecutive reservations get distinct ports and ip addresses.
+    """
+    NodeFactory.create()
+    IPNetFactory.create(ip_net="192.168.1.0/24")
+    software_version = GameSoftwareVersionFactory.create(software__default_port=25565)
+
+    first = reserve_gameserver(gameserver_data(user, software_version, True))
+    second = reserve_gameserver(gameserver_data(user, software_version, True))
+
+    assert (first.port, first.own_ip) == (25565, "192.168.1.1")
+    assert (second.port, second.own_ip) == (25566, "192.168.1.2")
+
+
+@mark.django_db
+def test_reserve_gameserver__retries_on_stale_allocations(user):
+    """
+    Ensure that a port taken by another process is skipped after a conflict.
+    """
+    node = NodeFactory.create()
+    software_version = GameSoftwareVersionFactory.create(software__default_port=25565)
+    get_port_allocator(node)
+    # created by another worker, the loaded allocator doesn't know about it
+    UserGameServer.objects.bulk_create(
+        [
+            UserGameserverFactory.build(
+                node=node, port=25565, user=user, software_version=software_version
+            )
+        ]
+    )
+
+    gameserver = reserve_gameserver(gameserver_data(user, software_version))
+
+    assert gameserver.port == 25566
+    assert UserGameServer.objects.filter(node=node, port=25565).count() == 1
+
+
+@mark.django_db
+def test_reserve_gameserver__allocators_far_behind(user):
+    """
+    Ensure that allocators missing more values than attempts are rebuilt after a conflict.
+    """
+    node = NodeFactory.create()
+    IPNetFactory.create(ip_net="192.168.1.0/24")
+    software_version = GameSoftwareVersionFactory.create(software__default_port=25565)
+    get_port_allocator(node)
+    get_ip_pool()
+    # created by other workers, the loaded allocators don't know about them
+    UserGameServer.objects.bulk_create(
+        [
+            UserGameserverFactory.build(
+                node=node,
+                port=25565 + i,
+                own_ip=f"192.168.1.{i + 1}",
+                user=user,
+                software_version=software_version,
+            )
+            for i in range(MAX_ATTEMPTS + 5)
+        ]
+    )
+
+    gameserver = reserve_gameserver(gameserver_data(user, software_version, True))
+
+    assert gameserver.port == 25565 + MAX_ATTEMPTS + 5
+    assert gameserver.own_ip == f"192.168.1.{MAX_ATTEMPTS + 6}"
+
+
+@mark.django_db
+def test_reserve_gameserver__not_enough_space(user):
+    """
+    Ensure that nothing is claimed if no node has enough capacity.
+    """
+    NodeFactory.create(ram=512)
+    IPNetFactory.create(ip_net="192.168.1.0/24")
+    software_version = GameSoftwareVersionFactory.create()
+
+    with raises(GameserverError):
+        reserve_gameserver(gameserver_data(user, software_version, True))
+
+    assert not UserGameServer.objects.exists()
@@ -0,0 +1,132 @@
+from celery.canvas import _chain
+from docker.errors import APIError
+from kombu.exceptions import OperationalError
+from pytest import mark, raises
+
+from caracara import celery_app
+from server.conftest import UserGameserverFactory
+from server.drivers import DockerNodeDriver
+from server.models import GAMESERVER_ENABLED, GAMESERVER_FAILED, GAMESERVER_SETUP
+from server.tasks import create_container, fail_gameserver, provision_gameserver
+
+
+@mark.django_db
+def test_provision_gameserver(user_gameserver, fake_docker):
+    """
+    Ensure that the container is created with the server's limits and configured.
+    """
+    user_gameserver.status = GAMESERVER_SETUP
+    user_gameserver.save()
+
+    provision_gameserver(user_gameserver)
+
+    user_gameserver.refresh_from_db()
+    container = fake_docker.containers.get(user_gameserver.extras["container_id"])
+    default_port = user_gameserver.software_version.software.default_port
+    assert user_gameserver.status == GAMESERVER_ENABLED
+    assert container.status == "running"
+    assert container.config["mem_limit"] == f"{user_gameserver.ram}m"
+    assert container.config["ports"] == {
+        f"{default_port}/tcp": (user_gameserver.ip, user_gameserver.port)
+    }
+    assert user_gameserver.sql_password
+    assert user_gameserver.ftp_password
+    assert container.commands[0][1] == {
+        "SQL_PASSWORD": user_gameserver.sql_password,
+        "FTP_PASSWORD": user_gameserver.ftp_password,
+    }
+
+
+@mark.django_db
+def test_provision_gameserver__container_created_once(user_gameserver, fake_docker):
+    """
+    Ensure that a repeated pipeline doesn't create a second container.
+    """
+    provision_gameserver(user_gameserver)
+    provision_gameserver(user_gameserver)
+
+    assert len(fake_docker.containers.containers) == 1
+
+
+@mark.django_db
+def test_provision_gameserver__container_id_lost(user_gameserver, fake_docker):
+    """
+    Ensure that a container created by an attempt which didn't save its id is reused.
+    """
+    user_gameserver.status = GAMESERVER_SETUP
+    user_gameserver.save()
+    container = fake_docker.containers.create(
+        image="image", name=DockerNodeDriver.container_name(user_gameserver)
+    )
+
+    provision_gameserver(user_gameserver)
+
+    user_gameserver.refresh_from_db()
+    assert user_gameserver.extras["container_id"] == container.id
+    assert len(fake_docker.containers.containers) == 1
+    assert user_gameserver.status == GAMESERVER_ENABLED
+
+
+@mark.django_db
+def test_fail_gameserver(user_gameserver, django_capture_on_commit_callbacks):
+    """
+    Ensure that a server still being set up is marked as failed, others are kept.
+    """
+    user_gameserver.status = GAMESERVER_SETUP
+    user_gameserver.save()
+    enabled = UserGameserverFactory.create()
+
+    with django_capture_on_commit_callbacks() as callbacks:
+        fail_gameserver(user_gameserver.pk)
+        fail_gameserver(enabled.pk)
+
+    user_gameserver.refresh_from_db()
+    enabled.refresh_from_db()
+    assert user_gameserver.status == GAMESERVER_FAILED
+    assert enabled.status == GAMESERVER_ENABLED
+    # the status change is published
+    assert len(callbacks) == 1
+
+
+@mark.django_db
+def test_provision_gameserver__failed(user_gameserver, fake_docker, monkeypatch):
+    """
+    Ensure that a server is marked as failed once creating its container gave up.
+    """
+    user_gameserver.status = GAMESERVER_SETUP
+    user_gameserver.save()
+
+    def create(**kwargs):
+        raise APIError("no space left on device")
+
+    monkeypatch.setattr(fake_docker.containers, "create", create)
+    monkeypatch.setattr(create_container, "max_retries", 0)
+    # eager tasks only call their errbacks when errors are stored, not raised
+    monkeypatch.setattr(create_container, "store_eager_result", True)
+    monkeypatch.setitem(celery_app.conf, "CELERY_TASK_EAGER_PROPAGATES", False)
+
+    # the eager chain raises the stored error when passing it to the next task
+    with raises(APIError):
+        provision_gameserver(user_gameserver)
+
+    user_gameserver.refresh_from_db()
+    assert user_gameserver.status == GAMESERVER_FAILED
+
+
+@mark.django_db
+def test_provision_gameserver__broker_unavailable(user_gameserver, monkeypatch):
+    """
+    Ensure that a server which can't be queued for provisioning is marked as failed.
+    """
+    user_gameserver.status = GAMESERVER_SETUP
+    user_gameserver.save()
+
+    def apply_async(*args, **kwargs):
+        raise OperationalError("Error 111 connecting to localhost:6379.")
+
+    monkeypatch.setattr(_chain, "apply_async", apply_async)
+
+    provision_gameserver(user_gameserver)
+
+    user_gameserver.refresh_from_db()
+    assert user_gameserver.status == GAMESERVER_FAILED
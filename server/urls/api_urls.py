@@ -1,9 +1,18 @@
+from django.urls import path
 from rest_framework.routers import SimpleRouter
 
-from server.views.api import gameserver
+from server.views.api import events, gameserver
 
 app_name = "server"
 router = SimpleRouter()
 router.register(r"gameserver", gameserver.UserGameserverViewSet, basename="gameserver")
 
-urlpatterns = router.urls
+urlpatterns = [
+    # ahead of the router, which would take "events" for a primary key
+    path(
+        "gameserver/events/",
+        events.gameserver_status_stream,
+        name="gameserver-events",
+    ),
+    *router.urls,
+]
@@ -0,0 +1,101 @@
+import asyncio
+import json
+from typing import Optional
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.http import HttpResponse, StreamingHttpResponse
+from rest_framework import exceptions, status
+from rest_framework.request import Request
+from rest_framework.settings import api_settings
+
+from server.models import UserGameServer
+from server.status_events import StatusChange, get_status_hub
+
+# tells EventSource clients to reconnect after this many milliseconds
+RECONNECT_AFTER = 3000
+
+
+@sync_to_async
+def authenticate(request) -> Optional[int]:
+    """
+    Return the id of the user authenticated like by the API views.
+    """
+    request = Request(
+        request,
+        authenticators=[
+            authentication()
+            for authentication in api_settings.DEFAULT_AUTHENTICATION_CLASSES
+        ],
+    )
+    try:
+        user = request.user
+    except exceptions.APIException:
+        return None
+    return user.pk if user.is_authenticated else None
+
+
+@sync_to_async
+def get_current_states(user_id: int) -> list[StatusChange]:
+    return [
+        StatusChange(user_id, gameserver_id, gameserver_status)
+        for gameserver_id, gameserver_status in UserGameServer.objects.filter(
+            user_id=user_id
+        ).values_list("id", "status")
+    ]
+
+
+def format_event(change: StatusChange) -> str:
+    data = json.dumps({"id": change.gameserver_id, "status": change.status})
+    return f"event: status\ndata: {data}\n\n"
+
+
+async def stream_status_changes(user_id: int):
+    """
+    Yield the current status of the user's game servers, then each change.
+
+    A comment is sent whenever nothing happened for a while, which keeps
+    proxies from closing the connection and notices gone clients. The
+    stream ends after GAMESERVER_STATUS_STREAM_MAX_AGE, the client
+    reconnects and gets the current state again.
+    """
+    hub = get_status_hub()
+    # subscribe first, so no change between reading the state and listening is lost
+    queue = await hub.subscribe(user_id)
+    try:
+        states = await get_current_states(user_id)
+        yield f"retry: {RECONNECT_AFTER}\n\n" + "".join(map(format_event, states))
+        ends_at = hub.loop.time() + settings.GAMESERVER_STATUS_STREAM_MAX_AGE
+        while (remaining := ends_at - hub.loop.time()) > 0:
+            try:
+                change = await asyncio.wait_for(
+                    queue.get(),
+                    min(remaining, settings.GAMESERVER_STATUS_STREAM_HEARTBEAT),
+                )
+            except asyncio.TimeoutError:
+                yield ": keep-alive\n\n"
+                continue
+            if change is None:
+                return
+            yield format_event(change)
+    finally:
+        hub.unsubscribe(user_id, queue)
+
+
+async def gameserver_status_stream(request):
+    """
+    Stream the status changes of the user's game servers as server-sent events.
+
+    The view is async, so an ASGI worker holds idle streams without a thread each.
+    """
+    if request.method != "GET":
+        return HttpResponse(status=status.HTTP_405_METHOD_NOT_ALLOWED)
+    if (user_id := await authenticate(request)) is None:
+        return HttpResponse(status=status.HTTP_401_UNAUTHORIZED)
+    response = StreamingHttpResponse(
+        stream_status_changes(user_id), content_type="text/event-stream"
+    )
+    response["Cache-Control"] = "no-cache"
+    # don't let nginx buffer the events
+    response["X-Accel-Buffering"] = "no"
+    return response
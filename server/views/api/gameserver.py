@@ -1,16 +1,99 @@
+from django.db import transaction
+from rest_framework import status
 from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
 from rest_framework.viewsets import ModelViewSet
 
+from carautils.pagination import CreatedAtCursorPagination
+from carautils.utils.conditional import conditional_get
 from server.models import UserGameServer
-from server.serializers import GameserverSerializer
+from server.serializers import GameserverReadSerializer, GameserverSerializer
+from server.tasks import provision_gameserver
+
+
+def get_gameserver_list_version(view, request, *args, **kwargs):
+    """
+    Return when any of the user's game servers was last modified.
+
+    Deleted servers are included, as deleting one modifies it as well. The
+    latest one is the first entry of gameserver_user_modified_idx.
+    """
+    modified_at = (
+        UserGameServer._base_manager.filter(user=request.user)
+        .order_by("-modified_at")
+        .values_list("modified_at", flat=True)
+        .first()
+    )
+    if modified_at is None:
+        return None
+    return modified_at, ""
+
+
+def get_gameserver_version(view, request, *args, **kwargs):
+    """
+    Return when the requested game server was modified.
+    """
+    try:
+        modified_at = (
+            UserGameServer.objects.from_user(request.user)
+            .filter(pk=kwargs["pk"])
+            .values_list("modified_at", flat=True)
+            .first()
+        )
+    except (TypeError, ValueError):
+        return None
+    if modified_at is None:
+        return None
+    return modified_at, ""
 
 
 class UserGameserverViewSet(ModelViewSet):
     permission_classes = (IsAuthenticated,)
     serializer_class = GameserverSerializer
+    pagination_class = CreatedAtCursorPagination
+
+    read_actions = ("list", "retrieve")
 
     def get_queryset(self):
-        return UserGameServer.objects.from_user()
+        queryset = UserGameServer.objects.from_user(self.request.user)
+        if self.action in self.read_actions:
+            queryset = queryset.for_display(self.with_credentials())
+        return queryset
+
+    def get_serializer_class(self):
+        if self.action in self.read_actions:
+            return GameserverReadSerializer
+        return super().get_serializer_class()
+
+    def get_serializer_context(self):
+        return {
+            **super().get_serializer_context(),
+            "with_credentials": self.with_credentials(),
+        }
+
+    def with_credentials(self) -> bool:
+        """
+        Return whether the passwords were requested with ?include=credentials.
+        """
+        return "credentials" in self.request.query_params.getlist("include")
+
+    @conditional_get("gameserver-list", get_gameserver_list_version)
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
+
+    @conditional_get("gameserver-detail", get_gameserver_version)
+    def retrieve(self, request, *args, **kwargs):
+        return super().retrieve(request, *args, **kwargs)
+
+    def create(self, request, *args, **kwargs):
+        """
+        Reserve the game server and provision it in the background.
+        """
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        self.perform_create(serializer)
+        return Response(serializer.data, status=status.HTTP_202_ACCEPTED)
 
     def perform_create(self, serializer):
-        serializer.save(user=self.request.user)
+        gameserver = serializer.save(user=self.request.user)
+        transaction.on_commit(lambda: provision_gameserver(gameserver))
@@ -70,6 +70,23 @@ def test__get_2fa_static_device_tokens__disabled(user, apitest):
     assert response.status_code == status.HTTP_403_FORBIDDEN
 
 
+@mark.django_db
+def test__refresh_2fa_static_device_tokens(user_2fa, apitest):
+    """
+    Expect new 2FA Static/Backup Tokens as response.
+    """
+    old_tokens = set(user_2fa.static_device_tokens.values_list("token", flat=True))
+
+    response = apitest(user_2fa).post(refresh_tokens_url)
+
+    assert response.status_code == status.HTTP_200_OK
+    assert len(response.data["static_tokens"]) == 6
+    assert set(response.data["static_tokens"]) == set(
+        user_2fa.static_device_tokens.values_list("token", flat=True)
+    )
+    assert not old_tokens & set(response.data["static_tokens"])
+
+
 @mark.django_db
 def test__remove_2fa(user_2fa, apitest):
     """
@@ -108,3 +125,21 @@ def test__remove_2fa__disabled(user, apitest):
     response = apitest(user).post(disable_2fa_url)
 
     assert response.status_code == status.HTTP_403_FORBIDDEN
+
+
+@mark.django_db
+def test__remove_2fa__rate_limited(settings, user_2fa, apitest):
+    """
+    Ensure that OTP attempts to disable 2FA are limited per user.
+    """
+    settings.RATE_LIMITS = {"otp": {"user": (3, 60)}}
+    client = apitest(user_2fa)
+    for _ in range(3):
+        response = client.post(disable_2fa_url, data={"otp": "abcd1234"})
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    response = client.post(disable_2fa_url, data={"otp": "abcd1234"})
+
+    assert response.status_code == status.HTTP_429_TOO_MANY_REQUESTS
+    assert int(response["Retry-After"]) > 0
+    assert user_2fa.has_2fa_enabled
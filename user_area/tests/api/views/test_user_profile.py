@@ -6,6 +6,8 @@ from rest_framework.reverse import reverse
 
 from caraauth.models import User
 from caraauth.serializers import UserProfileSerializer
+from caraauth.tests.test_two_fa import current_token
+from carautils.utils.conditional import get_conditional_get_stats
 
 profile_url = reverse("api:user_area:profile")
 
@@ -133,3 +135,47 @@ def test_delete_user__success(apitest, user):
 
     assert response.status_code == status.HTTP_200_OK
     assert User.objects.count() == 0
+
+
+@mark.django_db
+def test__get_user_profile__not_modified(apitest, user, django_assert_num_queries):
+    """
+    Ensure that an unchanged profile is answered with 304 from its version and 2FA state.
+    """
+    client = apitest(user)
+    response = client.get(profile_url)
+    etag = response["ETag"]
+    assert response["Last-Modified"]
+
+    with django_assert_num_queries(2):
+        response = client.get(profile_url, HTTP_IF_NONE_MATCH=etag)
+
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+    assert response["ETag"] == etag
+    assert get_conditional_get_stats()["profile"] == {
+        "hits": 1,
+        "misses": 1,
+        "hit_ratio": 0.5,
+    }
+
+
+@mark.django_db
+def test__get_user_profile__modified(apitest, user):
+    """
+    Ensure that a changed profile or 2FA state is sent again.
+    """
+    client = apitest(user)
+    etag = client.get(profile_url)["ETag"]
+
+    user.email = "changed@example.com"
+    user.save()
+    response = client.get(profile_url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["email"] == "changed@example.com"
+    etag = response["ETag"]
+
+    user.enable_2fa()
+    user.verify_totp_device(current_token(user.totpdevice_set.get()))
+    response = client.get(profile_url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["has_2fa_enabled"]
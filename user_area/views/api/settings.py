@@ -3,13 +3,30 @@ from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
+from caraauth.models import User
 from caraauth.serializers import UserProfileSerializer
+from carautils.utils.conditional import conditional_get
+
+
+def get_profile_version(view, request, *args, **kwargs):
+    """
+    Return when the user was modified, the 2FA state is kept apart from the user.
+    """
+    modified_at = (
+        User.objects.filter(pk=request.user.pk)
+        .values_list("modified_at", flat=True)
+        .first()
+    )
+    if modified_at is None:
+        return None
+    return modified_at, str(request.user.has_2fa_enabled)
 
 
 class UserProfileView(APIView):
     permission_classes = (IsAuthenticated,)
     serializer_class = UserProfileSerializer
 
+    @conditional_get("profile", get_profile_version)
     def get(self, request, *args, **kwargs):
         user_data = self.serializer_class(instance=request.user)
         return Response(data=user_data.data)
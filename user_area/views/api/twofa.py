@@ -10,6 +10,7 @@ from caraauth.serializers import (
     OTPSerializer,
     StaticTokenSerializer,
 )
+from caraauth.throttling import OTPRateThrottle
 
 
 class Setup2FAView(APIView):
@@ -53,6 +54,7 @@ class RefreshBackupTokensView(APIView):
 
 class Disable2FAView(APIView):
     permission_classes = (Has2FAEnabled,)
+    throttle_classes = (OTPRateThrottle,)
 
     def post(self, request, *args, **kwargs):
         otp_serializer = OTPSerializer(data=request.data)